@@ -6,13 +6,18 @@ from functools import wraps
 import json
 import logging.config
 from random import randint
-from typing import NamedTuple
+from urllib.parse import parse_qs
 
 from module.dbaccess import (
-    Word, Activity, Flag
+    Word, Activity, ActivityRecord, Flag, Event
 )
+from module.dbaccess_writer import get_activity_writer
+from module.response import HtmlResponse, JsonResponse, StreamingJsonResponse
+from module.static import STATIC_CACHE
 from module.util import (
-    open_file,
+    compile_template,
+    render_template,
+    paginate,
     db_operation,
     convert_to_activity_type_for_display,
     convert_to_date_for_display
@@ -21,111 +26,20 @@ from module.util import (
 
 DB_FLAG = Flag()
 
-TODAY = date.today()
-
-logging.config.fileConfig('./setting/logging.conf')
-LOGGER = logging.getLogger()
-
-
-class BadRequest(NamedTuple):
-    """ BadRequestレスポンス """
-    status: str = '400 Bad Request'
-    content_type: str = 'application/json'
-    body: dict = json.dumps({
-        'title': 'リクエストが正しくありません',
-        'msg': '管理者にお問い合わせください'
-    })
-
-
-class NotFound(NamedTuple):
-    """ NotFoundレスポンス """
-    status: str = '404 Not Found'
-    content_type: str = 'text/html'
-    with open('404.html', 'r') as file:
-        body: str = file.read()
-
-
-class InternalServerError(NamedTuple):
-    """ InternalServerErrorレスポンス """
-    status: str = '500 Internal Server Error'
-    content_type: str = 'application/json'
-    body: dict = json.dumps({
-        'title': 'サーバエラーです',
-        'msg': '管理者にお問い合わせください'
-    })
-
-
-class ResponseBase:
-    """ レスポンス基底 """
-    def __init__(self, content_type, body):
-        """コンストラクタ
-
-        @param content_type コンテンツタイプ
-        @param body ボディ
-        """
-        self._status = '200 OK'
-        self._content_type = content_type
-        self._body = body
-
-    @property
-    def status(self):
-        """ステータスコードを返却
-
-        @return ステータスコード
-        """
-        return self._status
-
-    @property
-    def content_type(self):
-        """コンテンツタイプを返却
-
-        @return コンテンツタイプ
-        """
-        return self._content_type
-
-    @property
-    def body(self):
-        """ボディを返却
-
-        @return ボディ
-        """
-        return self._body
-
-
-class HtmlResponse(ResponseBase):
-    """ HTMLレスポンス """
-    def __init__(self, body):
-        """コンストラクタ
-
-        @param body ボディ
-        """
-        super().__init__('text/html', body)
-
-
-class StaticResponse(ResponseBase):
-    """ 静的データレスポンス """
-    _content_types = {
-        'js': 'text/javascript',
-        'css': 'text/css',
-    }
+DB_EVENT = Event()
 
-    def __init__(self, req_path, suffix):
-        """コンストラクタ
-
-        @param req_path リクエストパス
-        @param suffix 拡張子
-        """
-        super().__init__(self._content_types[suffix], open_file(req_path))
+TODAY = date.today()
 
+# ページネーションのデフォルト件数、最大件数
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
 
-class JsonResponse(ResponseBase):
-    """ JSONレスポンス """
-    def __init__(self, body):
-        """コンストラクタ
+# 習得ログのデフォルト集計日数、最大集計日数(allで全期間)
+LEARNING_LOG_DAYS = 7
+MAX_LEARNING_LOG_DAYS = 3660
 
-        @param body ボディ
-        """
-        super().__init__('application/json', json.dumps(body))
+logging.config.fileConfig('./setting/logging.conf')
+LOGGER = logging.getLogger()
 
 
 class Validate:
@@ -224,11 +138,141 @@ class Validate:
         raise ValueError()
 
 
-class DashboardView:
+class QueryValidate(Validate):
+    """ クエリ文字列バリデーション """
+    _streams = ('json', 'ndjson')
+
+    def __init__(self, query):
+        """コンストラクタ
+
+        @param query クエリ文字列
+        """
+        self._req_data = {
+            key: values[-1] for key, values in parse_qs(query or '').items()
+        }
+
+    @Validate._validate
+    def validate_stream(self):
+        """ストリーミング形式バリデーション
+
+        @return 'json'、'ndjson' (指定なしの場合はNone)
+        @exception ValueError
+        """
+        stream = self._req_data.get('stream')
+        if stream is None or stream in self._streams:
+            return stream
+        raise ValueError()
+
+    @Validate._validate
+    def validate_page(self):
+        """ページネーションバリデーション
+
+        @return ページネーション条件 (指定なしの場合は先頭からデフォルト件数)
+        @retval after_id 取得開始位置のPKEY
+        @retval limit 取得件数
+        @exception ValueError
+        """
+        after_id = self._req_data.get('after_id')
+        limit = self._req_data.get('limit')
+        after_id = int(after_id) if after_id is not None else None
+        limit = int(limit) if limit is not None else PAGE_SIZE
+        if not 0 < limit <= MAX_PAGE_SIZE or (after_id is not None and after_id < 0):
+            raise ValueError()
+        return {'after_id': after_id, 'limit': limit}
+
+    @Validate._validate
+    def validate_days(self):
+        """集計日数バリデーション
+
+        @return 集計日数 (allの場合はNone)
+        @exception ValueError
+        """
+        days = self._req_data.get('days', str(LEARNING_LOG_DAYS))
+        if days == 'all':
+            return None
+        days = int(days)
+        if not 0 < days <= MAX_LEARNING_LOG_DAYS:
+            raise ValueError()
+        return days
+
+
+class DashboardMixin:
+    """ ダッシュボード画面(同期版、asyncio版共通の表示用変換) """
+    # (ETag, 分割済みテンプレート)
+    _template = (None, None)
+
+    def _render(self, dashboard_data):
+        """HTML生成
+
+        @param dashboard_data ダッシュボードデータ
+        @return HTMLレスポンス
+        """
+        return HtmlResponse(render_template(
+            self._body,
+            dashboardData=json.dumps(dashboard_data).encode('UTF-8')
+        ))
+
+    def _open_html_file(self):
+        """HTML読み込み
+
+        更新されるまで分割済みテンプレートを再利用する
+        レスポンスはCompressionMiddlewareで圧縮するため、圧縮済みデータは生成しない
+        @return 分割済みテンプレート
+        """
+        asset = STATIC_CACHE.get('index.html', precompress=False)
+        etag, template = DashboardMixin._template
+        if etag != asset.etag:
+            template = compile_template(asset.body.decode('UTF-8'))
+            DashboardMixin._template = (asset.etag, template)
+        return template
+
+    def _convert_to_count_for_display(self, counter):
+        """カウンタデータを表示用に変換
+
+        @param counter カウンタデータ
+        @return 登録単語数、習得済み単語数、ブックマーク数
+        """
+        return {
+            'wordTotal': counter['total'],
+            'isCorrectTotal': counter['is_correct'],
+            'bookmarkTotal': counter['bookmark'],
+        }
+
+    def _convert_to_activity_for_display(self, rows):
+        """アクティビティを表示用に変換
+
+        @param rows アクティビティ
+        @return アクティビティ
+        """
+        for row in rows:
+            try:
+                row['type'] = convert_to_activity_type_for_display(row['type'])
+            except (KeyError, TypeError, IndexError):
+                continue
+        return rows
+
+    def _convert_to_learning_log_for_display(self, rows):
+        """習得ログを表示用に変換
+
+        @param rows 習得ログ
+        @return 習得ログ
+        """
+        for row in rows:
+            try:
+                row['date'] = convert_to_date_for_display(row['date'])
+            except KeyError:
+                continue
+        return rows
+
+
+class DashboardView(DashboardMixin):
     """ ダッシュボード画面 """
-    def __init__(self):
+    def __init__(self, query=None):
         """コンストラクタ
+
+        @param query クエリ文字列
         """
+        self._query = query
         self._body = self._open_html_file()
         self._db_word = Word()
         self._db_activity = Activity()
@@ -241,19 +285,11 @@ class DashboardView:
         @retval activitys アクティビティデータ
         @retval learningLog 習得ログデータ
         """
-        dashboard_data = {
+        return self._render({
             'count': self._count_num(),
             'activitys': self._select_activity_order_by_desc_limit_5(),
             'learningLog': self._select_count_learning_date(),
-        }
-        return HtmlResponse(self._body.format(dashboardData=json.dumps(dashboard_data)))
-
-    def _open_html_file(self):
-        """HTML読み込み
-
-        @return ファイルの内容
-        """
-        return open_file('index.html')
+        })
 
     @db_operation
     def _count_num(self):
@@ -264,11 +300,7 @@ class DashboardView:
         @retval isCorrectTotal 習得済み単語数
         @retval bookmarkTotal ブックマーク数
         """
-        return {
-            'wordTotal': self._db_word.count_all(),
-            'isCorrectTotal': self._db_word.count_is_correct(),
-            'bookmarkTotal': self._db_word.count_bookmark(),
-        }
+        return self._convert_to_count_for_display(self._db_word.count_summary())
 
     @db_operation
     def _select_activity_order_by_desc_limit_5(self):
@@ -278,13 +310,8 @@ class DashboardView:
         @retval type アクティビティ種別
         @retval detail アクティビティ詳細
         """
-        rows = self._db_activity.select_activity_order_by_desc_limit_5()
-        for row in rows:
-            try:
-                row['type'] = convert_to_activity_type_for_display(row['type'])
-            except (KeyError, TypeError, IndexError):
-                continue
-        return rows
+        return self._convert_to_activity_for_display(
+            self._db_activity.select_activity_order_by_desc_limit_5())
 
     @db_operation
     def _select_count_learning_date(self):
@@ -294,56 +321,72 @@ class DashboardView:
         @retval count 習得単語数
         @retval date アクティビティ日付
         """
-        rows = self._db_activity.select_count_learning_date(
-            from_date=TODAY - timedelta(days=7),
-            to_date=TODAY
-        )
+        return self._convert_to_learning_log_for_display(
+            self._db_activity.select_count_learning_date(
+                from_date=TODAY - timedelta(days=7),
+                to_date=TODAY
+            ))
+
+
+class LearningLogMixin:
+    """ 習得ログ(同期版、asyncio版共通の表示用変換) """
+    def _period(self, days):
+        """集計期間
+
+        @param days 集計日数 (Noneの場合は全期間)
+        @return 集計期間
+        @retval from_date 集計開始日
+        @retval to_date 集計終了日
+        """
+        return {
+            'from_date': TODAY - timedelta(days=days) if days is not None else None,
+            'to_date': TODAY,
+        }
+
+    def _convert_to_learning_log_for_display(self, rows):
+        """習得ログを表示用に変換
+
+        @param rows 習得ログ
+        @return 習得ログ
+        """
         for row in rows:
-            try:
-                row['date'] = convert_to_date_for_display(row['date'])
-            except KeyError:
-                continue
+            row['date'] = convert_to_date_for_display(row['date'])
         return rows
 
 
-class LearningView:
-    """ 学習画面 """
-    def __init__(self):
+class LearningLogView(LearningLogMixin):
+    """ 習得ログ """
+    def __init__(self, query=None):
         """コンストラクタ
+
+        @param query クエリ文字列
         """
-        self._db_word = Word()
+        self._query = query
+        self._db_activity = Activity()
 
     def view(self):
         """レスポンス
 
         @return JSONレスポンス
-        @retval id PKEY
-        @retval english 英単語
-        @retval correct 正解の日本語
-        @retval incorrect_1 不正解の日本語
-        @retval incorrect_2 不正解の日本語
-        @retval incorrect_3 不正解の日本語
-        @retval bookmark_flag 論理値
+        @retval count 習得単語数
+        @retval date アクティビティ日付
         """
-        return JsonResponse(self._select_learning())
+        return JsonResponse(self._select_learning_log(QueryValidate(self._query).validate_days()))
 
     @db_operation
-    def _select_learning(self):
-        """学習データ取得
+    def _select_learning_log(self, days):
+        """習得ログ取得
 
-        @return 学習データ
-        @retval id PKEY
-        @retval english 英単語
-        @retval correct 正解の日本語
-        @retval incorrect_1 不正解の日本語
-        @retval incorrect_2 不正解の日本語
-        @retval incorrect_3 不正解の日本語
-        @retval bookmark_flag 論理値
+        日別集計テーブルから取得するため、集計日数分の行のみ読み込む
+        @param days 集計日数 (Noneの場合は全期間)
+        @return 習得ログ
         """
-        return self._convert_to_learning_for_display(
-            self._db_word.select_learning(), self._db_word.select_incorrect()
-        )
+        return self._convert_to_learning_log_for_display(
+            self._db_activity.select_daily_count(DB_EVENT.LEARNED, **self._period(days)))
 
+
+class LearningMixin:
+    """ 学習画面(同期版、asyncio版共通の表示用変換) """
     def _convert_to_learning_for_display(self, corrects, incorrects):
         """学習データを表示用に変換
 
@@ -382,11 +425,14 @@ class LearningView:
         return data
 
 
-class EnglishListView:
-    """ 単語一覧画面 """
-    def __init__(self):
+class LearningView(LearningMixin):
+    """ 学習画面 """
+    def __init__(self, query=None):
         """コンストラクタ
+
+        @param query クエリ文字列
         """
+        self._query = query
         self._db_word = Word()
 
     def view(self):
@@ -395,29 +441,80 @@ class EnglishListView:
         @return JSONレスポンス
         @retval id PKEY
         @retval english 英単語
-        @retval japanese 日本語
-        @retval is_correct 論理値
+        @retval correct 正解の日本語
+        @retval incorrect_1 不正解の日本語
+        @retval incorrect_2 不正解の日本語
+        @retval incorrect_3 不正解の日本語
+        @retval bookmark_flag 論理値
         """
-        return JsonResponse(self._select_english_list())
+        return JsonResponse(self._select_learning())
 
     @db_operation
-    def _select_english_list(self):
-        """単語一覧データ取得
+    def _select_learning(self):
+        """学習データ取得
 
-        @return 単語一覧データ
+        @return 学習データ
         @retval id PKEY
         @retval english 英単語
-        @retval japanese 日本語
-        @retval is_correct 論理値
+        @retval correct 正解の日本語
+        @retval incorrect_1 不正解の日本語
+        @retval incorrect_2 不正解の日本語
+        @retval incorrect_3 不正解の日本語
+        @retval bookmark_flag 論理値
         """
-        return self._db_word.select_english_list()
+        return self._convert_to_learning_for_display(
+            self._db_word.select_learning(), self._db_word.select_incorrect()
+        )
+
+
+class EnglishListView:
+    """ 単語一覧画面 """
+    def __init__(self, query=None):
+        """コンストラクタ
+
+        @param query クエリ文字列
+        """
+        self._query = query
+        self._db_word = Word()
+
+    def view(self):
+        """レスポンス
+
+        ページネーションの指定がない場合も先頭からデフォルト件数を返却する(全件はstreamを指定)
+        @return JSONレスポンス
+        @retval data 単語一覧データ(id、english、japanese、is_correct)
+        @retval next_cursor 次ページ取得時のafter_id
+        """
+        inst = QueryValidate(self._query)
+        stream = inst.validate_stream()
+        if stream:
+            return StreamingJsonResponse(
+                self._db_word.iter_english_list(), ndjson=stream == 'ndjson')
+        return JsonResponse(self._select_english_list_page(inst.validate_page()))
+
+    @db_operation
+    def _select_english_list_page(self, page):
+        """単語一覧データ取得(ページネーション)
+
+        @param page ページネーション条件
+        @return 単語一覧データ
+        @retval data 単語一覧データ
+        @retval next_cursor 次ページ取得時のafter_id
+        """
+        return paginate(
+            self._db_word.select_english_list_page(page['after_id'], page['limit'] + 1),
+            page['limit']
+        )
 
 
 class BookMarkView:
     """ ブックマーク画面 """
-    def __init__(self):
+    def __init__(self, query=None):
         """コンストラクタ
+
+        @param query クエリ文字列
         """
+        self._query = query
         self._db_word = Word()
 
     def view(self):
@@ -428,6 +525,10 @@ class BookMarkView:
         @retval english 英単語
         @retval japanese 日本語
         """
+        stream = QueryValidate(self._query).validate_stream()
+        if stream:
+            return StreamingJsonResponse(
+                self._db_word.iter_bookmark(), ndjson=stream == 'ndjson')
         return JsonResponse(self._select_bookmark())
 
     @db_operation
@@ -444,39 +545,60 @@ class BookMarkView:
 
 class ActivityView:
     """ アクティビティ一覧画面 """
-    def __init__(self):
+    def __init__(self, query=None):
         """コンストラクタ
+
+        @param query クエリ文字列
         """
+        self._query = query
         self._db_activity = Activity()
 
     def view(self):
         """レスポンス
 
+        ページネーションの指定がない場合も先頭からデフォルト件数を返却する(全件はstreamを指定)
         @return JSONレスポンス
-        @retval id PKEY
-        @retval english 英単語
-        @retval japanese 日本語
-        """
-        return JsonResponse(self._select_all())
+        @retval data アクティビティ一覧データ(date、type、detail)
+        @retval next_cursor 次ページ取得時のafter_id
+        """
+        inst = QueryValidate(self._query)
+        stream = inst.validate_stream()
+        if stream:
+            return StreamingJsonResponse(
+                map(self._convert_to_activity_for_display, self._db_activity.iter_all()),
+                ndjson=stream == 'ndjson'
+            )
+        return JsonResponse(self._select_page(inst.validate_page()))
 
     @db_operation
-    def _select_all(self):
-        """アクティビティ一覧データ取得
+    def _select_page(self, page):
+        """アクティビティ一覧データ取得(ページネーション)
 
+        @param page ページネーション条件
         @return アクティビティ一覧データ
-        @retval date アクティビティ日付
-        @retval type アクティビティ種別
-        @retval detail アクティビティ詳細
+        @retval data アクティビティ一覧データ
+        @retval next_cursor 次ページ取得時のafter_id
         """
-        rows = self._db_activity.select_all()
-        for row in rows:
-            try:
-                row['date'] = convert_to_date_for_display(row['date'])
-                row['type'] = convert_to_activity_type_for_display(row['type'])
-            except (KeyError, TypeError, IndexError):
-                continue
+        rows = paginate(
+            self._db_activity.select_page(page['after_id'], page['limit'] + 1),
+            page['limit']
+        )
+        rows['data'] = [self._convert_to_activity_for_display(row) for row in rows['data']]
         return rows
 
+    def _convert_to_activity_for_display(self, row):
+        """アクティビティを表示用に変換
+
+        @param row アクティビティ
+        @return アクティビティ
+        """
+        try:
+            row['date'] = convert_to_date_for_display(row['date'])
+            row['type'] = convert_to_activity_type_for_display(row['type'])
+        except (KeyError, TypeError, IndexError):
+            pass
+        return row
+
 
 class UpdateIsCorrectFlagView:
     """ is_correctフラグ更新 """
@@ -486,7 +608,7 @@ class UpdateIsCorrectFlagView:
         @param req_data リクエストデータ
         """
         self._req_data = req_data
-        self._db_word = Word()
+        self._db_word = Word(activity_writer=get_activity_writer())
         self._db_activity = Activity()
 
     def view(self):
@@ -510,28 +632,26 @@ class UpdateIsCorrectFlagView:
 
     @db_operation
     def _update_is_correct_flag(self, cleaned_data):
-        """is_correctフラグ更新
+        """is_correctフラグ更新、アクティビティ登録
 
         @param cleaned_data 更新データ
         @return 更新完了メッセージ
         """
-        eng_val = self._db_word.update_is_correct_flag(**cleaned_data)
-        return self._register_activity(eng_val, cleaned_data.get('flag'))
+        activity_text = self._db_word.update_is_correct_flag_with_activity(
+            **cleaned_data, activity=self._create_activity(cleaned_data.get('flag')))
+        LOGGER.info(activity_text)
+        return activity_text
 
-    @db_operation
-    def _register_activity(self, eng_val, flag):
-        """アクティビティ登録
+    def _create_activity(self, flag):
+        """アクティビティ生成
 
-        @param eng_val 英語
         @param flag 論理値
-        @return activity_text 更新完了メッセージ
+        @return アクティビティ
         """
         type_id, _ = self._db_activity.TYPE[0]
-        _activity_text = '習得' if flag == DB_FLAG.TRUE else '未習得に変更'
-        activity_text = f'{eng_val}を{_activity_text}しました'
-        self._db_activity.insert(TODAY, type_id, activity_text)
-        LOGGER.info(activity_text)
-        return activity_text
+        if flag == DB_FLAG.TRUE:
+            return ActivityRecord(TODAY, type_id, DB_EVENT.LEARNED, suffix='を習得しました')
+        return ActivityRecord(TODAY, type_id, DB_EVENT.UNLEARNED, suffix='を未習得に変更しました')
 
 
 class UpdateBookmarkView:
@@ -542,7 +662,7 @@ class UpdateBookmarkView:
         @param req_data リクエストデータ
         """
         self._req_data = req_data
-        self._db_word = Word()
+        self._db_word = Word(activity_writer=get_activity_writer())
         self._db_activity = Activity()
 
     def view(self):
@@ -566,28 +686,28 @@ class UpdateBookmarkView:
 
     @db_operation
     def _update_bookmark_flag(self, cleaned_data):
-        """bookmarkフラグ更新
+        """bookmarkフラグ更新、アクティビティ登録
 
         @param cleaned_data 更新データ
         @return 更新完了メッセージ
         """
-        eng_val = self._db_word.update_bookmark_flag(**cleaned_data)
-        return self._register_activity(eng_val, cleaned_data.get('flag'))
+        activity_text = self._db_word.update_bookmark_flag_with_activity(
+            **cleaned_data, activity=self._create_activity(cleaned_data.get('flag')))
+        LOGGER.info(activity_text)
+        return activity_text
 
-    @db_operation
-    def _register_activity(self, eng_val, flag):
-        """アクティビティ登録
+    def _create_activity(self, flag):
+        """アクティビティ生成
 
-        @param eng_val 英語
         @param flag 論理値
-        @return activity_text 更新完了メッセージ
+        @return アクティビティ
         """
         type_id, _ = self._db_activity.TYPE[3]
-        _activity_text = 'ブックマーク登録' if flag == DB_FLAG.TRUE else 'ブックマーク解除'
-        activity_text = f'{eng_val}を{_activity_text}しました'
-        self._db_activity.insert(TODAY, type_id, activity_text)
-        LOGGER.info(activity_text)
-        return activity_text
+        if flag == DB_FLAG.TRUE:
+            return ActivityRecord(
+                TODAY, type_id, DB_EVENT.BOOKMARKED, suffix='をブックマーク登録しました')
+        return ActivityRecord(
+            TODAY, type_id, DB_EVENT.UNBOOKMARKED, suffix='をブックマーク解除しました')
 
 
 class RegisterWordView:
@@ -598,7 +718,7 @@ class RegisterWordView:
         @param req_data リクエストデータ
         """
         self._req_data = req_data
-        self._db_word = Word()
+        self._db_word = Word(activity_writer=get_activity_writer())
         self._db_activity = Activity()
 
     def view(self):
@@ -622,30 +742,26 @@ class RegisterWordView:
 
     @db_operation
     def _insert(self, cleaned_data):
-        """英語登録
+        """英語登録、アクティビティ登録
 
         @param cleaned_data 登録データ
         @return 登録完了メッセージ
         """
-        self._db_word.insert(**cleaned_data)
-        return self._register_activity(
-            cleaned_data.get('eng_val'),
-            cleaned_data.get('jap_val')
-        )
+        activity_text = self._db_word.insert_with_activity(
+            **cleaned_data, activity=self._create_activity(cleaned_data.get('jap_val')))
+        LOGGER.info(activity_text)
+        return activity_text
 
-    @db_operation
-    def _register_activity(self, eng_val, jap_val):
-        """アクティビティ登録
+    def _create_activity(self, jap_val):
+        """アクティビティ生成
 
-        @param eng_val 英語
         @param jap_val 日本語
-        @return activity_text 登録完了メッセージ
+        @return アクティビティ
         """
         type_id, _ = self._db_activity.TYPE[1]
-        activity_text = f'英語: {eng_val} 日本語: {jap_val} を登録しました'
-        self._db_activity.insert(TODAY, type_id, activity_text)
-        LOGGER.info(activity_text)
-        return activity_text
+        return ActivityRecord(
+            TODAY, type_id, DB_EVENT.REGISTERED,
+            prefix='英語: ', suffix=f' 日本語: {jap_val} を登録しました')
 
 
 class DeleteView:
@@ -656,7 +772,7 @@ class DeleteView:
         @param req_data リクエストデータ
         """
         self._req_data = req_data
-        self._db_word = Word()
+        self._db_word = Word(activity_writer=get_activity_writer())
         self._db_activity = Activity()
 
     def view(self):
@@ -679,23 +795,19 @@ class DeleteView:
 
     @db_operation
     def _delete(self, pkey):
-        """英語削除
+        """英語削除、アクティビティ登録
 
         @param pkey PKEY
         @return 削除完了メッセージ
         """
-        eng_val = self._db_word.delete(pkey)
-        return self._register_activity(eng_val)
+        activity_text = self._db_word.delete_with_activity(pkey, self._create_activity())
+        LOGGER.info(activity_text)
+        return activity_text
 
-    @db_operation
-    def _register_activity(self, eng_val):
-        """アクティビティ登録
+    def _create_activity(self):
+        """アクティビティ生成
 
-        @param eng_val 英語
-        @return activity_text 削除完了メッセージ
+        @return アクティビティ
         """
         type_id, _ = self._db_activity.TYPE[2]
-        activity_text = f'{eng_val}を削除しました'
-        self._db_activity.insert(TODAY, type_id, activity_text)
-        LOGGER.info(activity_text)
-        return activity_text
+        return ActivityRecord(TODAY, type_id, DB_EVENT.DELETED, suffix='を削除しました')
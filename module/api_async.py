@@ -0,0 +1,95 @@
+"""
+API(asyncio)
+
+非同期ドライバでDBにアクセスするビュー(ASGIエントリポイント用)
+表示用の変換は同期版のビューと共通(api.DashboardMixin、LearningMixin、LearningLogMixin)
+"""
+from datetime import timedelta
+
+from module.api import (
+    DashboardMixin, LearningMixin, LearningLogMixin, QueryValidate, DB_EVENT, TODAY
+)
+from module.dbaccess_async import AsyncWord, AsyncActivity
+from module.response import JsonResponse
+
+
+class DashboardAsyncView(DashboardMixin):
+    """ ダッシュボード画面(asyncio) """
+    def __init__(self, query=None):
+        """コンストラクタ
+
+        @param query クエリ文字列
+        """
+        self._query = query
+        self._body = self._open_html_file()
+        self._db_word = AsyncWord()
+        self._db_activity = AsyncActivity()
+
+    async def view(self):
+        """レスポンス
+
+        @return HTMLレスポンス
+        @retval count 習得率データ
+        @retval activitys アクティビティデータ
+        @retval learningLog 習得ログデータ
+        """
+        counter = await self._db_word.count_summary()
+        activitys = await self._db_activity.select_activity_order_by_desc_limit_5()
+        learning_log = await self._db_activity.select_count_learning_date(
+            from_date=TODAY - timedelta(days=7),
+            to_date=TODAY
+        )
+        return self._render({
+            'count': self._convert_to_count_for_display(counter),
+            'activitys': self._convert_to_activity_for_display(activitys),
+            'learningLog': self._convert_to_learning_log_for_display(learning_log),
+        })
+
+
+class LearningLogAsyncView(LearningLogMixin):
+    """ 習得ログ(asyncio) """
+    def __init__(self, query=None):
+        """コンストラクタ
+
+        @param query クエリ文字列
+        """
+        self._query = query
+        self._db_activity = AsyncActivity()
+
+    async def view(self):
+        """レスポンス
+
+        @return JSONレスポンス
+        @retval count 習得単語数
+        @retval date アクティビティ日付
+        """
+        days = QueryValidate(self._query).validate_days()
+        rows = await self._db_activity.select_daily_count(DB_EVENT.LEARNED, **self._period(days))
+        return JsonResponse(self._convert_to_learning_log_for_display(rows))
+
+
+class LearningAsyncView(LearningMixin):
+    """ 学習画面(asyncio) """
+    def __init__(self, query=None):
+        """コンストラクタ
+
+        @param query クエリ文字列
+        """
+        self._query = query
+        self._db_word = AsyncWord()
+
+    async def view(self):
+        """レスポンス
+
+        @return JSONレスポンス
+        @retval id PKEY
+        @retval english 英単語
+        @retval correct 正解の日本語
+        @retval incorrect_1 不正解の日本語
+        @retval incorrect_2 不正解の日本語
+        @retval incorrect_3 不正解の日本語
+        @retval bookmark_flag 論理値
+        """
+        corrects = await self._db_word.select_learning()
+        incorrects = await self._db_word.select_incorrect()
+        return JsonResponse(self._convert_to_learning_for_display(corrects, incorrects))
@@ -0,0 +1,90 @@
+"""
+API(DataTablesサーバサイド処理)
+"""
+from module.api import QueryValidate, PAGE_SIZE, MAX_PAGE_SIZE
+from module.dbaccess import Word
+from module.response import JsonResponse
+from module.util import db_operation
+
+
+class DataTablesQueryValidate(QueryValidate):
+    """ クエリ文字列バリデーション(DataTablesサーバサイド処理) """
+    _orderable = ('id', 'english', 'japanese', 'is_correct')
+    _directions = ('asc', 'desc')
+
+    @QueryValidate._validate
+    def validate_datatables(self):
+        """DataTablesサーバサイド処理リクエストバリデーション
+
+        @return DataTables取得条件
+        @retval draw 描画回数(レスポンスにそのまま返却)
+        @retval start 取得開始位置
+        @retval length 取得件数
+        @retval search 検索文字列
+        @retval order_column ソート対象カラム
+        @retval order_dir ソート順
+        @exception ValueError
+        """
+        draw = int(self._req_data.get('draw', 0))
+        start = int(self._req_data.get('start', 0))
+        length = int(self._req_data.get('length', PAGE_SIZE))
+        if length == -1:
+            length = MAX_PAGE_SIZE
+        if draw < 0 or start < 0 or not 0 < length <= MAX_PAGE_SIZE:
+            raise ValueError()
+
+        order_index = int(self._req_data.get('order[0][column]', 0))
+        order_column = self._req_data.get(f'columns[{order_index}][data]', 'id')
+        order_dir = self._req_data.get('order[0][dir]', 'asc')
+        if order_column not in self._orderable or order_dir not in self._directions:
+            raise ValueError()
+
+        return {
+            'draw': draw,
+            'start': start,
+            'length': length,
+            'search': self._req_data.get('search[value]', ''),
+            'order_column': order_column,
+            'order_dir': order_dir,
+        }
+
+
+class EnglishListDataTablesView:
+    """ 単語一覧画面(DataTablesサーバサイド処理) """
+    def __init__(self, query=None):
+        """コンストラクタ
+
+        @param query クエリ文字列
+        """
+        self._query = query
+        self._db_word = Word()
+
+    def view(self):
+        """レスポンス
+
+        @return JSONレスポンス
+        @retval draw 描画回数
+        @retval recordsTotal 全単語数
+        @retval recordsFiltered 検索条件に一致した単語数
+        @retval data 表示ページの単語一覧データ
+        """
+        cond = DataTablesQueryValidate(self._query).validate_datatables()
+        return JsonResponse(self._select_datatables(cond))
+
+    @db_operation
+    def _select_datatables(self, cond):
+        """単語一覧データ取得(DataTablesサーバサイド処理)
+
+        @param cond DataTables取得条件
+        @return DataTablesレスポンスデータ
+        """
+        records_total, records_filtered, data = self._db_word.select_datatables(
+            cond['search'], cond['order_column'], cond['order_dir'],
+            cond['start'], cond['length']
+        )
+        return {
+            'draw': cond['draw'],
+            'recordsTotal': records_total,
+            'recordsFiltered': records_filtered,
+            'data': data,
+        }
@@ -2,15 +2,36 @@
 
 collect_target.txt内のURLをスクレイピング
 スクレイピングした英語はWordテーブルに格納
+
+python module/collect.py [--resume]
+  --resume  前回中断した実行の完了済みURLを除いて再開
 """
-from concurrent.futures import ThreadPoolExecutor
-import re
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import multiprocessing
+import os
 import sys
+from typing import NamedTuple
+
+from crawler import Crawler
+from dbaccess import BULK_BATCH_SIZE, Word, DbOperationError, migrate
+from dbaccess_crawl import CrawlState, CrawlCheckpoint
+from extract import extract_words
+from pipeline import Pipeline
+
+
+# HTML解析のワーカープロセス数(1の場合は同一プロセスで解析、1未満は1とする)
+PARSE_WORKERS = max(int(os.environ.get('COLLECT_PARSE_WORKERS', os.cpu_count() or 1)), 1)
 
-from bs4 import BeautifulSoup
-import requests
 
-from dbaccess import Word, DbOperationError
+class Page(NamedTuple):
+    """ 解析結果用コンテナ """
+    url: str
+    words: list
+    etag: str = None
+    last_modified: str = None
+    content_hash: str = None
 
 
 def _get_urls(file_path):
@@ -24,69 +45,173 @@ def _get_urls(file_path):
     except FileNotFoundError:
         sys.exit()
 
-def _request(urls):
-    """リクエスト
-
-    @param urls スクレイピング対象URLのリスト
-    @return Responseオブジェクト
-    """
-    with ThreadPoolExecutor() as executor:
-        return executor.map(requests.get, urls, timeout=3)
-
 
 class Collector:
-    """ 英単語のスクレイピング """
-    def __init__(self):
+    """ 英単語のスクレイピング
+
+    取得 → 解析(英語以外の除外を含む) → DB挿入 を上限付きキューで接続したパイプラインで実行する
+    メモリ使用量はキューの上限で決まり、解析済みのページから順にDBに挿入する
+    前回取得時から変更のないページ(304、または本文のハッシュ値が同じ)は解析しない
+    完了したURLは英単語の挿入ごとにチェックポイントとして記録し、中断後はresumeで再開できる
+    """
+    def __init__(self, urls=None, crawler=None, resume=False):
         """コンストラクタ
+
+        @param urls スクレイピング対象URLのリスト(指定なしの場合はcollect_target.txt)
+        @param crawler クローラー
+        @param resume Trueの場合は完了済みURLを除外、Falseの場合はチェックポイントを削除
         """
-        self._markups = _request(_get_urls('./setting/collect_target.txt'))
+        urls = urls if urls is not None else _get_urls('./setting/collect_target.txt')
+        self._crawler = crawler or Crawler()
+        self._executor = None
+        self._pairs = []
+        self._states = []
+        self._checkpoints = []
         try:
             self._db_word = Word()
+            self._db_crawl_state = CrawlState()
+            self._db_checkpoint = CrawlCheckpoint()
+            self._crawled = self._db_crawl_state.select_all()
+            if resume:
+                completed = self._db_checkpoint.select_completed()
+                urls = [url for url in urls if url not in completed]
+            else:
+                self._db_checkpoint.clear()
         except DbOperationError:
             sys.exit()
+        self._urls = urls
 
-    def collect(self):
+    def collect(self, workers=PARSE_WORKERS, on_progress=None):
         """スクレイピング
 
-        @exception HTTPError 接続エラー
-        @exception AttributeError 要素取得エラー
+        @param workers HTML解析のワーカープロセス数(1以下の場合は同一プロセスで解析)
+        @param on_progress 実行中に各ステージの統計を受け取る関数
+        @return 各ステージの統計
         """
-        eng_list, jap_list = [], []
-        for markup in self._markups:
+        pipeline = Pipeline()
+        workers = max(workers, 1)
+        pipeline.stage('parse', self._parse, threads=workers)
+        pipeline.stage('write', self._write, close=self._flush)
+        pages = self._crawler.iter(self._urls, self._conditional_headers)
+        if workers <= 1:
+            return pipeline.run('fetch', pages, on_progress)
+
+        # DB接続をワーカーに引き継がないようforkではなくspawnで起動する
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            self._executor = executor
             try:
-                markup.raise_for_status()
-            except requests.HTTPError:
-                continue
+                return pipeline.run('fetch', pages, on_progress)
+            finally:
+                self._executor = None
 
-            bs_obj = BeautifulSoup(markup.content, 'lxml')
-            try:
-                eng = [i.text for i in bs_obj.find_all(class_="eng")]
-                jap = [i.text for i in bs_obj.find_all(class_="jap")]
-            except AttributeError:
-                continue
-            eng_list.extend(eng)
-            jap_list.extend(jap)
-
-        self.insert_db(eng_list, jap_list)
+    def _conditional_headers(self, url):
+        """条件付きリクエストのヘッダー
 
-    def insert_db(self, eng_list, jap_list):
+        @param url URL
+        @return リクエストヘッダー(前回取得時の状態がない場合はNone)
+        """
+        state = self._crawled.get(url)
+        if state is None:
+            return None
+        headers = {}
+        if state['etag']:
+            headers['If-None-Match'] = state['etag']
+        if state['last_modified']:
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers or None
+
+    def _parse(self, markup):
+        """HTML解析
+
+        @param markup 取得結果
+        @return 解析結果(取得失敗の場合はNone、変更なしの場合は単語なし)
+        """
+        state = self._crawled.get(markup.url)
+        if markup.status == 304 and state is not None:
+            return Page(
+                markup.url, [], state['etag'], state['last_modified'], state['content_hash'])
+        if markup.status != 200:
+            return None
+
+        content_hash = hashlib.sha256(markup.body).hexdigest()
+        page = Page(
+            markup.url, [],
+            markup.headers.get('ETag'), markup.headers.get('Last-Modified'), content_hash
+        )
+        if state is not None and state['content_hash'] == content_hash:
+            return page
+        if self._executor is None:
+            words = extract_words(markup.body)
+        else:
+            words = self._executor.submit(extract_words, markup.body).result()
+        return page._replace(words=words)
+
+    def _write(self, page):
+        """DB挿入(一定件数ごと)
+
+        @param page 解析結果
+        """
+        self._pairs.extend(page.words)
+        self._states.append(
+            (page.url, page.etag, page.last_modified, page.content_hash))
+        self._checkpoints.append((page.url, [english for english, _ in page.words]))
+        if len(self._pairs) >= BULK_BATCH_SIZE or len(self._states) >= BULK_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        """未挿入分をDBに挿入
+
+        取得状態、チェックポイントは単語の挿入後に更新する(単語の挿入に失敗したページは次回も解析する)
+        チェックポイントにはページごとに実際に挿入、更新した件数を記録する
+        同じ英語が複数のページにある場合は後のページの件数とする(bulk_upsertと同じく後のものを優先)
+        """
+        pairs, self._pairs = self._pairs, []
+        states, self._states = self._states, []
+        checkpoints, self._checkpoints = self._checkpoints, []
+        written = self.insert_db(pairs)
+        if written is None:
+            return
+        self._db_crawl_state.upsert(states)
+        written = set(written)
+        counts = []
+        for url, englishes in reversed(checkpoints):
+            counts.append((url, len(written.intersection(englishes))))
+            written.difference_update(englishes)
+        self._db_checkpoint.insert(counts[::-1])
+
+    def insert_db(self, pairs):
         """DBに挿入
 
-        @param eng_list 英単語リスト
-        @param jap_list 日本語リスト
-        @exception DbOperationError データベース操作エラー
+        @param pairs (英語, 日本語)のリスト
+        @return 挿入、更新した英語のリスト(挿入に失敗した場合はNone)
         """
-        reg = re.compile(r'[a-z|A-Z|\s]+')
-        for eng, jap in zip(eng_list, jap_list):
-            try:
-                if reg.match(eng) is None:
-                    # 英語以外
-                    continue
-                self._db_word.insert(eng.strip(), jap)
-            except DbOperationError:
-                continue
+        if not pairs:
+            return []
+        try:
+            return self._db_word.bulk_upsert(pairs)
+        except DbOperationError:
+            return None
+
+
+def _print_progress(stats):
+    """各ステージの統計を標準エラー出力に表示
+
+    @param stats StageStatsのリスト
+    """
+    print(' | '.join(
+        f'{s.name}: {s.processed} ({s.throughput:.1f}/s, queue {s.queue_depth}, errors {s.errors})'
+        for s in stats
+    ), file=sys.stderr)
 
 
 if __name__ == '__main__':
-    inst = Collector()
-    inst.collect()
+    parser = argparse.ArgumentParser(description='英語スクレイピング')
+    parser.add_argument('--resume', action='store_true', help='前回中断した実行を再開')
+    args = parser.parse_args()
+    try:
+        migrate()
+    except DbOperationError:
+        sys.exit()
+    inst = Collector(resume=args.resume)
+    _print_progress(inst.collect(on_progress=_print_progress))
@@ -0,0 +1,158 @@
+"""非同期クローラー
+
+aiohttpでスクレイピング対象URLを並行取得
+"""
+import asyncio
+import os
+import random
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+import aiohttp
+
+
+# 全体の同時リクエスト数、ホストごとの同時接続数
+CRAWL_CONCURRENCY = int(os.environ.get('CRAWL_CONCURRENCY', 64))
+CRAWL_PER_HOST = int(os.environ.get('CRAWL_PER_HOST', 8))
+
+# リトライ回数、リトライ間隔の初期値(秒、リトライごとに倍)
+CRAWL_RETRIES = int(os.environ.get('CRAWL_RETRIES', 3))
+CRAWL_BACKOFF = float(os.environ.get('CRAWL_BACKOFF', 0.5))
+
+# 接続、読み込みのタイムアウト(秒)
+CRAWL_CONNECT_TIMEOUT = float(os.environ.get('CRAWL_CONNECT_TIMEOUT', 3))
+CRAWL_READ_TIMEOUT = float(os.environ.get('CRAWL_READ_TIMEOUT', 10))
+
+# リトライするステータスコード
+RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+
+
+class FetchResult(NamedTuple):
+    """ 取得結果用コンテナ """
+    url: str
+    status: int
+    body: bytes = b''
+    headers: Mapping = MappingProxyType({})
+    error: str = None
+
+
+class Crawler:
+    """ 非同期クローラー """
+    def __init__(self, concurrency=CRAWL_CONCURRENCY, per_host=CRAWL_PER_HOST,
+                 retries=CRAWL_RETRIES, backoff=CRAWL_BACKOFF,
+                 connect_timeout=CRAWL_CONNECT_TIMEOUT, read_timeout=CRAWL_READ_TIMEOUT):
+        """コンストラクタ
+
+        @param concurrency 全体の同時リクエスト数
+        @param per_host ホストごとの同時接続数
+        @param retries リトライ回数
+        @param backoff リトライ間隔の初期値(秒)
+        @param connect_timeout 接続タイムアウト(秒)
+        @param read_timeout 読み込みタイムアウト(秒)
+        """
+        self._concurrency = concurrency
+        self._per_host = per_host
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout)
+
+    def run(self, urls, headers=None):
+        """全URLを取得
+
+        @param urls 取得対象URLのイテラブル
+        @param headers URLを受け取り、リクエストヘッダーを返却する関数
+        @return 取得結果(FetchResult)のリスト(取得完了順)
+        """
+        return list(self.iter(urls, headers))
+
+    def iter(self, urls, headers=None):
+        """全URLを逐次取得
+
+        次の結果を要求されるまでイベントループを進めないため、呼び出し元が詰まると取得も止まる
+        @param urls 取得対象URLのイテラブル
+        @param headers URLを受け取り、リクエストヘッダーを返却する関数
+        @return 取得結果(FetchResult)のジェネレータ(取得完了順)
+        """
+        loop = asyncio.new_event_loop()
+        results = self.fetch_all(urls, headers)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
+
+    async def fetch_all(self, urls, headers=None):
+        """全URLを並行取得
+
+        コネクションはホストごとにプールして再利用する
+        @param urls 取得対象URLのイテラブル
+        @param headers URLを受け取り、リクエストヘッダーを返却する関数(条件付きリクエスト等)
+        @return 取得結果(FetchResult)の非同期ジェネレータ(取得完了順)
+        """
+        url_queue = asyncio.Queue()
+        for url in urls:
+            url_queue.put_nowait(url)
+        total = url_queue.qsize()
+        if not total:
+            return
+
+        # 呼び出し元が詰まった場合にワーカーが取得を進めすぎないよう上限を設ける
+        results = asyncio.Queue(maxsize=self._concurrency)
+        connector = aiohttp.TCPConnector(limit=self._concurrency, limit_per_host=self._per_host)
+        async with aiohttp.ClientSession(connector=connector, timeout=self._timeout) as session:
+            workers = [
+                asyncio.create_task(self._worker(session, url_queue, results, headers))
+                for _ in range(min(self._concurrency, total))
+            ]
+            try:
+                for _ in range(total):
+                    yield await results.get()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self, session, url_queue, results, headers=None):
+        """取得ワーカー
+
+        @param session HTTPセッション
+        @param url_queue 取得対象URLのキュー
+        @param results 取得結果のキュー
+        @param headers URLを受け取り、リクエストヘッダーを返却する関数
+        """
+        while True:
+            try:
+                url = url_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await results.put(
+                await self.fetch(session, url, headers(url) if headers is not None else None))
+
+    async def fetch(self, session, url, headers=None):
+        """URL取得(リトライあり)
+
+        接続エラー、タイムアウト、RETRY_STATUSの場合は指数バックオフでリトライする
+        @param session HTTPセッション
+        @param url 取得対象URL
+        @param headers リクエストヘッダー
+        @return 取得結果
+        """
+        result = None
+        for attempt in range(self._retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+            try:
+                async with session.get(url, headers=headers) as response:
+                    result = FetchResult(
+                        url, response.status, await response.read(), response.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                result = FetchResult(url, 0, error=repr(err))
+                continue
+            if result.status not in RETRY_STATUS:
+                return result
+        return result
@@ -4,10 +4,14 @@ PostgreSQLサーバにアクセス
 """
 import logging.config
 import os
+import threading
+import time
 from typing import NamedTuple
+from uuid import uuid4
 
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extensions import STATUS_READY
+from psycopg2.extras import DictCursor, execute_values
 
 
 logging.config.fileConfig('./setting/logging.conf')
@@ -27,9 +31,157 @@ DATABASE = {
         ('date date NOT NULL'),
         ('type text NOT NULL'),
         ('detail text NOT NULL'),
+        ('event smallint'),
+        ('word_id integer'),
+    ],
+    'word_counter': [
+        ('id smallint PRIMARY KEY CHECK (id = 1)'),
+        ('total bigint NOT NULL DEFAULT 0'),
+        ('is_correct bigint NOT NULL DEFAULT 0'),
+        ('bookmark bigint NOT NULL DEFAULT 0'),
+    ],
+    'activity_daily': [
+        ('date date NOT NULL'),
+        ('event smallint NOT NULL'),
+        ('count integer NOT NULL DEFAULT 0'),
+        ('PRIMARY KEY (event, date)'),
+    ],
+    'crawl_state': [
+        ('url text PRIMARY KEY'),
+        ('etag text'),
+        ('last_modified text'),
+        ('content_hash text'),
+        ('crawled_at timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP'),
+    ],
+    'crawl_checkpoint': [
+        ('url text PRIMARY KEY'),
+        ('words integer NOT NULL'),
+        ('completed_at timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP'),
+    ],
+    'schema_version': [
+        ('version integer PRIMARY KEY'),
+        ('applied_at timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP'),
     ],
 }
 
+# wordテーブルからダッシュボード用カウンタを再集計
+WORD_COUNTER_RECONCILE_SQL = 'INSERT INTO word_counter (id, total, is_correct, bookmark) '\
+    'SELECT 1, COUNT(*), COUNT(*) FILTER (WHERE is_correct), COUNT(*) FILTER (WHERE bookmark) '\
+    'FROM word ON CONFLICT (id) DO UPDATE SET total = EXCLUDED.total, '\
+    'is_correct = EXCLUDED.is_correct, bookmark = EXCLUDED.bookmark;'
+
+# activityテーブルから日別アクティビティ数を再集計
+ACTIVITY_DAILY_RECONCILE_SQL = 'INSERT INTO activity_daily (date, event, count) '\
+    'SELECT date, event, COUNT(*) FROM activity WHERE event IS NOT NULL GROUP BY date, event '\
+    'ON CONFLICT (event, date) DO UPDATE SET count = EXCLUDED.count;'
+
+# 同期版(psycopg2)、asyncio版(dbaccess_async)で共用する参照SQL
+WORD_COUNT_SUMMARY_SQL = 'SELECT total, is_correct, bookmark FROM word_counter WHERE id = 1;'
+WORD_LEARNING_SQL = 'SELECT id, english, japanese, bookmark FROM word WHERE is_correct = FALSE;'
+WORD_INCORRECT_SQL = 'SELECT japanese FROM word WHERE is_correct = FALSE;'
+ACTIVITY_LATEST_SQL = 'SELECT type, detail FROM activity ORDER BY id DESC LIMIT 5;'
+
+# マイグレーション定義
+# (バージョン, SQL文) 適用済みバージョンはschema_versionテーブルで管理
+# {<テーブル名>} はDATABASEのカラム定義に置換される
+MIGRATIONS = (
+    (1, (
+        'CREATE TABLE IF NOT EXISTS word ({word});',
+        'CREATE TABLE IF NOT EXISTS activity ({activity});',
+    )),
+    # 学習対象(未習得)・ブックマークの部分インデックス、学習ログ集計用の複合インデックス
+    (2, (
+        'CREATE INDEX IF NOT EXISTS word_learning_idx ON word (id) WHERE is_correct = FALSE;',
+        'CREATE INDEX IF NOT EXISTS word_bookmark_idx ON word (id) WHERE bookmark = TRUE;',
+        'CREATE INDEX IF NOT EXISTS activity_type_date_idx ON activity (type, date);',
+    )),
+    # ダッシュボード用カウンタ(wordテーブルのトリガーで同一トランザクション内に更新)
+    (3, (
+        'CREATE TABLE IF NOT EXISTS word_counter ({word_counter});',
+        WORD_COUNTER_RECONCILE_SQL,
+        'CREATE OR REPLACE FUNCTION word_counter_update() RETURNS trigger AS $$ '
+        'BEGIN '
+        "IF TG_OP <> 'DELETE' THEN "
+        'UPDATE word_counter AS c SET total = c.total + n.total, '
+        'is_correct = c.is_correct + n.is_correct, bookmark = c.bookmark + n.bookmark '
+        'FROM (SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE is_correct) AS is_correct, '
+        'COUNT(*) FILTER (WHERE bookmark) AS bookmark FROM new_rows) AS n WHERE c.id = 1; '
+        'END IF; '
+        "IF TG_OP <> 'INSERT' THEN "
+        'UPDATE word_counter AS c SET total = c.total - o.total, '
+        'is_correct = c.is_correct - o.is_correct, bookmark = c.bookmark - o.bookmark '
+        'FROM (SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE is_correct) AS is_correct, '
+        'COUNT(*) FILTER (WHERE bookmark) AS bookmark FROM old_rows) AS o WHERE c.id = 1; '
+        'END IF; '
+        'RETURN NULL; '
+        'END; $$ LANGUAGE plpgsql;',
+        'DROP TRIGGER IF EXISTS word_counter_insert ON word;',
+        'CREATE TRIGGER word_counter_insert AFTER INSERT ON word '
+        'REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE PROCEDURE word_counter_update();',
+        'DROP TRIGGER IF EXISTS word_counter_update ON word;',
+        'CREATE TRIGGER word_counter_update AFTER UPDATE ON word '
+        'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE PROCEDURE word_counter_update();',
+        'DROP TRIGGER IF EXISTS word_counter_delete ON word;',
+        'CREATE TRIGGER word_counter_delete AFTER DELETE ON word '
+        'REFERENCING OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE PROCEDURE word_counter_update();',
+    )),
+    # アクティビティのイベント種別、単語PKEY(既存データは種別と詳細文から補完)
+    (4, (
+        'ALTER TABLE activity ADD COLUMN IF NOT EXISTS event smallint;',
+        'ALTER TABLE activity ADD COLUMN IF NOT EXISTS word_id integer;',
+        'UPDATE activity SET event = CASE '
+        "WHEN type = '0' AND detail LIKE '%を習得しました' THEN 1 "
+        "WHEN type = '0' THEN 2 "
+        "WHEN type = '3' AND detail LIKE '%をブックマーク登録しました' THEN 3 "
+        "WHEN type IN ('3', '4') THEN 4 "
+        "WHEN type = '1' THEN 5 "
+        "WHEN type = '2' THEN 6 "
+        'END WHERE event IS NULL;',
+        'UPDATE activity AS a SET word_id = w.id FROM word AS w '
+        'WHERE a.word_id IS NULL AND w.english = CASE WHEN a.event = 5 '
+        "THEN substring(a.detail from '^英語: (.*) 日本語: ') "
+        "ELSE substring(a.detail from '^(.*)を[^を]*しました$') END;",
+        'DROP INDEX IF EXISTS activity_type_date_idx;',
+        'CREATE INDEX IF NOT EXISTS activity_event_date_idx ON activity (event, date);',
+    )),
+    # 日別アクティビティ数(activityテーブルのトリガーで同一トランザクション内に更新)
+    (5, (
+        'CREATE TABLE IF NOT EXISTS activity_daily ({activity_daily});',
+        ACTIVITY_DAILY_RECONCILE_SQL,
+        'CREATE OR REPLACE FUNCTION activity_daily_update() RETURNS trigger AS $$ '
+        'BEGIN '
+        'INSERT INTO activity_daily (date, event, count) '
+        'SELECT date, event, COUNT(*) FROM new_rows WHERE event IS NOT NULL GROUP BY date, event '
+        'ON CONFLICT (event, date) DO UPDATE SET count = activity_daily.count + EXCLUDED.count; '
+        'RETURN NULL; '
+        'END; $$ LANGUAGE plpgsql;',
+        'DROP TRIGGER IF EXISTS activity_daily_insert ON activity;',
+        'CREATE TRIGGER activity_daily_insert AFTER INSERT ON activity '
+        'REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE PROCEDURE activity_daily_update();',
+    )),
+    # スクレイピング対象URLごとの取得状態(条件付きリクエスト、変更検知用)
+    (6, (
+        'CREATE TABLE IF NOT EXISTS crawl_state ({crawl_state});',
+    )),
+    # スクレイピング実行中に完了したURL(中断後の再開用)
+    (7, (
+        'CREATE TABLE IF NOT EXISTS crawl_checkpoint ({crawl_checkpoint});',
+    )),
+)
+
+# ストリーミング取得時のサーバサイドカーソルのフェッチ件数
+STREAM_BATCH_SIZE = int(os.environ.get('PSQL_STREAM_BATCH_SIZE', 1000))
+
+# 一括挿入時の1文あたりの件数
+BULK_BATCH_SIZE = int(os.environ.get('PSQL_BULK_BATCH_SIZE', 1000))
+
+# マイグレーションの同時実行防止用アドバイザリロックID
+MIGRATION_LOCK_ID = 20201018
+
 
 class Flag(NamedTuple):
     """ フラグ用コンテナ """
@@ -37,27 +189,300 @@ class Flag(NamedTuple):
     FALSE: str = 'FALSE'
 
 
+class Event(NamedTuple):
+    """ アクティビティイベント種別用コンテナ """
+    LEARNED: int = 1
+    UNLEARNED: int = 2
+    BOOKMARKED: int = 3
+    UNBOOKMARKED: int = 4
+    REGISTERED: int = 5
+    DELETED: int = 6
+
+
+class ActivityRecord(NamedTuple):
+    """ アクティビティ登録用コンテナ
+
+    詳細は prefix + 対象の英語 + suffix で組み立てる
+    """
+    date: object
+    type_id: int
+    event: int
+    prefix: str = ''
+    suffix: str = ''
+
+
 class DbOperationError(Exception):
     """ データベース操作エラー """
     pass
 
 
+class ConnectionPool:
+    """ コネクションプール(スレッドセーフ) """
+    def __init__(self, minconn, maxconn, idle_timeout, checkout_timeout=None, **conn_params):
+        """コンストラクタ
+
+        @param minconn 最小接続数
+        @param maxconn 最大接続数
+        @param idle_timeout アイドル接続の破棄までの秒数
+        @param checkout_timeout 貸し出し待ちの最大秒数(Noneの場合は無制限)
+        @param conn_params psycopg2.connectの引数
+        """
+        self._minconn = minconn
+        self._maxconn = maxconn
+        self._idle_timeout = idle_timeout
+        self._checkout_timeout = checkout_timeout
+        self._conn_params = conn_params
+        self._idle = []
+        self._used = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self):
+        """新規接続
+
+        @return コネクション
+        @exception DbOperationError
+        """
+        try:
+            return psycopg2.connect(**self._conn_params)
+        except psycopg2.Error as err:
+            LOGGER.error(err)
+            raise DbOperationError(err)
+
+    def _is_healthy(self, conn, idle_at):
+        """ヘルスチェック
+
+        @param conn コネクション
+        @param idle_at プールに返却された時刻
+        @return 論理値
+        """
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_at > self._idle_timeout:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute('SELECT 1;')
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        """コネクション破棄
+
+        @param conn コネクション
+        """
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def getconn(self):
+        """コネクション貸し出し
+
+        空きがない場合は返却されるまで待機する(checkout_timeout秒を超えた場合はエラー)
+        @return コネクション
+        @exception DbOperationError
+        """
+        with self._cond:
+            if self._closed:
+                raise DbOperationError('connection pool is closed')
+            if not self._cond.wait_for(
+                    lambda: self._idle or self._used < self._maxconn,
+                    self._checkout_timeout):
+                LOGGER.error('connection pool checkout timed out')
+                raise DbOperationError('connection pool checkout timed out')
+            self._used += 1
+
+        while True:
+            with self._cond:
+                if not self._idle:
+                    break
+                conn, idle_at = self._idle.pop()
+            if self._is_healthy(conn, idle_at):
+                return conn
+            self._discard(conn)
+
+        try:
+            return self._connect()
+        except DbOperationError:
+            with self._cond:
+                self._used -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn):
+        """コネクション返却
+
+        @param conn コネクション
+        """
+        if not conn.closed and conn.status != STATUS_READY:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                self._discard(conn)
+
+        expired = []
+        with self._cond:
+            self._used -= 1
+            if self._closed or conn.closed:
+                expired.append(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            # 最小接続数を超えるアイドル接続はタイムアウトで破棄
+            now = time.monotonic()
+            while len(self._idle) > self._minconn \
+                    and now - self._idle[0][1] > self._idle_timeout:
+                expired.append(self._idle.pop(0)[0])
+            self._cond.notify()
+
+        for _conn in expired:
+            self._discard(_conn)
+
+    def closeall(self):
+        """全コネクション破棄
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+def get_pool():
+    """プロセス共通のコネクションプールを取得
+
+    @return コネクションプール
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ConnectionPool(
+                minconn=int(os.environ.get('PSQL_POOL_MIN', 1)),
+                maxconn=int(os.environ.get('PSQL_POOL_MAX', 10)),
+                idle_timeout=float(os.environ.get('PSQL_POOL_IDLE_TIMEOUT', 300)),
+                checkout_timeout=float(os.environ.get('PSQL_POOL_TIMEOUT', 30)),
+                **connection_params()
+            )
+        return _POOL
+
+
+def connection_params():
+    """接続パラメータ
+
+    @return 接続パラメータ
+    @retval host ホスト
+    @retval dbname データベース名
+    @retval user ユーザー
+    @retval password パスワード
+    """
+    return {
+        'host': os.environ['PSQL_HOST'],
+        'dbname': os.environ['PSQL_DB_NAME'],
+        'user': os.environ['PSQL_USER'],
+        'password': os.environ['PSQL_PASSWORD'],
+    }
+
+
+def close_pool():
+    """コネクションプールを破棄
+    """
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.closeall()
+
+
+def acquire_connection():
+    """リクエスト(スレッド)単位でコネクションを貸し出し
+
+    同一スレッド内の各テーブルクラスは同じコネクションを共有する
+    切断済みのコネクションは貸し出し元のプールに返却してから新たに借りる
+    @return コネクション
+    """
+    conn = getattr(_LOCAL, 'conn', None)
+    if conn is not None and conn.closed:
+        release_connection()
+        conn = None
+    if conn is None:
+        pool = get_pool()
+        conn = pool.getconn()
+        _LOCAL.conn, _LOCAL.pool = conn, pool
+    return conn
+
+
+def release_connection():
+    """リクエスト(スレッド)単位のコネクションを貸し出し元のプールに返却
+
+    close_pool後にget_poolで新しいプールを生成しないよう、貸し出し元のプールを記録しておく
+    """
+    conn = getattr(_LOCAL, 'conn', None)
+    if conn is None:
+        return
+    pool = _LOCAL.pool
+    _LOCAL.conn = _LOCAL.pool = None
+    pool.putconn(conn)
+
+
+def daily_count_query(event, from_date=None, to_date=None):
+    """日別アクティビティ数取得SQL
+
+    @param event イベント種別(Event)
+    @param from_date 集計開始日(Noneの場合は全期間)
+    @param to_date 集計終了日(Noneの場合は全期間)
+    @return (SQL文, プレースホルダーの値)
+    """
+    sql = 'SELECT count, date FROM activity_daily WHERE event = %s'
+    data = (event,)
+    if from_date is not None:
+        sql += ' AND date >= %s'
+        data += (from_date,)
+    if to_date is not None:
+        sql += ' AND date <= %s'
+        data += (to_date,)
+    return sql + ' ORDER BY date;', data
+
+
+def execute_values_and_commit(conn, sql, rows):
+    """複数行SQL実行、コミット
+
+    @param conn コネクション
+    @param sql SQL文(VALUES %s)
+    @param rows 値のリスト
+    @exception DbOperationError データベース操作エラー
+    """
+    try:
+        with conn.cursor() as cur:
+            execute_values(cur, sql, rows)
+        conn.commit()
+    except psycopg2.Error as err:
+        conn.rollback()
+        LOGGER.error(err)
+        raise DbOperationError(err)
+
+
 class Common:
     """ 基底クラス """
     def __init__(self, table):
-        """データベース接続及びテーブル作成
+        """データベース接続
 
+        テーブル作成はmigrateで起動時に一度だけ行う
         @param table テーブル
         """
-        self.conn = psycopg2.connect(
-            host=os.environ['PSQL_HOST'],
-            dbname=os.environ['PSQL_DB_NAME'],
-            user=os.environ['PSQL_USER'],
-            password=os.environ['PSQL_PASSWORD'],
-        )
+        self.table = table
+        self.conn = acquire_connection()
         self.cur = self.conn.cursor(cursor_factory=DictCursor)
-        self.execute(
-            f'CREATE TABLE IF NOT EXISTS {table} ({self.concat_columns(DATABASE[table])});')
 
     def generator_dict_factory(self, rows):
         """取得データをジェネレータに変換
@@ -75,6 +500,33 @@ class Common:
         """
         return [dict(r) for r in rows]
 
+    def iter_dict_factory(self, sql, data=None, batch_size=STREAM_BATCH_SIZE):
+        """サーバサイドカーソルで取得データを逐次辞書型に変換
+
+        レスポンス送信中も読み込むため、リクエスト単位とは別のコネクションを使用する
+        メモリ使用量はbatch_size件分に収まる
+        @param sql SQL文
+        @param data プレースホルダーの値
+        @param batch_size 1回のフェッチ件数
+        @return ジェネレータ
+        @exception DbOperationError データベース操作エラー
+        """
+        pool = get_pool()
+        conn = pool.getconn()
+        try:
+            with conn.cursor(name=f'stream_{uuid4().hex}', cursor_factory=DictCursor) as cur:
+                cur.itersize = batch_size
+                cur.execute(sql, data)
+                for row in cur:
+                    yield dict(row)
+            conn.commit()
+        except psycopg2.Error as err:
+            conn.rollback()
+            LOGGER.error(err)
+            raise DbOperationError(err)
+        finally:
+            pool.putconn(conn)
+
     def concat_columns(self, columns):
         """SQL文用にカラムを結合
 
@@ -105,31 +557,112 @@ class Common:
             raise DbOperationError(err)
 
 
+class SchemaVersion(Common):
+    """ schema_versionテーブルクラス """
+    def __init__(self):
+        """コンストラクタ
+        """
+        super().__init__('schema_version')
+
+    def migrate(self):
+        """未適用のマイグレーションを適用
+
+        全バージョンを1トランザクションで適用する(冪等)
+        @return 適用後のバージョン
+        @exception DbOperationError データベース操作エラー
+        """
+        columns = {t: self.concat_columns(c) for t, c in DATABASE.items()}
+        super().execute(
+            'CREATE TABLE IF NOT EXISTS schema_version ({schema_version});'.format(**columns))
+        try:
+            self.cur.execute('SELECT pg_advisory_xact_lock(%s);', (MIGRATION_LOCK_ID,))
+            self.cur.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version;')
+            current = self.cur.fetchone()[0]
+            for version, statements in MIGRATIONS:
+                if version <= current:
+                    continue
+                for sql in statements:
+                    self.cur.execute(sql.format(**columns))
+                self.cur.execute(
+                    'INSERT INTO schema_version (version) VALUES (%s);', (version,))
+                LOGGER.info(f'schema migrated to version {version}')
+                current = version
+            self.conn.commit()
+        except psycopg2.Error as err:
+            self.conn.rollback()
+            LOGGER.error(err)
+            raise DbOperationError(err)
+        return current
+
+
+def migrate():
+    """スキーマのブートストラップ
+
+    サーバ起動時に一度だけ呼び出す
+    @return 適用後のバージョン
+    @exception DbOperationError データベース操作エラー
+    """
+    try:
+        return SchemaVersion().migrate()
+    finally:
+        release_connection()
+
+
 class Word(Common):
     """ wordテーブルクラス """
-    def __init__(self):
+    def __init__(self, activity_writer=None):
         """コンストラクタ
+
+        @param activity_writer アクティビティ書き込み(指定した場合はアクティビティを非同期に書き込む)
         """
         super().__init__('word')
+        self._activity_writer = activity_writer
 
     def insert(self, eng_val, jap_val):
         """挿入
 
         @param eng_val 英語
         @param jap_val 日本語
+        @return 登録した単語のPKEY
         """
         sql = 'INSERT INTO word (english, japanese) '\
-            'VALUES (%s, %s) ON CONFLICT (english) DO UPDATE SET japanese = %s;'
+            'VALUES (%s, %s) ON CONFLICT (english) DO UPDATE SET japanese = %s RETURNING id;'
         super().execute(sql, (eng_val, jap_val, jap_val))
+        return self.cur.fetchone()[0]
+
+    def bulk_upsert(self, pairs, batch_size=BULK_BATCH_SIZE):
+        """一括挿入(登録済みの英語は日本語を更新)
+
+        複数行INSERT ... ON CONFLICTをbatch_size件ずつ実行し、全件を1トランザクションでコミットする
+        同じ英語が複数ある場合は後のものを優先し、日本語が変わらない行は更新しない
+        @param pairs (英語, 日本語)のイテラブル
+        @param batch_size 1文あたりの件数
+        @return 挿入、更新した英語のリスト
+        @exception DbOperationError データベース操作エラー
+        """
+        rows = list(dict(pairs).items())
+        sql = 'INSERT INTO word (english, japanese) VALUES %s '\
+            'ON CONFLICT (english) DO UPDATE SET japanese = EXCLUDED.japanese '\
+            'WHERE word.japanese IS DISTINCT FROM EXCLUDED.japanese RETURNING english;'
+        written = []
+        try:
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i:i + batch_size]
+                returned = execute_values(self.cur, sql, batch, page_size=len(batch), fetch=True)
+                written.extend(row[0] for row in returned)
+            self.conn.commit()
+        except psycopg2.Error as err:
+            self.conn.rollback()
+            LOGGER.error(err)
+            raise DbOperationError(err)
+        return written
 
     def select_learning(self):
         """学習データ取得
 
         @return 学習データ
         """
-        super().execute(
-            'SELECT id, english, japanese, bookmark FROM word WHERE is_correct = FALSE;'
-        )
+        super().execute(WORD_LEARNING_SQL)
         return super().generator_dict_factory(self.cur.fetchall())
 
     def select_incorrect(self):
@@ -137,7 +670,7 @@ class Word(Common):
 
         @return 不正解用データ
         """
-        super().execute('SELECT japanese FROM word WHERE is_correct = FALSE;')
+        super().execute(WORD_INCORRECT_SQL)
         return self.cur.fetchall()
 
     def select_english_list(self):
@@ -148,6 +681,56 @@ class Word(Common):
         super().execute('SELECT id, english, japanese, is_correct FROM word ORDER BY id;')
         return super().dict_factory(self.cur.fetchall())
 
+    def select_english_list_page(self, after_id, limit):
+        """単語一覧データ取得(キーセットページネーション)
+
+        主キーの範囲検索で取得するため、ページ位置に関わらず一定時間で返却する
+        @param after_id このPKEYより後を取得(先頭ページの場合はNone)
+        @param limit 取得件数
+        @return 単語一覧データ
+        """
+        sql = 'SELECT id, english, japanese, is_correct FROM word '\
+            'WHERE id > %s ORDER BY id LIMIT %s;'
+        super().execute(sql, (after_id if after_id is not None else 0, limit))
+        return super().dict_factory(self.cur.fetchall())
+
+    def select_datatables(self, search, order_column, order_dir, start, length):
+        """単語一覧データ取得(DataTablesサーバサイド処理)
+
+        検索・ソート・ページングをSQL側で行い、表示ページ分のみ返却する
+        @param search 検索文字列(英語、日本語の部分一致)
+        @param order_column ソート対象カラム(呼び出し元でホワイトリスト検証済み)
+        @param order_dir ソート順(asc、desc)
+        @param start 取得開始位置
+        @param length 取得件数
+        @return 全単語数、検索条件に一致した単語数、単語一覧データ
+        """
+        records_total = self.count_summary()['total']
+
+        where, data = '', ()
+        if search:
+            # ワイルドカードはSQL側で付与し、検索文字列中の\、%、_はエスケープする
+            pattern = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where = "WHERE english ILIKE '%%' || %s || '%%' OR japanese ILIKE '%%' || %s || '%%' "
+            data = (pattern, pattern)
+            super().execute(f'SELECT COUNT(*) FROM word {where};', data)
+            records_filtered = self.cur.fetchone()[0]
+        else:
+            records_filtered = records_total
+
+        sql = 'SELECT id, english, japanese, is_correct FROM word '\
+            f'{where}ORDER BY {order_column} {order_dir}, id LIMIT %s OFFSET %s;'
+        super().execute(sql, data + (length, start))
+        return records_total, records_filtered, super().dict_factory(self.cur.fetchall())
+
+    def iter_english_list(self):
+        """単語一覧データ逐次取得
+
+        @return 単語一覧データのジェネレータ
+        """
+        return super().iter_dict_factory(
+            'SELECT id, english, japanese, is_correct FROM word ORDER BY id;')
+
     def select_bookmark(self):
         """ブックマーク一覧データ取得
 
@@ -156,29 +739,44 @@ class Word(Common):
         super().execute('SELECT id, english, japanese FROM word WHERE bookmark = TRUE;')
         return super().dict_factory(self.cur.fetchall())
 
-    def count_all(self):
-        """全単語数取得
+    def iter_bookmark(self):
+        """ブックマーク一覧データ逐次取得
 
-        @return 全単語数データ
+        @return ブックマーク一覧データのジェネレータ
         """
-        super().execute('SELECT COUNT(*) FROM word;')
-        return self.cur.fetchone()[0]
+        return super().iter_dict_factory(
+            'SELECT id, english, japanese FROM word WHERE bookmark = TRUE;')
 
-    def count_is_correct(self):
-        """習得済み単語数取得
+    def count_summary(self):
+        """登録単語数、習得済み単語数、ブックマーク数取得
 
-        @return 習得済み単語数データ
+        word_counterテーブルの主キー検索1回で取得する
+        @return カウンタデータ
+        @retval total 登録単語数
+        @retval is_correct 習得済み単語数
+        @retval bookmark ブックマーク数
         """
-        super().execute('SELECT COUNT(*) FROM word WHERE is_correct = TRUE;')
-        return self.cur.fetchone()[0]
+        super().execute(WORD_COUNT_SUMMARY_SQL)
+        row = self.cur.fetchone()
+        return dict(row) if row else {'total': 0, 'is_correct': 0, 'bookmark': 0}
 
-    def count_bookmark(self):
-        """ブックマーク数取得
+    def reconcile_counter(self):
+        """カウンタ再集計
 
-        @return ブックマーク数データ
+        カウンタのずれを修復するため、wordテーブルから全件集計し直す
+        集計中の更新を防ぐためwordテーブルをSHAREロックする
+        @return 再集計後のカウンタデータ
+        @exception DbOperationError データベース操作エラー
         """
-        super().execute('SELECT COUNT(*) FROM word WHERE bookmark = TRUE;')
-        return self.cur.fetchone()[0]
+        try:
+            self.cur.execute('LOCK TABLE word IN SHARE MODE;')
+            self.cur.execute(WORD_COUNTER_RECONCILE_SQL)
+            self.conn.commit()
+        except psycopg2.Error as err:
+            self.conn.rollback()
+            LOGGER.error(err)
+            raise DbOperationError(err)
+        return self.count_summary()
 
     def update_is_correct_flag(self, pkey, flag):
         """is_correctフラグ更新
@@ -212,6 +810,73 @@ class Word(Common):
         super().execute(sql, (pkey,))
         return self.cur.fetchone()[0]
 
+    def insert_with_activity(self, eng_val, jap_val, activity):
+        """挿入、アクティビティ登録
+
+        @param eng_val 英語
+        @param jap_val 日本語
+        @param activity アクティビティ(ActivityRecord)
+        @return 登録したアクティビティ詳細
+        """
+        sql = 'INSERT INTO word (english, japanese) VALUES (%s, %s) '\
+            'ON CONFLICT (english) DO UPDATE SET japanese = EXCLUDED.japanese '\
+            'RETURNING id, english'
+        return self._execute_with_activity(sql, (eng_val, jap_val), activity)
+
+    def update_is_correct_flag_with_activity(self, pkey, flag, activity):
+        """is_correctフラグ更新、アクティビティ登録
+
+        @param pkey PKEY
+        @param flag 論理値
+        @param activity アクティビティ(ActivityRecord)
+        @return 登録したアクティビティ詳細
+        """
+        sql = 'UPDATE word SET is_correct = %s WHERE id = %s RETURNING id, english'
+        return self._execute_with_activity(sql, (flag, pkey), activity)
+
+    def update_bookmark_flag_with_activity(self, pkey, flag, activity):
+        """bookmarkフラグ更新、アクティビティ登録
+
+        @param pkey PKEY
+        @param flag 論理値
+        @param activity アクティビティ(ActivityRecord)
+        @return 登録したアクティビティ詳細
+        """
+        sql = 'UPDATE word SET bookmark = %s WHERE id = %s RETURNING id, english'
+        return self._execute_with_activity(sql, (flag, pkey), activity)
+
+    def delete_with_activity(self, pkey, activity):
+        """削除、アクティビティ登録
+
+        @param pkey PKEY
+        @param activity アクティビティ(ActivityRecord)
+        @return 登録したアクティビティ詳細
+        """
+        sql = 'DELETE FROM word WHERE id = %s RETURNING id, english'
+        return self._execute_with_activity(sql, (pkey,), activity)
+
+    def _execute_with_activity(self, sql, data, activity):
+        """単語の更新とアクティビティ登録を1文で実行
+
+        データ変更CTEで実行するため、1往復、1コミットで両方が原子的に反映される
+        アクティビティ書き込みが有効な場合は単語の更新のみ行い、アクティビティは非同期に書き込む
+        @param sql 対象行のid、englishを返却する単語の更新SQL
+        @param data 単語の更新SQLのプレースホルダーの値
+        @param activity アクティビティ(ActivityRecord)
+        @return 登録したアクティビティ詳細
+        """
+        if self._activity_writer is not None:
+            super().execute(f'{sql};', data)
+            word_id, english = self.cur.fetchone()
+            return self._activity_writer.put(activity, word_id, english, self.conn)
+
+        sql = f'WITH w AS ({sql}) '\
+            'INSERT INTO activity (date, type, detail, event, word_id) '\
+            'SELECT %s, %s, %s || w.english || %s, %s, w.id FROM w RETURNING detail;'
+        super().execute(sql, data + (
+            activity.date, activity.type_id, activity.prefix, activity.suffix, activity.event))
+        return self.cur.fetchone()[0]
+
 
 class Activity(Common):
     """ activityテーブルクラス """
@@ -228,15 +893,18 @@ class Activity(Common):
         """
         super().__init__('activity')
 
-    def insert(self, date, type_id, detail):
+    def insert(self, date, type_id, detail, event=None, word_id=None):
         """挿入
 
         @param date アクティビティ日付
         @param type_id アクティビティ種別ID
         @param detail アクティビティ詳細
+        @param event イベント種別(Event)
+        @param word_id 対象単語のPKEY
         """
-        sql = 'INSERT INTO activity (date, type, detail) VALUES (%s, %s, %s);'
-        super().execute(sql, (date, type_id, detail))
+        sql = 'INSERT INTO activity (date, type, detail, event, word_id) '\
+            'VALUES (%s, %s, %s, %s, %s);'
+        super().execute(sql, (date, type_id, detail, event, word_id))
 
     def select_all(self):
         """全アクティビティ取得
@@ -246,22 +914,74 @@ class Activity(Common):
         super().execute('SELECT date, type, detail FROM activity ORDER BY id DESC;')
         return super().dict_factory(self.cur.fetchall())
 
+    def select_page(self, after_id, limit):
+        """アクティビティ取得(キーセットページネーション、新しい順)
+
+        主キーの範囲検索で取得するため、ページ位置に関わらず一定時間で返却する
+        @param after_id このPKEYより古いものを取得(先頭ページの場合はNone)
+        @param limit 取得件数
+        @return アクティビティデータ
+        """
+        if after_id is None:
+            sql = 'SELECT id, date, type, detail FROM activity ORDER BY id DESC LIMIT %s;'
+            super().execute(sql, (limit,))
+        else:
+            sql = 'SELECT id, date, type, detail FROM activity '\
+                'WHERE id < %s ORDER BY id DESC LIMIT %s;'
+            super().execute(sql, (after_id, limit))
+        return super().dict_factory(self.cur.fetchall())
+
+    def iter_all(self):
+        """全アクティビティ逐次取得
+
+        @return 全アクティビティデータのジェネレータ
+        """
+        return super().iter_dict_factory(
+            'SELECT date, type, detail FROM activity ORDER BY id DESC;')
+
     def select_activity_order_by_desc_limit_5(self):
         """最新アクティビティ5件取得
 
         @return 最新アクティビティ5件
         """
-        super().execute('SELECT type, detail FROM activity ORDER BY id DESC LIMIT 5;')
+        super().execute(ACTIVITY_LATEST_SQL)
         return super().dict_factory(self.cur.fetchall())
 
     def select_count_learning_date(self, from_date, to_date):
         """習得済み単語数取得
 
+        @param from_date 集計開始日
+        @param to_date 集計終了日
         @return 習得済み単語数データ
         """
-        sql = 'SELECT COUNT(date), date FROM activity '\
-            'WHERE type = %s AND date >= %s AND date <= %s AND detail LIKE %s '\
-            'GROUP BY date ORDER BY date;'
-        super().execute(
-            sql, (str(self.TYPE[0][0]), from_date, to_date, '%習得しました'))
+        return self.select_daily_count(Event().LEARNED, from_date, to_date)
+
+    def select_daily_count(self, event, from_date=None, to_date=None):
+        """日別アクティビティ数取得
+
+        activity_dailyテーブルから取得するため、期間の日数分の行のみ読み込む
+        @param event イベント種別(Event)
+        @param from_date 集計開始日(Noneの場合は全期間)
+        @param to_date 集計終了日(Noneの場合は全期間)
+        @return 日別アクティビティ数データ
+        @retval count アクティビティ数
+        @retval date アクティビティ日付
+        """
+        super().execute(*daily_count_query(event, from_date, to_date))
         return super().dict_factory(self.cur.fetchall())
+
+    def reconcile_daily(self):
+        """日別アクティビティ数再集計
+
+        ずれを修復するため、activityテーブルから全件集計し直す
+        集計中の挿入を防ぐためactivityテーブルをSHAREロックする
+        @exception DbOperationError データベース操作エラー
+        """
+        try:
+            self.cur.execute('LOCK TABLE activity IN SHARE MODE;')
+            self.cur.execute(ACTIVITY_DAILY_RECONCILE_SQL)
+            self.conn.commit()
+        except psycopg2.Error as err:
+            self.conn.rollback()
+            LOGGER.error(err)
+            raise DbOperationError(err)
@@ -0,0 +1,162 @@
+"""データベース操作(asyncio)
+
+ASGIエントリポイント用
+psycopg(バージョン3)の非同期コネクションプールで、イベントループをブロックせずにPostgreSQLサーバにアクセス
+psycopgがインストールされていない場合は利用しない(同期版をDB処理スレッドで実行)
+"""
+import asyncio
+import logging.config
+import os
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:
+    psycopg = None
+
+from module.dbaccess import (
+    WORD_COUNT_SUMMARY_SQL, WORD_LEARNING_SQL, WORD_INCORRECT_SQL, ACTIVITY_LATEST_SQL,
+    Event, DbOperationError, connection_params, daily_count_query
+)
+
+
+logging.config.fileConfig('./setting/logging.conf')
+LOGGER = logging.getLogger()
+
+# 非同期ドライバの利用可否(PSQL_ASYNC=0で無効)
+ASYNC_DB = psycopg is not None and os.environ.get('PSQL_ASYNC', '1') == '1'
+
+_ASYNC_POOL = None
+_ASYNC_POOL_LOCK = asyncio.Lock()
+
+
+async def get_async_pool():
+    """プロセス共通の非同期コネクションプールを取得
+
+    最大接続数、待機タイムアウト等は同期版のコネクションプールと同じ設定を使用する
+    @return 非同期コネクションプール
+    """
+    global _ASYNC_POOL
+    async with _ASYNC_POOL_LOCK:
+        if _ASYNC_POOL is None:
+            pool = AsyncConnectionPool(
+                kwargs=connection_params(),
+                min_size=int(os.environ.get('PSQL_POOL_MIN', 1)),
+                max_size=int(os.environ.get('PSQL_POOL_MAX', 10)),
+                max_idle=float(os.environ.get('PSQL_POOL_IDLE_TIMEOUT', 300)),
+                timeout=float(os.environ.get('PSQL_POOL_TIMEOUT', 30)),
+                open=False,
+            )
+            await pool.open()
+            _ASYNC_POOL = pool
+        return _ASYNC_POOL
+
+
+async def close_async_pool():
+    """非同期コネクションプールを破棄
+    """
+    global _ASYNC_POOL
+    async with _ASYNC_POOL_LOCK:
+        pool, _ASYNC_POOL = _ASYNC_POOL, None
+    if pool is not None:
+        await pool.close()
+
+
+class AsyncCommon:
+    """ 基底クラス(asyncio) """
+    def __init__(self, table):
+        """コンストラクタ
+
+        コネクションはクエリごとにプールから借りる
+        @param table テーブル
+        """
+        self.table = table
+
+    async def fetchall(self, sql, data=None, as_dict=True):
+        """SQL実行、全件取得
+
+        @param sql SQL文
+        @param data プレースホルダーの値
+        @param as_dict Trueの場合は辞書型、Falseの場合はタプルで返却
+        @return 取得結果
+        @exception DbOperationError データベース操作エラー
+        """
+        pool = await get_async_pool()
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row if as_dict else None) as cur:
+                    await cur.execute(sql, data)
+                    return await cur.fetchall()
+        except psycopg.Error as err:
+            LOGGER.error(err)
+            raise DbOperationError(err)
+
+
+class AsyncWord(AsyncCommon):
+    """ wordテーブルクラス(asyncio) """
+    def __init__(self):
+        """コンストラクタ
+        """
+        super().__init__('word')
+
+    async def count_summary(self):
+        """登録単語数、習得済み単語数、ブックマーク数取得
+
+        @return カウンタデータ
+        @retval total 登録単語数
+        @retval is_correct 習得済み単語数
+        @retval bookmark ブックマーク数
+        """
+        rows = await self.fetchall(WORD_COUNT_SUMMARY_SQL)
+        return rows[0] if rows else {'total': 0, 'is_correct': 0, 'bookmark': 0}
+
+    async def select_learning(self):
+        """学習データ取得
+
+        @return 学習データ
+        """
+        return await self.fetchall(WORD_LEARNING_SQL)
+
+    async def select_incorrect(self):
+        """不正解用データ取得
+
+        @return 不正解用データ
+        """
+        return await self.fetchall(WORD_INCORRECT_SQL, as_dict=False)
+
+
+class AsyncActivity(AsyncCommon):
+    """ activityテーブルクラス(asyncio) """
+    def __init__(self):
+        """コンストラクタ
+        """
+        super().__init__('activity')
+
+    async def select_activity_order_by_desc_limit_5(self):
+        """最新アクティビティ5件取得
+
+        @return 最新アクティビティ5件
+        """
+        return await self.fetchall(ACTIVITY_LATEST_SQL)
+
+    async def select_count_learning_date(self, from_date, to_date):
+        """習得済み単語数取得
+
+        @param from_date 集計開始日
+        @param to_date 集計終了日
+        @return 習得済み単語数データ
+        """
+        return await self.select_daily_count(Event().LEARNED, from_date, to_date)
+
+    async def select_daily_count(self, event, from_date=None, to_date=None):
+        """日別アクティビティ数取得
+
+        @param event イベント種別(Event)
+        @param from_date 集計開始日(Noneの場合は全期間)
+        @param to_date 集計終了日(Noneの場合は全期間)
+        @return 日別アクティビティ数データ
+        @retval count アクティビティ数
+        @retval date アクティビティ日付
+        """
+        return await self.fetchall(*daily_count_query(event, from_date, to_date))
@@ -0,0 +1,79 @@
+"""データベース操作(クローラー)
+
+英語スクレイピングの取得状態、チェックポイントを管理
+"""
+from dbaccess import Common, execute_values_and_commit
+
+
+class CrawlState(Common):
+    """ crawl_stateテーブルクラス """
+    def __init__(self):
+        """コンストラクタ
+        """
+        super().__init__('crawl_state')
+
+    def select_all(self):
+        """全URLの取得状態を取得
+
+        @return URLをキーとした取得状態の辞書
+        @retval etag ETag
+        @retval last_modified Last-Modified
+        @retval content_hash 本文のハッシュ値
+        """
+        super().execute('SELECT url, etag, last_modified, content_hash FROM crawl_state;')
+        return {row['url']: row for row in super().dict_factory(self.cur.fetchall())}
+
+    def upsert(self, states):
+        """取得状態を一括更新
+
+        取得日時は現在日時で更新する
+        @param states (URL, ETag, Last-Modified, 本文のハッシュ値)のリスト
+        @exception DbOperationError データベース操作エラー
+        """
+        if not states:
+            return
+        sql = 'INSERT INTO crawl_state (url, etag, last_modified, content_hash) VALUES %s '\
+            'ON CONFLICT (url) DO UPDATE SET etag = EXCLUDED.etag, '\
+            'last_modified = EXCLUDED.last_modified, content_hash = EXCLUDED.content_hash, '\
+            'crawled_at = CURRENT_TIMESTAMP;'
+        # 同じURLは後のものを優先
+        rows = list({state[0]: state for state in states}.values())
+        execute_values_and_commit(self.conn, sql, rows)
+
+
+class CrawlCheckpoint(Common):
+    """ crawl_checkpointテーブルクラス """
+    def __init__(self):
+        """コンストラクタ
+        """
+        super().__init__('crawl_checkpoint')
+
+    def select_completed(self):
+        """完了済みURLを取得
+
+        @return URLの集合
+        """
+        super().execute('SELECT url FROM crawl_checkpoint;')
+        return {row['url'] for row in self.cur.fetchall()}
+
+    def insert(self, checkpoints):
+        """完了済みURLを一括登録
+
+        @param checkpoints (URL, 登録した英単語数)のリスト
+        @exception DbOperationError データベース操作エラー
+        """
+        if not checkpoints:
+            return
+        sql = 'INSERT INTO crawl_checkpoint (url, words) VALUES %s '\
+            'ON CONFLICT (url) DO UPDATE SET words = EXCLUDED.words, '\
+            'completed_at = CURRENT_TIMESTAMP;'
+        # 同じURLは後のものを優先
+        rows = list({checkpoint[0]: checkpoint for checkpoint in checkpoints}.values())
+        execute_values_and_commit(self.conn, sql, rows)
+
+    def clear(self):
+        """完了済みURLを全件削除
+
+        @exception DbOperationError データベース操作エラー
+        """
+        super().execute('TRUNCATE crawl_checkpoint;')
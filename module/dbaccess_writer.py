@@ -0,0 +1,176 @@
+"""データベース操作(アクティビティの非同期一括書き込み)
+
+各APIはget_activity_writerで取得した書き込みをWordに渡す
+"""
+import logging.config
+import os
+import queue
+import threading
+import time
+
+from module.dbaccess import (
+    DbOperationError, get_pool, acquire_connection, execute_values_and_commit
+)
+
+
+logging.config.fileConfig('./setting/logging.conf')
+LOGGER = logging.getLogger()
+
+# アクティビティの非同期一括書き込み(ACTIVITY_BUFFER=1で有効)
+ACTIVITY_BUFFER = os.environ.get('ACTIVITY_BUFFER') == '1'
+ACTIVITY_FLUSH_INTERVAL = float(os.environ.get('ACTIVITY_FLUSH_INTERVAL_MS', 200)) / 1000
+ACTIVITY_FLUSH_SIZE = int(os.environ.get('ACTIVITY_FLUSH_SIZE', 500))
+ACTIVITY_QUEUE_SIZE = int(os.environ.get('ACTIVITY_QUEUE_SIZE', 10000))
+# 書き込み失敗時の再試行回数、初回の待機秒数(再試行ごとに倍)
+ACTIVITY_WRITE_RETRIES = int(os.environ.get('ACTIVITY_WRITE_RETRIES', 5))
+ACTIVITY_WRITE_BACKOFF = float(os.environ.get('ACTIVITY_WRITE_BACKOFF', 0.1))
+
+
+class ActivityWriter:
+    """ アクティビティの非同期一括書き込み
+
+    リクエストスレッドは上限付きキューに積むだけで返却し、
+    バックグラウンドスレッドが一定件数、または一定時間ごとに複数行INSERTで書き込む
+    """
+    _STOP = object()
+
+    def __init__(self, flush_interval=ACTIVITY_FLUSH_INTERVAL,
+                 flush_size=ACTIVITY_FLUSH_SIZE, queue_size=ACTIVITY_QUEUE_SIZE, write=None,
+                 retries=ACTIVITY_WRITE_RETRIES, backoff=ACTIVITY_WRITE_BACKOFF):
+        """コンストラクタ
+
+        @param flush_interval 書き込み間隔(秒)
+        @param flush_size 1回の書き込みの最大件数
+        @param queue_size キューの最大件数
+        @param write 書き込み関数(行のリスト、コネクションを受け取る、指定なしの場合はactivityテーブルに挿入)
+        @param retries 書き込み失敗時の再試行回数
+        @param backoff 初回の再試行までの待機秒数(再試行ごとに倍)
+        """
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._write = write or self._insert_rows
+        self._retries = retries
+        self._backoff = backoff
+        self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+        self._thread.start()
+
+    def put(self, activity, word_id, english, conn=None):
+        """アクティビティを書き込みキューに追加
+
+        キューが満杯の場合は呼び出し元のスレッドで同期的に書き込む
+        (プールから別のコネクションを借りると、リクエスト数がプールの最大接続数を超えた時に詰まる)
+        @param activity アクティビティ(ActivityRecord)
+        @param word_id 対象単語のPKEY
+        @param english 対象の英語
+        @param conn キュー満杯時に書き込むコネクション(指定なしの場合はスレッド単位のコネクション)
+        @return アクティビティ詳細
+        @exception DbOperationError データベース操作エラー
+        """
+        detail = f'{activity.prefix}{english}{activity.suffix}'
+        row = (activity.date, activity.type_id, detail, activity.event, word_id)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._write([row], conn or acquire_connection())
+        return detail
+
+    def flush(self):
+        """キュー内のアクティビティが書き込まれるまで待機
+        """
+        self._queue.join()
+
+    def close(self):
+        """残りのアクティビティを書き込み、バックグラウンドスレッドを終了
+        """
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        """バックグラウンドスレッド
+        """
+        stop = False
+        while not stop:
+            rows = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self._flush_interval
+            while True:
+                if item is self._STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                rows.append(item)
+                if len(rows) >= self._flush_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if rows:
+                self._write_with_retry(rows)
+                for _ in rows:
+                    self._queue.task_done()
+
+    def _write_with_retry(self, rows):
+        """書き込み(失敗時は待機時間を倍にしながら再試行)
+
+        再試行しても書き込めない場合は、後から登録できるよう行の内容をエラーログに出力する
+        @param rows (日付, 種別ID, 詳細, イベント種別, 単語PKEY)のリスト
+        """
+        for attempt in range(self._retries + 1):
+            try:
+                self._write(rows)
+                return
+            except DbOperationError:
+                if attempt < self._retries:
+                    time.sleep(self._backoff * 2 ** attempt)
+        LOGGER.error('failed to write %s activities: %r', len(rows), rows)
+
+    def _insert_rows(self, rows, conn=None):
+        """activityテーブルに複数行INSERT
+
+        @param rows (日付, 種別ID, 詳細, イベント種別, 単語PKEY)のリスト
+        @param conn コネクション(指定なしの場合はプールから借りる)
+        @exception DbOperationError データベース操作エラー
+        """
+        pool = get_pool() if conn is None else None
+        if pool is not None:
+            conn = pool.getconn()
+        try:
+            execute_values_and_commit(
+                conn,
+                'INSERT INTO activity (date, type, detail, event, word_id) VALUES %s;',
+                rows
+            )
+        finally:
+            if pool is not None:
+                pool.putconn(conn)
+
+
+_ACTIVITY_WRITER = None
+_ACTIVITY_WRITER_LOCK = threading.Lock()
+
+
+def get_activity_writer():
+    """プロセス共通のアクティビティ書き込みを取得
+
+    スレッドはpre-fork後に各プロセスで生成する
+    @return アクティビティ書き込み (ACTIVITY_BUFFERが無効の場合はNone)
+    """
+    global _ACTIVITY_WRITER
+    if not ACTIVITY_BUFFER:
+        return None
+    with _ACTIVITY_WRITER_LOCK:
+        if _ACTIVITY_WRITER is None:
+            _ACTIVITY_WRITER = ActivityWriter()
+        return _ACTIVITY_WRITER
+
+
+def close_activity_writer():
+    """残りのアクティビティを書き込み、アクティビティ書き込みを破棄
+    """
+    global _ACTIVITY_WRITER
+    with _ACTIVITY_WRITER_LOCK:
+        writer, _ACTIVITY_WRITER = _ACTIVITY_WRITER, None
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,107 @@
+"""英単語抽出
+
+HTMLから英語(.eng)、日本語(.jap)要素のテキストを抽出
+ページ全体のツリーは構築せず、lxmlの逐次パースで対象要素のみ取り出す
+"""
+from collections import deque
+from io import BytesIO
+import re
+
+from lxml import etree
+
+
+ENG_CLASS = 'eng'
+JAP_CLASS = 'jap'
+
+# 英単語として登録する文字列
+ENGLISH = re.compile(r'[a-z|A-Z|\s]+')
+
+# 文字コード指定(<meta charset>、<meta http-equiv>)の検出範囲(バイト)
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+SNIFF_SIZE = 4096
+
+
+def extract_words(body, encoding=None):
+    """登録対象の英語、日本語の組を抽出
+
+    プロセスプールで実行できるよう、引数、戻り値はpickle可能な型のみとする
+    @param body HTML(バイト列)
+    @param encoding 文字コード
+    @return (英語, 日本語)のリスト(英語以外は除外)
+    """
+    return [
+        (eng.strip(), jap) for eng, jap in iter_pairs(body, encoding)
+        if ENGLISH.match(eng) is not None
+    ]
+
+
+def iter_pairs(body, encoding=None):
+    """英語、日本語の組を逐次抽出
+
+    出現順に英語、日本語を対応付ける(件数が異なる場合、余りは破棄)
+    対象要素以外は読み終えた時点で破棄するため、メモリ使用量はページサイズに比例しない
+    @param body HTML(バイト列)
+    @param encoding 文字コード(指定なしの場合は<meta>から検出、検出できない場合はUTF-8)
+    @return (英語, 日本語)のジェネレータ
+    """
+    if not body:
+        return
+    encoding = encoding or detect_encoding(body)
+    engs, japs = deque(), deque()
+    # 対象要素の入れ子の深さ(対象要素の内側は読み終えるまで破棄しない)
+    depth = 0
+    try:
+        for event, elem in etree.iterparse(
+                BytesIO(body), events=('start', 'end'), html=True, encoding=encoding):
+            classes = _classes(elem)
+            is_eng, is_jap = ENG_CLASS in classes, JAP_CLASS in classes
+            if event == 'start':
+                depth += is_eng or is_jap
+                continue
+
+            if is_eng or is_jap:
+                depth -= 1
+                text = etree.tostring(elem, method='text', encoding='unicode', with_tail=False)
+                if is_eng:
+                    engs.append(text)
+                if is_jap:
+                    japs.append(text)
+                while engs and japs:
+                    yield engs.popleft(), japs.popleft()
+            if not depth:
+                _discard(elem)
+    except (etree.LxmlError, LookupError):
+        return
+
+
+def detect_encoding(body):
+    """文字コード検出
+
+    @param body HTML(バイト列)
+    @return 文字コード
+    """
+    match = META_CHARSET.search(body, 0, SNIFF_SIZE)
+    return match.group(1).decode('ascii') if match else 'utf-8'
+
+
+def _classes(elem):
+    """class属性を分割
+
+    @param elem 要素
+    @return クラス名のリスト
+    """
+    classes = elem.get('class')
+    return classes.split() if classes else ()
+
+
+def _discard(elem):
+    """読み終えた要素と、それより前の兄弟要素を破棄
+
+    @param elem 要素
+    """
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is None:
+        return
+    while elem.getprevious() is not None:
+        del parent[0]
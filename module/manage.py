@@ -0,0 +1,53 @@
+"""運用コマンド
+
+python module/manage.py <コマンド>
+  migrate            未適用のマイグレーションを適用
+  reconcile_counter  ダッシュボード用カウンタをwordテーブルから再集計
+  reconcile_daily    日別アクティビティ数をactivityテーブルから再集計
+"""
+import argparse
+import sys
+
+from dbaccess import Word, Activity, DbOperationError, migrate, release_connection
+
+
+def _migrate():
+    """マイグレーション適用
+    """
+    print(f'schema version: {migrate()}')
+
+
+def _reconcile_counter():
+    """カウンタ再集計
+    """
+    try:
+        counter = Word().reconcile_counter()
+    finally:
+        release_connection()
+    print(', '.join(f'{key}: {value}' for key, value in counter.items()))
+
+
+def _reconcile_daily():
+    """日別アクティビティ数再集計
+    """
+    try:
+        Activity().reconcile_daily()
+    finally:
+        release_connection()
+
+
+COMMANDS = {
+    'migrate': _migrate,
+    'reconcile_counter': _reconcile_counter,
+    'reconcile_daily': _reconcile_daily,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='運用コマンド')
+    parser.add_argument('command', choices=COMMANDS.keys())
+    args = parser.parse_args()
+    try:
+        COMMANDS[args.command]()
+    except DbOperationError:
+        sys.exit(1)
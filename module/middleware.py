@@ -0,0 +1,246 @@
+"""
+WSGIミドルウェア
+"""
+import logging.config
+import os
+import threading
+import time
+import zlib
+
+from module.static import select_encoding
+
+
+logging.config.fileConfig('./setting/logging.conf')
+LOGGER = logging.getLogger()
+
+# 圧縮する最小サイズ(バイト) これ未満のボディは圧縮しない
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+
+# 圧縮レベル(1-9)
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+
+# 圧縮対象のコンテンツタイプ
+COMPRESS_CONTENT_TYPES = ('application/json', 'application/x-ndjson', 'text/html')
+
+
+class CompressionMetrics:
+    """ 圧縮メトリクス """
+    def __init__(self):
+        """コンストラクタ
+        """
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """メトリクス初期化
+        """
+        with self._lock:
+            self._responses = 0
+            self._bypassed = 0
+            self._bytes_in = 0
+            self._bytes_out = 0
+            self._cpu_time = 0.0
+
+    def record(self, bytes_in, bytes_out, cpu_time):
+        """圧縮結果を記録
+
+        @param bytes_in 圧縮前のバイト数
+        @param bytes_out 圧縮後のバイト数
+        @param cpu_time 圧縮に要したCPU時間(秒)
+        """
+        with self._lock:
+            self._responses += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            self._cpu_time += cpu_time
+
+    def record_bypass(self):
+        """圧縮しなかったレスポンスを記録
+        """
+        with self._lock:
+            self._bypassed += 1
+
+    def snapshot(self):
+        """メトリクス取得
+
+        @return メトリクス
+        @retval responses 圧縮したレスポンス数
+        @retval bypassed 圧縮しなかったレスポンス数
+        @retval bytes_in 圧縮前のバイト数
+        @retval bytes_out 圧縮後のバイト数
+        @retval ratio 圧縮率(圧縮後/圧縮前)
+        @retval cpu_time 圧縮に要したCPU時間(秒)
+        """
+        with self._lock:
+            return {
+                'responses': self._responses,
+                'bypassed': self._bypassed,
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+                'ratio': self._bytes_out / self._bytes_in if self._bytes_in else 1.0,
+                'cpu_time': self._cpu_time,
+            }
+
+
+METRICS = CompressionMetrics()
+
+
+class CompressionMiddleware:
+    """ レスポンス圧縮(gzip) """
+    def __init__(self, app, min_size=COMPRESS_MIN_SIZE, level=COMPRESS_LEVEL,
+                 content_types=COMPRESS_CONTENT_TYPES, metrics=METRICS):
+        """コンストラクタ
+
+        @param app WSGIアプリケーション
+        @param min_size 圧縮する最小サイズ(バイト)
+        @param level 圧縮レベル
+        @param content_types 圧縮対象のコンテンツタイプ
+        @param metrics 圧縮メトリクス
+        """
+        self._app = app
+        self._min_size = min_size
+        self._level = level
+        self._content_types = content_types
+        self._metrics = metrics
+
+    def __call__(self, environ, start_response):
+        """WSGI
+
+        @param environ HTTPS環境変数
+        @param start_response ステータスコード、レスポンスヘッダーを受け取るオブジェクト
+        @return レスポンスデータ
+        """
+        if select_encoding(environ.get('HTTP_ACCEPT_ENCODING'), ('gzip',)) is None:
+            return self._app(environ, start_response)
+
+        captured = {}
+
+        def _start_response(status, headers, exc_info=None):
+            # 圧縮するか判定するまでstart_responseを遅延させる(write呼び出しは非対応)
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+
+        chunks = self._app(environ, _start_response)
+        status, headers = captured['status'], captured['headers']
+        if not self._is_compressible(status, headers):
+            return self._bypass(start_response, captured, chunks)
+
+        length = self._content_length(headers, chunks)
+        if length is not None and length < self._min_size:
+            return self._bypass(start_response, captured, chunks)
+
+        headers = self._compressed_headers(headers)
+        if isinstance(chunks, list):
+            body = self._compress(chunks)
+            start_response(status, headers + [('Content-Length', str(len(body)))],
+                           captured['exc_info'])
+            return [body]
+        start_response(status, headers, captured['exc_info'])
+        return self._compress_stream(chunks)
+
+    def _is_compressible(self, status, headers):
+        """圧縮対象か判定
+
+        @param status ステータスコード
+        @param headers レスポンスヘッダー
+        @return 論理値
+        """
+        if status[:3] in ('204', '304'):
+            return False
+        content_type = ''
+        for name, value in headers:
+            name = name.lower()
+            if name == 'content-encoding':
+                return False
+            if name == 'content-type':
+                content_type = value.split(';', 1)[0].strip()
+        return content_type in self._content_types
+
+    def _content_length(self, headers, chunks):
+        """ボディのサイズ
+
+        @param headers レスポンスヘッダー
+        @param chunks レスポンスデータ
+        @return バイト数 (不明の場合はNone)
+        """
+        for name, value in headers:
+            if name.lower() == 'content-length':
+                return int(value)
+        if isinstance(chunks, list):
+            return sum(len(chunk) for chunk in chunks)
+        return None
+
+    def _compressed_headers(self, headers):
+        """圧縮後のレスポンスヘッダー
+
+        @param headers レスポンスヘッダー
+        @return レスポンスヘッダー
+        """
+        vary = ['Accept-Encoding']
+        _headers = []
+        for name, value in headers:
+            if name.lower() == 'content-length':
+                continue
+            if name.lower() == 'vary':
+                vary.insert(0, value)
+                continue
+            _headers.append((name, value))
+        return _headers + [('Content-Encoding', 'gzip'), ('Vary', ', '.join(vary))]
+
+    def _bypass(self, start_response, captured, chunks):
+        """圧縮せずに返却
+
+        @param start_response ステータスコード、レスポンスヘッダーを受け取るオブジェクト
+        @param captured アプリケーションが指定したステータスコード、レスポンスヘッダー
+        @param chunks レスポンスデータ
+        @return レスポンスデータ
+        """
+        self._metrics.record_bypass()
+        start_response(captured['status'], captured['headers'], captured['exc_info'])
+        return chunks
+
+    def _compress(self, chunks):
+        """一括圧縮
+
+        @param chunks レスポンスデータ
+        @return 圧縮後のバイト列
+        """
+        started = time.thread_time()
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+        bytes_in = 0
+        body = []
+        for chunk in chunks:
+            bytes_in += len(chunk)
+            body.append(compressor.compress(chunk))
+        body.append(compressor.flush())
+        body = b''.join(body)
+        self._metrics.record(bytes_in, len(body), time.thread_time() - started)
+        return body
+
+    def _compress_stream(self, chunks):
+        """逐次圧縮(ストリーミングレスポンス用)
+
+        @param chunks レスポンスデータ
+        @return 圧縮後のバイト列のジェネレータ
+        """
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+        bytes_in, bytes_out, cpu_time = 0, 0, 0.0
+        try:
+            for chunk in chunks:
+                started = time.thread_time()
+                data = compressor.compress(chunk)
+                cpu_time += time.thread_time() - started
+                bytes_in += len(chunk)
+                if data:
+                    bytes_out += len(data)
+                    yield data
+            started = time.thread_time()
+            data = compressor.flush()
+            cpu_time += time.thread_time() - started
+            bytes_out += len(data)
+            yield data
+            self._metrics.record(bytes_in, bytes_out, cpu_time)
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
@@ -0,0 +1,189 @@
+"""パイプライン
+
+上限付きキューで接続したステージをスレッドで並行実行
+下流のステージが詰まるとキューが満杯になり、上流のステージは空きが出るまで待機する
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from typing import NamedTuple
+
+
+LOGGER = logging.getLogger()
+
+# ステージ間キューの最大件数
+PIPELINE_QUEUE_SIZE = int(os.environ.get('PIPELINE_QUEUE_SIZE', 16))
+
+
+class StageStats(NamedTuple):
+    """ ステージ統計用コンテナ """
+    name: str
+    processed: int
+    errors: int
+    queue_depth: int
+    throughput: float
+
+
+class _Stage:
+    """ ステージ """
+    def __init__(self, name, func, threads, close, inbox, outbox):
+        """コンストラクタ
+
+        @param name ステージ名
+        @param func 処理関数(Noneを返却した場合は下流に渡さない)
+        @param threads スレッド数
+        @param close 全件処理後に呼び出す関数
+        @param inbox 入力キュー(ソースの場合はNone)
+        @param outbox 出力キュー(最終ステージの場合はNone)
+        """
+        self.name = name
+        self.func = func
+        self.threads = threads
+        self.close = close
+        self.inbox = inbox
+        self.outbox = outbox
+        self.processed = 0
+        self.errors = 0
+        self.running = threads
+        self.lock = threading.Lock()
+
+
+class Pipeline:
+    """ 多段パイプライン """
+    _END = object()
+
+    def __init__(self, queue_size=PIPELINE_QUEUE_SIZE):
+        """コンストラクタ
+
+        @param queue_size ステージ間キューの最大件数
+        """
+        self._queue_size = queue_size
+        self._specs = []
+        self._stages = []
+        self._started_at = None
+
+    def stage(self, name, func, threads=1, close=None):
+        """ステージ追加
+
+        @param name ステージ名
+        @param func 処理関数(1件受け取り、下流に渡す値を返却する。Noneの場合は渡さない)
+        @param threads スレッド数(1以上)
+        @param close 全件処理後に呼び出す関数(バッファの書き出し等)
+        @return パイプライン
+        @exception ValueError スレッド数が1未満
+        """
+        # スレッドがないステージは入力キューを読まず、上流が終了しない
+        if threads < 1:
+            raise ValueError(f'{name}: threads must be at least 1')
+        self._specs.append((name, func, threads, close))
+        return self
+
+    def run(self, name, source, on_progress=None, interval=5):
+        """実行
+
+        全ステージの処理が終わるまで待機する
+        @param name ソースのステージ名
+        @param source 入力のイテラブル
+        @param on_progress 実行中に統計を受け取る関数
+        @param interval on_progressの呼び出し間隔(秒)
+        @return 各ステージの統計
+        """
+        inbox = queue.Queue(maxsize=self._queue_size) if self._specs else None
+        self._stages = [_Stage(name, None, 1, None, None, inbox)]
+        for i, (stage_name, func, threads, close) in enumerate(self._specs):
+            outbox = queue.Queue(maxsize=self._queue_size) if i < len(self._specs) - 1 else None
+            self._stages.append(_Stage(stage_name, func, threads, close, inbox, outbox))
+            inbox = outbox
+
+        self._started_at = time.monotonic()
+        workers = [threading.Thread(
+            target=self._feed, args=(self._stages[0], source), name=name, daemon=True)]
+        for stage in self._stages[1:]:
+            workers.extend(
+                threading.Thread(target=self._work, args=(stage,), name=stage.name, daemon=True)
+                for _ in range(stage.threads)
+            )
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(interval)
+                if on_progress is not None and worker.is_alive():
+                    on_progress(self.stats())
+        return self.stats()
+
+    def stats(self):
+        """各ステージの統計
+
+        @return StageStatsのリスト(キューの深さは各ステージの入力キュー)
+        """
+        elapsed = max(time.monotonic() - (self._started_at or time.monotonic()), 1e-9)
+        return [
+            StageStats(
+                stage.name,
+                stage.processed,
+                stage.errors,
+                stage.inbox.qsize() if stage.inbox is not None else 0,
+                stage.processed / elapsed
+            )
+            for stage in self._stages
+        ]
+
+    def _feed(self, stage, source):
+        """ソースのスレッド
+
+        @param stage ステージ
+        @param source 入力のイテラブル
+        """
+        try:
+            for item in source:
+                stage.processed += 1
+                if stage.outbox is not None:
+                    stage.outbox.put(item)
+        except Exception as err:
+            stage.errors += 1
+            LOGGER.error('%s: %r', stage.name, err)
+        finally:
+            if stage.outbox is not None:
+                stage.outbox.put(self._END)
+
+    def _work(self, stage):
+        """ステージのスレッド
+
+        終端を受け取ったら同じステージの他スレッドのために戻し、最後のスレッドが下流に終端を渡す
+        @param stage ステージ
+        """
+        while True:
+            item = stage.inbox.get()
+            if item is self._END:
+                stage.inbox.put(self._END)
+                break
+            try:
+                result = stage.func(item)
+            except Exception as err:
+                with stage.lock:
+                    stage.errors += 1
+                LOGGER.error('%s: %r', stage.name, err)
+                continue
+            with stage.lock:
+                stage.processed += 1
+            if result is not None and stage.outbox is not None:
+                stage.outbox.put(result)
+
+        with stage.lock:
+            stage.running -= 1
+            last = not stage.running
+        if not last:
+            return
+        # 他スレッド用に戻した終端を取り除く
+        stage.inbox.get_nowait()
+        if stage.close is not None:
+            try:
+                stage.close()
+            except Exception as err:
+                stage.errors += 1
+                LOGGER.error('%s: %r', stage.name, err)
+        if stage.outbox is not None:
+            stage.outbox.put(self._END)
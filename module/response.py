@@ -0,0 +1,209 @@
+"""
+レスポンス
+"""
+import json
+from typing import NamedTuple
+
+from module.static import STATIC_CACHE, CACHE_CONTROL
+
+
+# ストリーミングレスポンスの送信単位(バイト)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class BadRequest(NamedTuple):
+    """ BadRequestレスポンス """
+    status: str = '400 Bad Request'
+    content_type: str = 'application/json'
+    headers: tuple = ()
+    body: bytes = json.dumps({
+        'title': 'リクエストが正しくありません',
+        'msg': '管理者にお問い合わせください'
+    }).encode('UTF-8')
+
+
+class NotFound(NamedTuple):
+    """ NotFoundレスポンス """
+    status: str = '404 Not Found'
+    content_type: str = 'text/html'
+    headers: tuple = ()
+    with open('404.html', 'rb') as file:
+        body: bytes = file.read()
+
+
+class MethodNotAllowed(NamedTuple):
+    """ MethodNotAllowedレスポンス """
+    status: str = '405 Method Not Allowed'
+    content_type: str = 'application/json'
+    headers: tuple = ()
+    body: bytes = json.dumps({
+        'title': '許可されていないメソッドです',
+        'msg': '管理者にお問い合わせください'
+    }).encode('UTF-8')
+
+
+class InternalServerError(NamedTuple):
+    """ InternalServerErrorレスポンス """
+    status: str = '500 Internal Server Error'
+    content_type: str = 'application/json'
+    headers: tuple = ()
+    body: bytes = json.dumps({
+        'title': 'サーバエラーです',
+        'msg': '管理者にお問い合わせください'
+    }).encode('UTF-8')
+
+
+class ResponseBase:
+    """ レスポンス基底 """
+    def __init__(self, content_type, body):
+        """コンストラクタ
+
+        @param content_type コンテンツタイプ
+        @param body ボディ(バイト列、またはバイト列のリスト)
+        """
+        self._status = '200 OK'
+        self._content_type = content_type
+        self._body = body
+        self._headers = ()
+
+    @property
+    def status(self):
+        """ステータスコードを返却
+
+        @return ステータスコード
+        """
+        return self._status
+
+    @property
+    def content_type(self):
+        """コンテンツタイプを返却
+
+        @return コンテンツタイプ
+        """
+        return self._content_type
+
+    @property
+    def headers(self):
+        """追加のレスポンスヘッダーを返却
+
+        @return [(<ヘッダー名>, <値>)]
+        """
+        return self._headers
+
+    @property
+    def body(self):
+        """ボディを返却
+
+        @return ボディ
+        """
+        return self._body
+
+
+class HtmlResponse(ResponseBase):
+    """ HTMLレスポンス """
+    def __init__(self, body):
+        """コンストラクタ
+
+        @param body ボディ
+        """
+        super().__init__('text/html', body)
+
+
+class StaticResponse(ResponseBase):
+    """ 静的データレスポンス """
+    _content_types = {
+        'js': 'text/javascript',
+        'css': 'text/css',
+    }
+
+    def __init__(self, req_path, suffix, req_data=None):
+        """コンストラクタ
+
+        メモリキャッシュから返却し、条件付きリクエストには304を返す
+        @param req_path リクエストパス
+        @param suffix 拡張子
+        @param req_data リクエストデータ
+        @exception FileNotFoundError
+        """
+        # 対象外の拡張子はファイルを読み込まない
+        if suffix not in self._content_types:
+            raise FileNotFoundError(req_path)
+        asset = STATIC_CACHE.get(req_path)
+        req_data = req_data or {}
+        encoding, body, etag = asset.negotiate(req_data.get('HTTP_ACCEPT_ENCODING'))
+        super().__init__(self._content_types[suffix], body)
+        self._headers = (
+            ('ETag', etag),
+            ('Last-Modified', asset.last_modified),
+            ('Cache-Control', CACHE_CONTROL),
+            ('Vary', 'Accept-Encoding'),
+        )
+
+        if asset.is_not_modified(
+                req_data.get('HTTP_IF_NONE_MATCH'),
+                req_data.get('HTTP_IF_MODIFIED_SINCE'),
+                etag):
+            # 304にはボディに関するヘッダー(Content-Encoding等)を付与しない
+            self._status = '304 Not Modified'
+            self._body = b''
+        elif encoding is not None:
+            self._headers += (('Content-Encoding', encoding),)
+
+
+class JsonResponse(ResponseBase):
+    """ JSONレスポンス """
+    def __init__(self, body):
+        """コンストラクタ
+
+        @param body ボディ
+        """
+        super().__init__('application/json', json.dumps(body).encode('UTF-8'))
+
+
+class StreamingJsonResponse(ResponseBase):
+    """ JSONレスポンス(ストリーミング) """
+    def __init__(self, rows, ndjson=False):
+        """コンストラクタ
+
+        行を逐次シリアライズし、JSON配列またはNDJSONとして送信する
+        @param rows 行データのイテラブル
+        @param ndjson NDJSON形式の場合True
+        """
+        if ndjson:
+            super().__init__('application/x-ndjson', self._ndjson(rows))
+        else:
+            super().__init__('application/json', self._json_array(rows))
+
+    def _json_array(self, rows):
+        """JSON配列として逐次シリアライズ
+
+        @param rows 行データのイテラブル
+        @return バイト列のジェネレータ
+        """
+        buffer, size = [b'['], 1
+        for i, row in enumerate(rows):
+            data = (', ' if i else '') + json.dumps(row)
+            buffer.append(data.encode('UTF-8'))
+            size += len(data)
+            if size >= STREAM_CHUNK_SIZE:
+                yield b''.join(buffer)
+                buffer, size = [], 0
+        buffer.append(b']')
+        yield b''.join(buffer)
+
+    def _ndjson(self, rows):
+        """NDJSONとして逐次シリアライズ
+
+        @param rows 行データのイテラブル
+        @return バイト列のジェネレータ
+        """
+        buffer, size = [], 0
+        for row in rows:
+            data = json.dumps(row) + '\n'
+            buffer.append(data.encode('UTF-8'))
+            size += len(data)
+            if size >= STREAM_CHUNK_SIZE:
+                yield b''.join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b''.join(buffer)
@@ -0,0 +1,232 @@
+"""
+静的ファイル
+"""
+from email.utils import formatdate, parsedate_to_datetime
+import gzip
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import NamedTuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Cache-Controlヘッダー(ETagで毎回再検証)
+CACHE_CONTROL = os.environ.get('STATIC_CACHE_CONTROL', 'no-cache')
+
+# 更新確認(stat)の間隔(秒)
+CHECK_INTERVAL = float(os.environ.get('STATIC_CHECK_INTERVAL', 2))
+
+# 圧縮済みデータを生成する最小サイズ(バイト)
+COMPRESS_MIN_SIZE = 256
+
+# 圧縮方式(優先順)
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# 圧縮レベル(起動時の読み込み用、リクエスト処理中の再読み込み用)
+COMPRESS_LEVELS = MappingProxyType({'br': 11, 'gzip': 9})
+FAST_COMPRESS_LEVELS = MappingProxyType({'br': 4, 'gzip': 6})
+
+
+def compress(body, encoding, levels=COMPRESS_LEVELS):
+    """圧縮
+
+    @param body バイト列
+    @param encoding 圧縮方式
+    @param levels 圧縮レベル {<圧縮方式>: <レベル>}
+    @return 圧縮後のバイト列
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels['br'])
+    return gzip.compress(body, compresslevel=levels['gzip'], mtime=0)
+
+
+def parse_accept_encoding(accept_encoding):
+    """Accept-Encodingヘッダーを解析
+
+    @param accept_encoding Accept-Encodingヘッダー
+    @return {<圧縮方式>: <q値>}
+    """
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def select_encoding(accept_encoding, encodings):
+    """クライアントが受け入れ可能な圧縮方式を選択
+
+    @param accept_encoding Accept-Encodingヘッダー
+    @param encodings 利用可能な圧縮方式(優先順)
+    @return 圧縮方式 (該当なしの場合はNone)
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+class StaticAsset(NamedTuple):
+    """ 静的ファイル用コンテナ """
+    body: bytes
+    mtime_ns: int
+    etag: str
+    last_modified: str
+    variants: MappingProxyType = MappingProxyType({})
+
+    def negotiate(self, accept_encoding):
+        """圧縮済みデータの選択
+
+        @param accept_encoding Accept-Encodingヘッダー
+        @return (圧縮方式, ボディ, ETag) 非圧縮の場合は圧縮方式がNone
+        """
+        encoding = select_encoding(accept_encoding, tuple(self.variants))
+        if encoding is None:
+            return None, self.body, self.etag
+        return encoding, self.variants[encoding], f'{self.etag[:-1]}-{encoding}"'
+
+    def is_not_modified(self, if_none_match, if_modified_since, etag=None):
+        """条件付きリクエストの判定
+
+        If-None-Matchが指定された場合はIf-Modified-Sinceより優先する
+        @param if_none_match If-None-Matchヘッダー
+        @param if_modified_since If-Modified-Sinceヘッダー
+        @param etag 比較するETag(圧縮済みデータの場合)
+        @return 論理値
+        """
+        if if_none_match:
+            etag = etag or self.etag
+            etags = [_etag.strip() for _etag in if_none_match.split(',')]
+            return '*' in etags or etag in etags or f'W/{etag}' in etags
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.mtime_ns // 1_000_000_000 <= since
+        return False
+
+
+class StaticCache:
+    """ 静的ファイルのメモリキャッシュ(更新日時で無効化) """
+    def __init__(self, check_interval=CHECK_INTERVAL):
+        """コンストラクタ
+
+        @param check_interval 更新確認の間隔(秒)
+        """
+        self._check_interval = check_interval
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, precompress=True):
+        """静的ファイル取得
+
+        読み込み時(初回、更新後)の圧縮はリクエスト処理中のため低い圧縮レベルで行う
+        @param path ファイルパス
+        @param precompress 圧縮済みデータを生成するか(テンプレート等は生成しない)
+        @return 静的ファイル
+        @exception FileNotFoundError
+        """
+        return self._get(path, FAST_COMPRESS_LEVELS if precompress else None)
+
+    def _get(self, path, levels):
+        """静的ファイル取得
+
+        @param path ファイルパス
+        @param levels 圧縮レベル (圧縮済みデータを生成しない場合はNone)
+        @return 静的ファイル
+        @exception FileNotFoundError
+        """
+        now = time.monotonic()
+        cached = self._assets.get(path)
+        if cached is not None and now - cached[1] < self._check_interval:
+            return cached[0]
+
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError) as err:
+            with self._lock:
+                self._assets.pop(path, None)
+            raise FileNotFoundError(err)
+
+        if cached is not None and cached[0].mtime_ns == stat.st_mtime_ns:
+            asset = cached[0]
+        else:
+            asset = self._load(path, stat, levels)
+        with self._lock:
+            self._assets[path] = (asset, now)
+        return asset
+
+    def _load(self, path, stat, levels):
+        """静的ファイル読み込み
+
+        @param path ファイルパス
+        @param stat ファイル情報
+        @param levels 圧縮レベル (圧縮済みデータを生成しない場合はNone)
+        @return 静的ファイル
+        @exception FileNotFoundError
+        """
+        try:
+            with open(path, 'rb') as file:
+                body = file.read()
+        except (FileNotFoundError, IsADirectoryError) as err:
+            raise FileNotFoundError(err)
+        return StaticAsset(
+            body=body,
+            mtime_ns=stat.st_mtime_ns,
+            etag=f'"{stat.st_mtime_ns:x}-{len(body):x}"',
+            last_modified=formatdate(stat.st_mtime, usegmt=True),
+            variants=MappingProxyType(self._compress(body, levels)),
+        )
+
+    def _compress(self, body, levels):
+        """圧縮済みデータ生成
+
+        圧縮しても小さくならない場合は生成しない
+        @param body バイト列
+        @param levels 圧縮レベル (圧縮済みデータを生成しない場合はNone)
+        @return {<圧縮方式>: <圧縮後のバイト列>}
+        """
+        variants = {}
+        if levels is None or len(body) < COMPRESS_MIN_SIZE:
+            return variants
+        for encoding in ENCODINGS:
+            compressed = compress(body, encoding, levels)
+            if len(compressed) < len(body):
+                variants[encoding] = compressed
+        return variants
+
+    def warm(self, root):
+        """ディレクトリ配下の静的ファイルを読み込み、圧縮済みデータを生成
+
+        起動時に呼び出し、リクエスト処理中に圧縮しないようにする(最高圧縮レベル)
+        @param root ディレクトリ
+        @return 読み込んだファイル数
+        """
+        count = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                try:
+                    self._get(os.path.join(dirpath, filename), COMPRESS_LEVELS)
+                    count += 1
+                except FileNotFoundError:
+                    continue
+        return count
+
+
+STATIC_CACHE = StaticCache()
@@ -1,14 +1,22 @@
 """
 エンドポイント
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import logging.config
-from pathlib import PurePath
+import os
+import posixpath
 
-from module.dbaccess import DbOperationError
+from module.dbaccess import DbOperationError, release_connection
+from module.dbaccess_async import ASYNC_DB
 from module.api import (
-    DashboardView, LearningView, EnglishListView, ActivityView, BookMarkView,
-    UpdateIsCorrectFlagView, UpdateBookmarkView, RegisterWordView, DeleteView,
-    StaticResponse, BadRequest, NotFound, InternalServerError
+    DashboardView, LearningView, LearningLogView, EnglishListView, ActivityView, BookMarkView,
+    UpdateIsCorrectFlagView, UpdateBookmarkView, RegisterWordView, DeleteView
+)
+from module.api_datatables import EnglishListDataTablesView
+from module.api_async import DashboardAsyncView, LearningAsyncView, LearningLogAsyncView
+from module.response import (
+    StaticResponse, BadRequest, NotFound, MethodNotAllowed, InternalServerError
 )
 
 
@@ -19,7 +27,9 @@ LOGGER = logging.getLogger()
 END_POINT = {
     '/': DashboardView,
     '/learning': LearningView,
+    '/learning_log': LearningLogView,
     '/english_list': EnglishListView,
+    '/english_list/datatables': EnglishListDataTablesView,
     '/bookmark': BookMarkView,
     '/activity': ActivityView,
     '/update/is_correct': UpdateIsCorrectFlagView,
@@ -28,6 +38,72 @@ END_POINT = {
     '/delete/word': DeleteView,
 }
 
+# POSTで受け付けるエンドポイント(それ以外はGET、HEAD)
+POST_END_POINT = (
+    '/update/is_correct',
+    '/update/bookmark',
+    '/register/word',
+    '/delete/word',
+)
+
+# 非同期ドライバで処理するエンドポイント(GET、HEAD) それ以外はDB処理スレッドで処理
+ASYNC_END_POINT = {
+    '/': DashboardAsyncView,
+    '/learning': LearningAsyncView,
+    '/learning_log': LearningLogAsyncView,
+}
+
+# 静的ファイルのマウントポイント(/<マウントポイント>/<ディレクトリ>/<ファイル>)
+STATIC_MOUNT = ('static',)
+
+
+def _compile_routes():
+    """ルーティングテーブル生成(インポート時に一度だけ実行)
+
+    @return {(<メソッド>, <パス>): <ビュー>}, {<パス>: <許可メソッド>}
+    """
+    routes, allow = {}, {}
+    for path, view in END_POINT.items():
+        methods = ('POST',) if path in POST_END_POINT else ('GET', 'HEAD')
+        for method in methods:
+            routes[(method, path)] = view
+        allow[path] = ', '.join(methods)
+    return routes, allow
+
+
+ROUTES, ALLOW = _compile_routes()
+ASYNC_ROUTES = {
+    (method, path): view
+    for path, view in ASYNC_END_POINT.items() for method in ('GET', 'HEAD')
+}
+STATIC_ROUTES = frozenset(STATIC_MOUNT)
+
+
+def match_static(path):
+    """静的ファイルのパス解決
+
+    正規化した結果が変わるパス(.、..、//を含む)は静的ファイルのディレクトリ外を指し得るため扱わない
+    @param path リクエストパス
+    @return (ファイルパス, 拡張子) 静的ファイルでない場合はNone
+    """
+    if '\0' in path or posixpath.normpath(path) != path:
+        return None
+    _, sep, rest = path.partition('/')
+    mount, sep, rest = rest.partition('/')
+    if not sep or mount not in STATIC_ROUTES:
+        return None
+    directory, sep, name = rest.partition('/')
+    if not sep or not directory or not name or '/' in name:
+        return None
+    _, dot, suffix = name.rpartition('.')
+    return path[1:], suffix if dot else ''
+
+# 非同期ドライバ未対応のAPI用のDB処理スレッド(コネクションプールの最大接続数と同数)
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('PSQL_POOL_MAX', 10)),
+    thread_name_prefix='db'
+)
+
 
 def dispatch(req_data):
     """割り当て
@@ -40,21 +116,46 @@ def dispatch(req_data):
     """
     path = req_data.get('PATH_INFO')
 
-    if PurePath(path).match('static/*/*'):
-        return dispatch_static(path)
+    if match_static(path) is not None:
+        return dispatch_static(path, req_data)
     return dispatch_api(path, req_data)
 
 
-def dispatch_static(path):
+async def dispatch_async(req_data):
+    """割り当て(asyncio)
+
+    ASYNC_END_POINTのAPIは非同期ドライバでDBにアクセスし、イベントループ上で待機する
+    それ以外のAPI(更新系等)、および非同期ドライバが利用できない場合はDB処理スレッドで実行する
+    @param req_data リクエストデータ
+    @return 正常レスポンス
+    @return NotFoundレスポンス
+    @return BadRequestレスポンス
+    @return InternalServerErrorレスポンス
+    """
+    path = req_data.get('PATH_INFO')
+
+    if match_static(path) is not None:
+        return dispatch_static(path, req_data)
+    method = req_data.get('REQUEST_METHOD') or 'GET'
+    if ASYNC_DB and (method, path) in ASYNC_ROUTES:
+        return await dispatch_api_async(path, req_data)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(DB_EXECUTOR, dispatch_api, path, req_data)
+
+
+def dispatch_static(path, req_data=None):
     """静的ファイル割り当て
 
     @param path リクエストパス
+    @param req_data リクエストデータ
     @return 正常レスポンス
+    @return NotModifiedレスポンス
     @return NotFoundレスポンス
     """
     try:
-        if PurePath(path).suffix[1:]:
-            return StaticResponse(path[1:], PurePath(path).suffix[1:])
+        file_path, suffix = match_static(path) or (None, None)
+        if suffix:
+            return StaticResponse(file_path, suffix, req_data)
         raise FileNotFoundError()
     except FileNotFoundError as err:
         LOGGER.error(err)
@@ -68,19 +169,23 @@ def dispatch_api(path, req_data):
     @param req_data リクエストデータ
     @return 正常レスポンス
     @return NotFoundレスポンス
+    @return MethodNotAllowedレスポンス
     @return BadRequestレスポンス
     @return InternalServerErrorレスポンス
     """
-    req_api = END_POINT.get(path)
+    method = req_data.get('REQUEST_METHOD') or 'GET'
+    req_api = ROUTES.get((method, path))
     if req_api is None:
+        if path in ALLOW:
+            return MethodNotAllowed(headers=(('Allow', ALLOW[path]),))
         return NotFound()
 
     try:
-        if req_data.get('REQUEST_METHOD') == 'POST':
+        if method == 'POST':
             api = req_api(req_data.get('wsgi.input')\
                 .read(int(req_data.get('CONTENT_LENGTH', 0))))
         else:
-            api = req_api()
+            api = req_api(req_data.get('QUERY_STRING'))
         return api.view()
     except FileNotFoundError as err:
         LOGGER.error(err)
@@ -91,3 +196,33 @@ def dispatch_api(path, req_data):
     except (DbOperationError, Exception) as err:
         LOGGER.error(err)
         return InternalServerError()
+    finally:
+        release_connection()
+
+
+async def dispatch_api_async(path, req_data):
+    """API割り当て(非同期ドライバ)
+
+    @param path リクエストパス
+    @param req_data リクエストデータ
+    @return 正常レスポンス
+    @return NotFoundレスポンス
+    @return BadRequestレスポンス
+    @return InternalServerErrorレスポンス
+    """
+    method = req_data.get('REQUEST_METHOD') or 'GET'
+    req_api = ASYNC_ROUTES.get((method, path))
+    if req_api is None:
+        return NotFound()
+
+    try:
+        return await req_api(req_data.get('QUERY_STRING')).view()
+    except FileNotFoundError as err:
+        LOGGER.error(err)
+        return NotFound()
+    except ValueError as err:
+        LOGGER.error(err)
+        return BadRequest()
+    except (DbOperationError, Exception) as err:
+        LOGGER.error(err)
+        return InternalServerError()
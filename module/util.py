@@ -1,6 +1,8 @@
 """
 汎用
 """
+from string import Formatter
+
 from module.dbaccess import (
     Activity, DbOperationError
 )
@@ -20,6 +22,50 @@ def open_file(file):
         raise FileNotFoundError(err)
 
 
+def compile_template(text):
+    """テンプレート(str.format形式)をリテラルとフィールドに分割
+
+    @param text テンプレート
+    @return [(<リテラル(バイト列)>, <フィールド名>)]
+    """
+    return [
+        (literal.encode('UTF-8'), field)
+        for literal, field, _, _ in Formatter().parse(text)
+    ]
+
+
+def render_template(template, **values):
+    """分割済みテンプレートにバイト列を埋め込む
+
+    @param template 分割済みテンプレート
+    @param values {<フィールド名>: <バイト列>}
+    @return バイト列のリスト
+    """
+    chunks = []
+    for literal, field in template:
+        if literal:
+            chunks.append(literal)
+        if field is not None:
+            chunks.append(values[field])
+    return chunks
+
+
+def paginate(rows, limit):
+    """キーセットページネーション用に変換
+
+    次ページの有無を判定するため、rowsはlimit+1件まで取得しておく
+    @param rows 取得データ
+    @param limit 1ページの件数
+    @return ページデータ
+    @retval data 取得データ
+    @retval next_cursor 次ページ取得時のafter_id (最終ページの場合はNone)
+    """
+    rows = list(rows)
+    if len(rows) > limit:
+        return {'data': rows[:limit], 'next_cursor': rows[limit - 1]['id']}
+    return {'data': rows, 'next_cursor': None}
+
+
 def db_operation(func):
     """DB操作デコレータ
 
@@ -1,10 +1,39 @@
 """
 サーバ
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import os
-from wsgiref.simple_server import make_server
+import queue
+import signal
+import sys
+import threading
+from wsgiref.simple_server import make_server, WSGIServer, WSGIRequestHandler
 
-from module.urls import dispatch
+from module.dbaccess import migrate, close_pool
+from module.dbaccess_writer import ACTIVITY_BUFFER, close_activity_writer
+from module.dbaccess_async import close_async_pool
+from module.middleware import CompressionMiddleware, METRICS
+from module.static import STATIC_CACHE
+from module.urls import dispatch, dispatch_async
+
+
+LOGGER = logging.getLogger()
+
+# サーバモード (ワーカープロセス数, ワーカースレッド数のデフォルト)
+SERVER_MODE = {
+    'single': (1, 1),
+    'thread': (1, 16),
+    'prefork': (os.cpu_count() or 1, 1),
+}
+
+# ワーカースレッドあたりの受け付け済み(処理中、待機中)リクエスト数の上限
+# 上限に達した場合はacceptせず、待ち受けキュー(listen backlog)で待たせる
+REQUESTS_PER_THREAD = int(os.environ.get('SERVER_REQUESTS_PER_THREAD', 2))
 
 
 def run(environ, start_response):
@@ -15,14 +44,332 @@ def run(environ, start_response):
     @return レスポンスデータ
     """
     response = dispatch(environ)
-    start_response(
-        response.status,
-        [('Content-Type', '{}'.format(response.content_type))])
-    return [response.body.encode('UTF-8')]
+    chunks, content_length = _chunks(response.body)
+    start_response(response.status, _headers(response, content_length))
+    return chunks
+
+
+def _chunks(body):
+    """ボディをバイト列のイテラブルに変換
+
+    @param body ボディ(バイト列、またはバイト列のリスト)
+    @return (バイト列のイテラブル, Content-Length) サイズ不明の場合はNone
+    """
+    if isinstance(body, bytes):
+        return [body], len(body)
+    if isinstance(body, list):
+        return body, sum(len(chunk) for chunk in body)
+    return body, None
+
+
+def _headers(response, content_length):
+    """レスポンスヘッダー
+
+    ボディのないステータス(204、304)にはContent-Type、Content-Lengthを付与しない
+    @param response レスポンス
+    @param content_length ボディのサイズ(不明の場合はNone)
+    @return [(<ヘッダー名>, <値>)]
+    """
+    if response.status[:3] in ('204', '304'):
+        return list(response.headers)
+    headers = [('Content-Type', response.content_type), *response.headers]
+    if content_length is not None:
+        headers.append(('Content-Length', str(content_length)))
+    return headers
+
+
+class HeadMiddleware:
+    """ HEADリクエストのボディ破棄 """
+    def __init__(self, app):
+        """コンストラクタ
+
+        @param app WSGIアプリケーション
+        """
+        self._app = app
+
+    def __call__(self, environ, start_response):
+        """WSGI
+
+        他のミドルウェアより外側で破棄し、GETと同じヘッダー(圧縮後のContent-Length等)を返す
+        @param environ HTTPS環境変数
+        @param start_response ステータスコード、レスポンスヘッダーを受け取るオブジェクト
+        @return レスポンスデータ
+        """
+        chunks = self._app(environ, start_response)
+        if environ.get('REQUEST_METHOD') != 'HEAD':
+            return chunks
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        return []
+
+
+# JSON、HTMLレスポンスを圧縮するWSGIアプリケーション
+application = HeadMiddleware(CompressionMiddleware(run))
+
+
+async def run_async(scope, receive, send):
+    """ASGI
+
+    uvicorn等のASGIサーバから起動する (例: uvicorn server:run_async)
+    @param scope 接続情報
+    @param receive リクエストを受け取るコルーチン
+    @param send レスポンスを送るコルーチン
+    """
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+
+    response = await dispatch_async(_to_environ(scope, body))
+    chunks, content_length = _chunks(response.body)
+    headers = _headers(response, content_length)
+    await send({
+        'type': 'http.response.start',
+        'status': int(response.status.split(' ', 1)[0]),
+        'headers': [
+            (name.lower().encode('latin-1'), value.encode('latin-1'))
+            for name, value in headers
+        ],
+    })
+    if scope['method'] != 'HEAD':
+        async for chunk in _iter_chunks(chunks):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _iter_chunks(chunks):
+    """ボディのチャンクを非同期に返却
+
+    ストリーミングレスポンスはDBから読み込むため、ストリームごとの専用スレッドで取得する
+    (コネクションを保持したストリームがDB処理スレッドの空きを待つと、プールの空き待ちと相互に詰まる)
+    @param chunks バイト列のイテラブル
+    @return バイト列の非同期ジェネレータ
+    """
+    if isinstance(chunks, list):
+        for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='stream')
+    iterator = iter(chunks)
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        if hasattr(chunks, 'close'):
+            await loop.run_in_executor(executor, chunks.close)
+        executor.shutdown(wait=False)
+
+
+async def _lifespan(receive, send):
+    """ASGIライフスパン(起動時にマイグレーション、終了時にコネクション破棄)
+
+    @param receive イベントを受け取るコルーチン
+    @param send イベントを送るコルーチン
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await loop.run_in_executor(None, migrate)
+            await loop.run_in_executor(None, STATIC_CACHE.warm, 'static')
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await loop.run_in_executor(None, close_activity_writer)
+            await loop.run_in_executor(None, close_pool)
+            await close_async_pool()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def _to_environ(scope, body):
+    """ASGIの接続情報をWSGI環境変数に変換
+
+    @param scope 接続情報
+    @param body リクエストボディ
+    @return WSGI環境変数
+    """
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'wsgi.input': BytesIO(body),
+    }
+    for name, value in scope.get('headers', []):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        environ[key] = value.decode('latin-1')
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+class ThreadPoolWSGIServer(WSGIServer):
+    """ スレッドプールでリクエストを処理するWSGIサーバ """
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, threads=16,
+                 requests_per_thread=REQUESTS_PER_THREAD):
+        """コンストラクタ
+
+        @param server_address (ホスト, ポート)
+        @param handler_class リクエストハンドラー
+        @param threads ワーカースレッド数
+        @param requests_per_thread ワーカースレッドあたりの受け付け済みリクエスト数の上限
+        """
+        super().__init__(server_address, handler_class)
+        self._threads = threads
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(threads * requests_per_thread)
+
+    def process_request(self, request, client_address):
+        """リクエストをワーカースレッドに割り当て
+
+        スレッドはpre-fork後に各プロセスで生成する
+        受け付け済みリクエストが上限に達した場合は空きが出るまで待機する(次のacceptを止める)
+        @param request ソケット
+        @param client_address クライアントアドレス
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._threads)
+        # 解放はワーカースレッドで行う(_process_request_thread)
+        self._slots.acquire()  # pylint: disable=consider-using-with
+        try:
+            self._executor.submit(self._process_request_thread, request, client_address)
+        except RuntimeError:
+            self._slots.release()
+            raise
+
+    def _process_request_thread(self, request, client_address):
+        """ワーカースレッドでのリクエスト処理
+
+        @param request ソケット
+        @param client_address クライアントアドレス
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        """サーバ終了
+        """
+        super().server_close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def create_server(port, threads=1, app=application, handler_class=WSGIRequestHandler):
+    """サーバ生成
+
+    @param port ポート
+    @param threads ワーカースレッド数(1の場合は逐次処理)
+    @param app WSGIアプリケーション
+    @param handler_class リクエストハンドラー
+    @return WSGIサーバ
+    """
+    server_class = WSGIServer
+    if threads > 1:
+        server_class = partial(ThreadPoolWSGIServer, threads=threads)
+    return make_server('', port, app, server_class=server_class, handler_class=handler_class)
+
+
+def _start_log_listener():
+    """ログ出力をバックグラウンドスレッドに移す
+
+    ルートロガーのハンドラーをキュー経由に置き換え、リクエストスレッドでファイル書き込みしない
+    @return キューリスナー
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _serve_forever(httpd):
+    """リクエスト待ち受け
+
+    終了時は受け付けを止めて処理中のリクエストを待ってから、圧縮メトリクスをログに出力し、
+    バッファ済みのアクティビティ、ログを書き出す
+    (先に書き出すと、処理中のリクエストが書き出されないアクティビティ書き込みを再生成する)
+    @param httpd WSGIサーバ
+    """
+    listener = _start_log_listener() if ACTIVITY_BUFFER else None
+    try:
+        httpd.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        httpd.server_close()
+        LOGGER.info('compression metrics: %s', METRICS.snapshot())
+        close_activity_writer()
+        if listener is not None:
+            listener.stop()
+
+
+def serve(httpd, workers=1):
+    """サーバ起動
+
+    workersが2以上の場合は待ち受けソケットを共有するワーカープロセスをforkする
+    @param httpd WSGIサーバ
+    @param workers ワーカープロセス数
+    """
+    if workers <= 1:
+        _serve_forever(httpd)
+        return
+
+    # 親プロセスのDB接続をワーカーに引き継がない
+    close_pool()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # 親プロセスからのSIGTERMでも終了処理を行う
+            signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+            try:
+                _serve_forever(httpd)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+
+    try:
+        for pid in pids:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                continue
 
 
 if __name__ == '__main__':
     PORT = os.environ.get('PORT', 8000)
-    with make_server('', int(PORT), run) as httpd:
-        print(f'Serving HTTP on 0.0.0.0 port {PORT} ...')
-        httpd.serve_forever()
+    MODE = os.environ.get('SERVER_MODE', 'single')
+    WORKERS, THREADS = SERVER_MODE[MODE]
+    WORKERS = int(os.environ.get('SERVER_WORKERS', WORKERS))
+    THREADS = int(os.environ.get('SERVER_THREADS', THREADS))
+    migrate()
+    STATIC_CACHE.warm('static')
+    with create_server(int(PORT), THREADS) as httpd:
+        print(f'Serving HTTP on 0.0.0.0 port {PORT} ({MODE}: '
+              f'{WORKERS} process(es) x {THREADS} thread(s)) ...')
+        serve(httpd, WORKERS)
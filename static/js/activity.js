@@ -107,14 +107,14 @@ export class ActivityComponent {
   }
 
   /**
-   * アクティビティデータ取得
+   * アクティビティデータ取得(全件、ストリーミング)
    * 
    * @param {String} componentName コンポーネント名
    * @return {Object} アクティビティデータ
    */
   async _getActivityData(componentName) {
     try {
-      return await util.httpRequest(componentName);
+      return await util.httpRequest(`${componentName}?stream=json`);
     } catch (err) {
       const errObj = await err;
       Modal.show({
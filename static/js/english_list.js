@@ -9,10 +9,10 @@ class EnglishListTable {
   /**
    * 単語テーブル
    * 
-   * @param {Array} englishListData 単語データ
+   * @param {String} dataUrl 単語データ取得URL(DataTablesサーバサイド処理)
    */
-  constructor(englishListData) {
-    this._englishListData = englishListData;
+  constructor(dataUrl) {
+    this._dataUrl = dataUrl;
   }
 
   /**
@@ -45,11 +45,22 @@ class EnglishListTable {
    * @return {undefined} undefined
    */
   _initDataTable(table) {
-    const data = this._englishListData;
+    const dataUrl = this._dataUrl;
 
     $(document).ready(function () {
       const englishListTable = $(`#${table.id}`).DataTable({
-        data: data,
+        serverSide: true,
+        processing: true,
+        ajax: {
+          url: dataUrl,
+          error: (xhr) => {
+            const errObj = xhr.responseJSON || {};
+            Modal.show({
+              headerText: errObj.title,
+              bodyText: errObj.msg
+            });
+          }
+        },
         columns: [
           {
             data: 'is_correct',
@@ -196,7 +207,7 @@ class EnglishListTable {
                 method: 'POST',
                 body: JSON.stringify({ pkey })
               });
-              englishListTable.rows(clickedBtn.closest('tr')).remove().draw();
+              englishListTable.draw(false);
 
               ConfirmModal.afterOperation(
                 e.target.closest('#okBtn'),
@@ -226,8 +237,7 @@ export class EnglishListComponent {
    * @param {String} componentName コンポーネント名
    */
   constructor(componentName) {
-    this._englishListData = this._getEnglishListData(componentName);
-    this._englishListElm = this._createEnglishListWrap(this._englishListData);
+    this._englishListElm = this._createEnglishListWrap(`${componentName}/datatables`);
   }
 
   /**
@@ -239,37 +249,16 @@ export class EnglishListComponent {
     return this._englishListElm;
   }
 
-  /**
-   * 単語データ取得
-   * 
-   * @param {String} componentName コンポーネント名
-   * @return {Object} 単語データ
-   */
-  async _getEnglishListData(componentName) {
-    try {
-      return await util.httpRequest(componentName);
-    } catch (err) {
-      const errObj = await err;
-      Modal.show({
-        headerText: errObj.title,
-        bodyText: errObj.msg
-      });
-      return false;
-    }
-  }
-
   /**
    * 単語生成(ラッパー)
    * 
-   * @param {Array} englishListData 単語データ
+   * @param {String} dataUrl 単語データ取得URL
    * @return {Object} 単語
    */
-  async _createEnglishListWrap(englishListData) {
-    const _englishListData = await englishListData;
-
+  async _createEnglishListWrap(dataUrl) {
     return util.createDocumentFragment([
       this._createHeading(),
-      this._createEnglishListTable(_englishListData)
+      this._createEnglishListTable(dataUrl)
     ]);
   }
 
@@ -287,11 +276,11 @@ export class EnglishListComponent {
   /**
    * 単語テーブル生成
    * 
-   * @param {Object} englishListData 単語データ
+   * @param {String} dataUrl 単語データ取得URL
    * @return {Element} 単語テーブル
    */
-  _createEnglishListTable(englishListData) {
-    const englishListTableInst = new EnglishListTable(englishListData);
+  _createEnglishListTable(dataUrl) {
+    const englishListTableInst = new EnglishListTable(dataUrl);
 
     return util.createWrap({
       classNames: [
@@ -0,0 +1,65 @@
+"""ベンチマーク
+
+Word.insert(1件ずつコミット)と Word.bulk_upsert の挿入速度(rows/sec)を計測
+検証用スキーマを作成して計測し、終了時に削除する
+
+usage:
+  PSQL_HOST=... PSQL_DB_NAME=... PSQL_USER=... PSQL_PASSWORD=... python tests/bench_bulk_upsert.py
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import dbaccess
+
+
+SCHEMA = 'bench_bulk_upsert'
+ROWS = 50000
+SINGLE_ROWS = 2000
+BATCH_SIZES = [100, 1000, 5000]
+
+
+def _execute(sql):
+    conn = dbaccess.acquire_connection()
+    with conn.cursor() as cur:
+        cur.execute(sql)
+    conn.commit()
+
+
+def _reset():
+    _execute('TRUNCATE word RESTART IDENTITY;')
+
+
+def bench_insert(word, pairs):
+    _reset()
+    start = time.perf_counter()
+    for eng, jap in pairs:
+        word.insert(eng, jap)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+def bench_bulk_upsert(word, pairs, batch_size):
+    _reset()
+    start = time.perf_counter()
+    word.bulk_upsert(pairs, batch_size)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    _execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA};')
+    _execute(f'SET search_path TO {SCHEMA};')
+    try:
+        dbaccess.SchemaVersion().migrate()
+        word = dbaccess.Word()
+        pairs = [(f'english{i}', f'日本語{i}') for i in range(ROWS)]
+
+        rps = bench_insert(word, pairs[:SINGLE_ROWS])
+        print(f'insert (rows={SINGLE_ROWS}): {rps:10.1f} rows/s')
+        for batch_size in BATCH_SIZES:
+            rps = bench_bulk_upsert(word, pairs, batch_size)
+            print(f'bulk_upsert (rows={ROWS} batch_size={batch_size}): {rps:10.1f} rows/s')
+    finally:
+        _execute(f'DROP SCHEMA {SCHEMA} CASCADE;')
+        dbaccess.release_connection()
+        dbaccess.close_pool()
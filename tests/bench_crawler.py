@@ -0,0 +1,72 @@
+"""ベンチマーク
+
+URL取得のスループット(pages/sec)を計測
+ThreadPoolExecutor + requests.get(従来の_request)と Crawler を比較する
+ローカルのHTTPサーバ(1リクエスト20msの応答待ちを模擬)から1,000件のページを取得する
+
+usage:
+  python tests/bench_crawler.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import requests
+
+from module.crawler import Crawler
+
+
+URLS = 1000
+LATENCY = 0.02
+BODY = ('<html><body>' + '<p class="eng">english</p><p class="jap">日本語</p>' * 200
+        + '</body></html>').encode('UTF-8')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """ 応答待ちを模したハンドラー """
+    protocol_version = 'HTTP/1.1'
+    # 遅延ACKによる待ちを避ける
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench_thread_pool(urls):
+    start = time.perf_counter()
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(lambda url: requests.get(url, timeout=3), urls))
+    assert all(result.status_code == 200 for result in results)
+    return len(urls) / (time.perf_counter() - start)
+
+
+def bench_crawler(urls):
+    start = time.perf_counter()
+    results = Crawler().run(urls)
+    assert all(result.status == 200 for result in results)
+    return len(urls) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    urls = [f'http://127.0.0.1:{httpd.server_port}/page/{i}' for i in range(URLS)]
+    try:
+        print(f'ThreadPoolExecutor + requests: {bench_thread_pool(urls):8.1f} pages/s')
+        print(f'Crawler (aiohttp):             {bench_crawler(urls):8.1f} pages/s')
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,94 @@
+"""ベンチマーク
+
+保存済みページ(tests/fixtures)の英単語抽出速度(pages/sec)と最大メモリ使用量(RSS)を計測
+BeautifulSoupで全体を解析する従来の方法と extract.iter_pairs を比較する
+メモリ使用量を分けて計測するため、方法ごとに別プロセスで実行する
+あわせて、プロセスプールのワーカー数ごとの解析速度を計測する
+
+usage:
+  python tests/bench_extract.py
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import resource
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from module.extract import iter_pairs, extract_words
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+DURATION = 3
+PAGES = 200
+WORKERS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+
+def beautiful_soup(body):
+    bs_obj = BeautifulSoup(body, 'lxml')
+    eng = [i.text for i in bs_obj.find_all(class_='eng')]
+    jap = [i.text for i in bs_obj.find_all(class_='jap')]
+    return list(zip(eng, jap))
+
+
+def extract(body):
+    return list(iter_pairs(body))
+
+
+METHODS = {
+    'BeautifulSoup': beautiful_soup,
+    'iter_pairs': extract,
+}
+
+
+def _bench(name, path, conn):
+    with open(path, 'rb') as file:
+        body = file.read()
+    func = METHODS[name]
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pages = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        func(body)
+        pages += 1
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((pages / elapsed, peak_rss - base_rss))
+
+
+def bench(name, path):
+    parent, child = multiprocessing.Pipe()
+    proc = multiprocessing.Process(target=_bench, args=(name, path, child))
+    proc.start()
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+def bench_workers(path, workers):
+    with open(path, 'rb') as file:
+        body = file.read()
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        # ワーカーの起動時間を除く
+        list(executor.map(extract_words, [b''] * workers))
+        start = time.perf_counter()
+        list(executor.map(extract_words, [body] * PAGES))
+        return PAGES / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    for fixture in sorted(os.listdir(FIXTURES)):
+        path = os.path.join(FIXTURES, fixture)
+        size = os.path.getsize(path) // 1024
+        for name in METHODS:
+            pages, rss = bench(name, path)
+            print(f'{fixture} ({size} KiB) {name:14}: {pages:8.1f} pages/s, '
+                  f'peak RSS +{rss / 1024:6.1f} MiB')
+
+    path = os.path.join(FIXTURES, 'glossary_large.html')
+    for workers in WORKERS:
+        print(f'glossary_large.html workers={workers}: {bench_workers(path, workers):8.1f} pages/s')
@@ -0,0 +1,58 @@
+"""ベンチマーク
+
+ルーティングの割り当て速度(paths/sec)を計測
+PurePath.matchによる従来の割り当てと、match_static + ROUTES によるルーティングテーブルを比較する
+静的ファイル、API、存在しないパス、静的ファイルのディレクトリ外を指すパスを混在させる
+
+usage:
+  python tests/bench_router.py
+"""
+from pathlib import PurePath
+import os
+import sys
+import timeit
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import urls
+
+
+PATHS = [
+    '/', '/learning', '/english_list', '/activity', '/update/is_correct',
+    '/static/js/main.js', '/static/css/component.css', '/static/js/html2canvas.js',
+    '/NotFound', '/static/js/main', '/static/main.js', '/static/js/sub/main.js',
+    '/static/../server.py', '/static/js/../../server.py',
+] * 100
+NUMBER = 20
+REPEAT = 5
+
+
+def legacy():
+    for path in PATHS:
+        if PurePath(path).match('static/*/*'):
+            PurePath(path).suffix[1:]
+        else:
+            urls.END_POINT.get(path)
+
+
+def compiled():
+    for path in PATHS:
+        if urls.match_static(path) is None:
+            urls.ROUTES.get(('GET', path))
+
+
+METHODS = {
+    'PurePath': legacy,
+    'match_static': compiled,
+}
+
+
+def bench(func):
+    elapsed = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    return len(PATHS) * NUMBER / elapsed, elapsed / NUMBER
+
+
+if __name__ == '__main__':
+    results = {name: bench(func) for name, func in METHODS.items()}
+    for name, (rate, elapsed) in results.items():
+        print(f'{name:12}: {rate:12.1f} paths/s, {elapsed * 1000:8.3f} ms / {len(PATHS)} paths')
+    print(f'speedup: {results["match_static"][0] / results["PurePath"][0]:.1f}x')
@@ -0,0 +1,85 @@
+"""ベンチマーク
+
+server.py のサーバモード別スループット(requests/sec)を計測
+DB待ちを模したWSGIアプリケーションに並行リクエストを送信する
+
+usage:
+  python tests/bench_server.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import server
+
+
+PORT = 18000
+CLIENTS = 32
+DURATION = 3
+# (ワーカープロセス数, ワーカースレッド数)
+CONFIGS = [(1, 1), (1, 4), (1, 16), (2, 16), (4, 16)]
+
+
+class QuietHandler(server.WSGIRequestHandler):
+    """ アクセスログを出力しないハンドラー """
+    def log_message(self, *args):
+        pass
+
+
+def slow_app(environ, start_response):
+    """DB待ち(5ms)とJSON生成を模したWSGIアプリケーション
+    """
+    time.sleep(0.005)
+    body = json.dumps([{'id': i, 'english': 'english'} for i in range(200)])
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [body.encode('UTF-8')]
+
+
+def _serve(port, workers, threads):
+    os.setsid()
+    with server.create_server(port, threads, app=slow_app, handler_class=QuietHandler) as httpd:
+        try:
+            server.serve(httpd, workers)
+        except KeyboardInterrupt:
+            pass
+
+
+def _client(port, deadline):
+    count = 0
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=DURATION)
+        try:
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            count += 1
+        except OSError:
+            continue
+        finally:
+            conn.close()
+    return count
+
+
+def bench(port, workers, threads):
+    proc = multiprocessing.Process(target=_serve, args=(port, workers, threads))
+    proc.start()
+    time.sleep(0.5)
+    try:
+        deadline = time.monotonic() + DURATION
+        with ThreadPoolExecutor(max_workers=CLIENTS) as executor:
+            total = sum(executor.map(lambda _: _client(port, deadline), range(CLIENTS)))
+        return total / DURATION
+    finally:
+        os.killpg(proc.pid, signal.SIGINT)
+        proc.join()
+
+
+if __name__ == '__main__':
+    for i, (workers, threads) in enumerate(CONFIGS):
+        rps = bench(PORT + i, workers, threads)
+        print(f'workers={workers} threads={threads}: {rps:8.1f} req/s')
@@ -11,166 +11,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from module import api
 from module import dbaccess
+from module import response
 from module import util
 
 
-class TestResponseBase(object):
-    """ レスポンス基底 """
-    def setup(self):
-        self.inst = api.ResponseBase('application/json', 'body')
-
-    def test_status_001(self):
-        """ステータスコード
-        正常ケース
-
-        in:
-          '200 OK'
-        expect:
-          '200 OK'
-        """
-        assert self.inst.status == '200 OK'
-
-    def test_content_type_001(self):
-        """コンテンツタイプ
-        正常ケース
-
-        in:
-          'application/json'
-        expect:
-          'application/json'
-        """
-        assert self.inst.content_type == 'application/json'
-
-    def test_body_001(self):
-        """ボディ
-        正常ケース
-
-        in:
-          'body'
-        expect:
-          'body'
-        """
-        assert self.inst.body == 'body'
-
-
-class TestHtmlResponse(object):
-    """ HTMLレスポンス """
-    def setup(self):
-        self.inst = api.HtmlResponse('body')
-
-    def test_status_001(self):
-        """ステータスコード
-        正常ケース
-
-        in:
-          '200 OK'
-        expect:
-          '200 OK'
-        """
-        assert self.inst.status == '200 OK'
-
-    def test_content_type_001(self):
-        """コンテンツタイプ
-        正常ケース
-
-        in:
-          'text/html'
-        expect:
-          'text/html'
-        """
-        assert self.inst.content_type == 'text/html'
-
-    def test_body_001(self):
-        """ボディ
-        正常ケース
-
-        in:
-          'body'
-        expect:
-          'body'
-        """
-        assert self.inst.body == 'body'
-
-
-class TestStaticResponse(object):
-    """ 静的データレスポンス """
-    def setup(self):
-        self.inst = api.StaticResponse('static/js/component.js', 'js')
-
-    def test_status_001(self):
-        """ステータスコード
-        正常ケース
-
-        in:
-          '200 OK'
-        expect:
-          '200 OK'
-        """
-        assert self.inst.status == '200 OK'
-
-    def test_content_type_001(self):
-        """コンテンツタイプ
-        正常ケース
-
-        in:
-          'text/javascript'
-        expect:
-          'text/javascript'
-        """
-        assert self.inst.content_type == 'text/javascript'
-
-    def test_body_001(self):
-        """ボディ
-        正常ケース
-
-        in:
-          'static/js/component.js'
-        expect:
-          JSコード
-        """
-        with open('static/js/component.js', 'r') as file:
-            assert self.inst.body == file.read()
-
-
-class TestJsonResponse(object):
-    """ JSONレスポンス """
-    def setup(self):
-        self.inst = api.JsonResponse({'id': 10})
-
-    def test_status_001(self):
-        """ステータスコード
-        正常ケース
-
-        in:
-          '200 OK'
-        expect:
-          '200 OK'
-        """
-        assert self.inst.status == '200 OK'
-
-    def test_content_type_001(self):
-        """コンテンツタイプ
-        正常ケース
-
-        in:
-          'application/json'
-        expect:
-          'application/json'
-        """
-        assert self.inst.content_type == 'application/json'
-
-    def test_body_001(self):
-        """ボディ
-        正常ケース
-
-        in:
-          {'id': 10}
-        expect:
-          '{"id": 10}'
-        """
-        assert self.inst.body == '{"id": 10}'
-
-
 class TestValidate(object):
     """ バリデーション """
     def setup(self):
@@ -473,14 +317,16 @@ class TestDashboardView(object):
         )
         result = self.inst.view()
 
-        assert isinstance(result, api.HtmlResponse)
+        assert isinstance(result, response.HtmlResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'text/html'
-        assert result.body == self.inst._body.format(dashboardData=json.dumps({
+        with open('index.html', 'r') as file:
+            template = file.read()
+        assert b''.join(result.body) == template.format(dashboardData=json.dumps({
             'count': expect_count_num,
             'activitys': expect_select_activity_order_by_desc_limit_5,
             'learningLog': expect_select_count_learning_date
-        }))
+        })).encode()
 
     def test_open_html_file_001(self):
         """HTML読み込み
@@ -489,10 +335,10 @@ class TestDashboardView(object):
         in:
           index.html
         expect:
-          HTMLコード
+          分割済みテンプレート
         """
         with open('index.html', 'r') as file:
-            assert self.inst._open_html_file() == file.read()
+            assert self.inst._open_html_file() == util.compile_template(file.read())
 
     def test_count_num_001(self, monkeypatch):
         """登録単語数、習得済み単語数、ブックマーク数カウント
@@ -511,18 +357,10 @@ class TestDashboardView(object):
             'bookmarkTotal': 1,
           }
         """
-        def mock_count_all(self):
-            return 1000
-
-        def mock_count_is_correct(self):
-            return 100
+        def mock_count_summary(self):
+            return {'total': 1000, 'is_correct': 100, 'bookmark': 1}
 
-        def mock_count_bookmark(self):
-            return 1
-
-        monkeypatch.setattr(dbaccess.Word, 'count_all', mock_count_all)
-        monkeypatch.setattr(dbaccess.Word, 'count_is_correct', mock_count_is_correct)
-        monkeypatch.setattr(dbaccess.Word, 'count_bookmark', mock_count_bookmark)
+        monkeypatch.setattr(dbaccess.Word, 'count_summary', mock_count_summary)
         assert self.inst._count_num() == {
             'wordTotal': 1000,
             'isCorrectTotal': 100,
@@ -749,10 +587,10 @@ class TestLearningView(object):
         monkeypatch.setattr(self.inst, '_select_learning', mock_select_learning)
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps(expect_select_learning)
+        assert result.body == json.dumps(expect_select_learning).encode()
 
     def test_select_learning_001(self, monkeypatch):
         """学習データ取得
@@ -885,109 +723,101 @@ class TestEnglishListView(object):
         self.inst = api.EnglishListView()
 
     def test_view_001(self, monkeypatch):
-        """レスポンス
+        """レスポンス(ページネーションの指定なし)
         正常ケース
 
         expect:
-          '[
-            {
-              "id': 1,
-              "english": "english",
-              "japanese": "日本語",
-              'is_correct': 'TRUE'
-            },
-            {
-              "id': 2,
-              "english": "english",
-              "japanese": "日本語",
-              'is_correct': 'TRUE'
-            },
-          ]'
-
+          先頭からデフォルト件数を取得する
+          '{
+            "data": [
+              {"id": 1, "english": "english", "japanese": "日本語", "is_correct": "TRUE"},
+              {"id": 2, "english": "english", "japanese": "日本語", "is_correct": "TRUE"}
+            ],
+            "next_cursor": null
+          }'
         """
-        expect_select_english_list = [
-            {
-                'id': 1,
-                'english': 'english',
-                'japanese': '日本語',
-                'is_correct': 'TRUE'
-            },
-            {
-                'id': 2,
-                'english': 'english',
-                'japanese': '日本語',
-                'is_correct': 'TRUE'
-            },
-        ]
-        def mock_select_english_list():
-            return expect_select_english_list
+        expect_select_english_list_page = {
+            'data': [
+                {
+                    'id': 1,
+                    'english': 'english',
+                    'japanese': '日本語',
+                    'is_correct': 'TRUE'
+                },
+                {
+                    'id': 2,
+                    'english': 'english',
+                    'japanese': '日本語',
+                    'is_correct': 'TRUE'
+                },
+            ],
+            'next_cursor': None,
+        }
+        pages = []
+        def mock_select_english_list_page(page):
+            pages.append(page)
+            return expect_select_english_list_page
 
-        monkeypatch.setattr(self.inst, '_select_english_list', mock_select_english_list)
+        monkeypatch.setattr(self.inst, '_select_english_list_page', mock_select_english_list_page)
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert pages == [{'after_id': None, 'limit': api.PAGE_SIZE}]
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps(expect_select_english_list)
+        assert result.body == json.dumps(expect_select_english_list_page).encode()
 
-    def test_select_english_list_001(self, monkeypatch):
-        """単語一覧データ取得
+    def test_view_002(self, monkeypatch):
+        """レスポンス(ストリーミング指定)
         正常ケース
 
         in:
-          [
-            {
-              'id': 1,
-              'english': 'english',
-              'japanese': '日本語',
-              'is_correct': 'TRUE'
-            },
-            {
-              'id': 2,
-              'english': 'english',
-              'japanese': '日本語',
-              'is_correct': 'FALSE'
-            },
-          ]
+          'stream=ndjson'
         expect:
-          [
-            {
-              'id': 1,
-              'english': 'english',
-              'japanese': '日本語',
-              'is_correct': 'TRUE'
-            },
-            {
-              'id': 2,
-              'english': 'english',
-              'japanese': '日本語',
-              'is_correct': 'FALSE'
-            },
-          ]
+          ページネーションせず全件をストリーミングする
         """
-        expect_select_english_list = [
-            {
-                'id': 1,
-                'english': 'english',
-                'japanese': '日本語',
-                'is_correct': 'TRUE'
-            },
+        rows = [{'id': 1, 'english': 'english', 'japanese': '日本語', 'is_correct': 'TRUE'}]
+        def mock_iter_english_list(self):
+            return iter(rows)
+
+        monkeypatch.setattr(dbaccess.Word, 'iter_english_list', mock_iter_english_list)
+        self.inst._query = 'stream=ndjson'
+        result = self.inst.view()
+
+        assert isinstance(result, response.StreamingJsonResponse)
+        assert b''.join(result.body) == json.dumps(rows[0]).encode() + b'\n'
+
+    def test_select_english_list_page_001(self, monkeypatch):
+        """単語一覧データ取得(ページネーション)
+        正常ケース
+
+        in:
+          {'after_id': None, 'limit': 2}、3件
+        expect:
+          {
+            'data': <先頭2件>,
+            'next_cursor': 2
+          }
+        """
+        rows = [
             {
-                'id': 2,
+                'id': pkey,
                 'english': 'english',
                 'japanese': '日本語',
                 'is_correct': 'FALSE'
-            },
+            }
+            for pkey in (1, 2, 3)
         ]
-        def mock_select_english_list(self):
-            return expect_select_english_list
+        def mock_select_english_list_page(self, after_id, limit):
+            return rows[:limit]
 
         monkeypatch.setattr(
             dbaccess.Word,
-            'select_english_list',
-            mock_select_english_list
+            'select_english_list_page',
+            mock_select_english_list_page
         )
-        assert self.inst._select_english_list() == expect_select_english_list
+        assert self.inst._select_english_list_page({'after_id': None, 'limit': 2}) ==\
+            {'data': rows[:2], 'next_cursor': 2}
 
 
 class TestBookMarkView(object):
@@ -1033,10 +863,10 @@ class TestBookMarkView(object):
         monkeypatch.setattr(self.inst, '_select_bookmark', mock_select_bookmark)
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps(expect_select_bookmark)
+        assert result.body == json.dumps(expect_select_bookmark).encode()
 
     def test_select_bookmark_001(self, monkeypatch):
         """ブックマークデータ取得
@@ -1098,42 +928,74 @@ class TestActivityView(object):
         self.inst = api.ActivityView()
 
     def test_view_001(self, monkeypatch):
-        """レスポンス
+        """レスポンス(ページネーションの指定なし)
         正常ケース
 
         expect:
-          [
-            {
-              'date': '2020/10/01',
-              'type_flag': 'learning',
-              'detail': '英語を習得しました'
-            }
-          ]
-        """
-        expect_select_all = [
-            {
+          先頭からデフォルト件数を取得する
+          {
+            'data': [
+              {
                 'date': '2020/10/01',
                 'type_flag': 'learning',
                 'detail': '英語を習得しました'
-            }
-        ]
-
-        def mock_select_all():
-            return expect_select_all
+              }
+            ],
+            'next_cursor': None
+          }
+        """
+        expect_select_page = {
+            'data': [
+                {
+                    'date': '2020/10/01',
+                    'type_flag': 'learning',
+                    'detail': '英語を習得しました'
+                }
+            ],
+            'next_cursor': None,
+        }
+        pages = []
+        def mock_select_page(page):
+            pages.append(page)
+            return expect_select_page
 
-        monkeypatch.setattr(self.inst, '_select_all', mock_select_all)
+        monkeypatch.setattr(self.inst, '_select_page', mock_select_page)
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert pages == [{'after_id': None, 'limit': api.PAGE_SIZE}]
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps(expect_select_all)
+        assert result.body == json.dumps(expect_select_page).encode()
 
-    def test_select_all_001(self, monkeypatch):
-        """アクティビティ一覧データ取得
+    def test_view_002(self, monkeypatch):
+        """レスポンス(ストリーミング指定)
         正常ケース
 
         in:
+          'stream=json'
+        expect:
+          ページネーションせず全件を表示用に変換してストリーミングする
+        """
+        _date = date.today()
+        def mock_iter_all(self):
+            return iter([{'date': _date, 'type': 0, 'detail': '英語を習得しました'}])
+
+        monkeypatch.setattr(dbaccess.Activity, 'iter_all', mock_iter_all)
+        self.inst._query = 'stream=json'
+        result = self.inst.view()
+
+        assert isinstance(result, response.StreamingJsonResponse)
+        assert json.loads(b''.join(result.body)) == [
+            {'date': _date.strftime('%Y/%m/%d'), 'type': 'learning', 'detail': '英語を習得しました'}
+        ]
+
+    def test_select_page_001(self, monkeypatch):
+        """アクティビティ一覧データ取得(ページネーション)
+        正常ケース
+
+        in:
+          {'after_id': None, 'limit': 5}、
           [
             {
               'date': datetime.date.today()
@@ -1162,6 +1024,7 @@ class TestActivityView(object):
             },
           ]
         expect:
+          data
           [
             {
               'date': datetime.date.today().strftime('%Y/%m/%d')
@@ -1191,7 +1054,7 @@ class TestActivityView(object):
           ]
         """
         _date = date.today()
-        def mock_select_all(self):
+        def mock_select_page(self, after_id, limit):
             return [
                 {
                     'date': _date,
@@ -1220,8 +1083,8 @@ class TestActivityView(object):
                 },
             ]
 
-        monkeypatch.setattr(dbaccess.Activity, 'select_all', mock_select_all)
-        assert self.inst._select_all() == [
+        monkeypatch.setattr(dbaccess.Activity, 'select_page', mock_select_page)
+        assert self.inst._select_page({'after_id': None, 'limit': 5})['data'] == [
             {
                 'date': _date.strftime('%Y/%m/%d'),
                 'type': 'learning',
@@ -1264,10 +1127,10 @@ class TestUpdateIsCorrectFlagView(object):
         """
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps({'msg': 'englishを習得しました'})
+        assert result.body == json.dumps({'msg': 'englishを習得しました'}).encode()
 
     def test_validate_001(self):
         """更新データバリデーション
@@ -1288,39 +1151,36 @@ class TestUpdateIsCorrectFlagView(object):
           'englishを習得しました'
         """
         expect_update_is_correct_flag = 'english'
-        def mock_update_is_correct_flag(self, pkey, flag):
-            return expect_update_is_correct_flag
+        def mock_update_is_correct_flag_with_activity(self, pkey, flag, activity):
+            return f'{activity.prefix}{expect_update_is_correct_flag}{activity.suffix}'
 
         monkeypatch.setattr(
             dbaccess.Word,
-            'update_is_correct_flag',
-            mock_update_is_correct_flag
+            'update_is_correct_flag_with_activity',
+            mock_update_is_correct_flag_with_activity
         )
         assert self.inst._update_is_correct_flag({'pkey': 1, 'flag': 'TRUE'}) ==\
             f'{expect_update_is_correct_flag}を習得しました'
 
-    @pytest.mark.parametrize('input_01, input_02, expect', [
-        ('english', 'TRUE', 'englishを習得しました'),
-        ('english', 'FALSE', 'englishを未習得に変更しました'),
+    @pytest.mark.parametrize('input, expect', [
+        ('TRUE', api.ActivityRecord(api.TODAY, 0, api.DB_EVENT.LEARNED, suffix='を習得しました')),
+        ('FALSE', api.ActivityRecord(
+            api.TODAY, 0, api.DB_EVENT.UNLEARNED, suffix='を未習得に変更しました')),
     ])
-    def test_register_activity_001(self, monkeypatch, input_01, input_02, expect):
-        """アクティビティ登録
+    def test_create_activity_001(self, input, expect):
+        """アクティビティ生成
         正常ケース
 
-        in_01:
-          'english'
-        in_02:
+        in:
           'TRUE'
         expect:
-          'englishを習得しました'
-        in_01:
-          'english'
-        in_02:
+          ActivityRecord(TODAY, 0, LEARNED, suffix='を習得しました')
+        in:
           'FALSE'
         expect:
-          'englishを未習得に変更しました'
+          ActivityRecord(TODAY, 0, UNLEARNED, suffix='を未習得に変更しました')
         """
-        assert self.inst._register_activity(input_01, input_02) == expect
+        assert self.inst._create_activity(input) == expect
 
 
 class TestUpdateBookmarkView(object):
@@ -1337,10 +1197,10 @@ class TestUpdateBookmarkView(object):
         """
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps({'msg': 'englishをブックマーク登録しました'})
+        assert result.body == json.dumps({'msg': 'englishをブックマーク登録しました'}).encode()
 
     def test_validate_001(self):
         """更新データバリデーション
@@ -1361,39 +1221,37 @@ class TestUpdateBookmarkView(object):
           'englishをブックマーク登録しました'
         """
         expect_update_bookmark_flag = 'english'
-        def mock_update_bookmark_flag(self, pkey, flag):
-            return expect_update_bookmark_flag
+        def mock_update_bookmark_flag_with_activity(self, pkey, flag, activity):
+            return f'{activity.prefix}{expect_update_bookmark_flag}{activity.suffix}'
 
         monkeypatch.setattr(
             dbaccess.Word,
-            'update_bookmark_flag',
-            mock_update_bookmark_flag
+            'update_bookmark_flag_with_activity',
+            mock_update_bookmark_flag_with_activity
         )
         assert self.inst._update_bookmark_flag({'pkey': 1, 'flag': 'TRUE'}) ==\
              f'{expect_update_bookmark_flag}をブックマーク登録しました'
 
-    @pytest.mark.parametrize('input_01, input_02, expect', [
-        ('english', 'TRUE', 'englishをブックマーク登録しました'),
-        ('english', 'FALSE', 'englishをブックマーク解除しました'),
+    @pytest.mark.parametrize('input, expect', [
+        ('TRUE', api.ActivityRecord(
+            api.TODAY, 3, api.DB_EVENT.BOOKMARKED, suffix='をブックマーク登録しました')),
+        ('FALSE', api.ActivityRecord(
+            api.TODAY, 3, api.DB_EVENT.UNBOOKMARKED, suffix='をブックマーク解除しました')),
     ])
-    def test_register_activity_001(self, monkeypatch, input_01, input_02, expect):
-        """アクティビティ登録
+    def test_create_activity_001(self, input, expect):
+        """アクティビティ生成
         正常ケース
 
-        in_01:
-          'english'
-        in_02:
+        in:
           'TRUE'
         expect:
-          'englishをブックマーク登録しました'
-        in_01:
-          'english'
-        in_02:
+          ActivityRecord(TODAY, 3, BOOKMARKED, suffix='をブックマーク登録しました')
+        in:
           'FALSE'
         expect:
-          'englishをブックマーク解除しました'
+          ActivityRecord(TODAY, 3, UNBOOKMARKED, suffix='をブックマーク解除しました')
         """
-        assert self.inst._register_activity(input_01, input_02) == expect
+        assert self.inst._create_activity(input) == expect
 
 
 class TestRegisterWordView(object):
@@ -1410,10 +1268,10 @@ class TestRegisterWordView(object):
         """
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps({'msg': '英語: english 日本語: 日本語 を登録しました'})
+        assert result.body == json.dumps({'msg': '英語: english 日本語: 日本語 を登録しました'}).encode()
 
     def test_validate_001(self):
         """登録データバリデーション
@@ -1436,19 +1294,17 @@ class TestRegisterWordView(object):
         assert self.inst._insert({'eng_val': 'english', 'jap_val': '日本語'}) ==\
             '英語: english 日本語: 日本語 を登録しました'
 
-    def test_register_activity_001(self, monkeypatch):
-        """アクティビティ登録
+    def test_create_activity_001(self):
+        """アクティビティ生成
         正常ケース
 
-        in_01:
-          'english'
-        in_02:
+        in:
           '日本語'
         expect:
-          '英語: english 日本語: 日本語 を登録しました'
+          ActivityRecord(TODAY, 1, REGISTERED, '英語: ', ' 日本語: 日本語 を登録しました')
         """
-        assert self.inst._register_activity('english', '日本語') ==\
-            '英語: english 日本語: 日本語 を登録しました'
+        assert self.inst._create_activity('日本語') == api.ActivityRecord(
+            api.TODAY, 1, api.DB_EVENT.REGISTERED, '英語: ', ' 日本語: 日本語 を登録しました')
 
 
 class TestDeleteView(object):
@@ -1466,10 +1322,10 @@ class TestDeleteView(object):
         """
         result = self.inst.view()
 
-        assert isinstance(result, api.JsonResponse)
+        assert isinstance(result, response.JsonResponse)
         assert result.status == '200 OK'
         assert result.content_type == 'application/json'
-        assert result.body == json.dumps({'msg': 'englishを削除しました'})
+        assert result.body == json.dumps({'msg': 'englishを削除しました'}).encode()
 
     def test_validate_001(self):
         """削除データバリデーション
@@ -1491,14 +1347,96 @@ class TestDeleteView(object):
         """
         assert self.inst._delete({'pkey': 1}) == 'englishを削除しました'
 
-    def test_register_activity_001(self, monkeypatch):
-        """アクティビティ登録
+    def test_create_activity_001(self):
+        """アクティビティ生成
+        正常ケース
+
+        expect:
+          ActivityRecord(TODAY, 2, DELETED, suffix='を削除しました')
+        """
+        assert self.inst._create_activity() == api.ActivityRecord(
+            api.TODAY, 2, api.DB_EVENT.DELETED, suffix='を削除しました')
+
+
+class TestQueryValidate(object):
+    """ クエリ文字列バリデーション """
+    @pytest.mark.parametrize('input, expect', [
+        ('stream=json', 'json'),
+        ('stream=ndjson', 'ndjson'),
+        ('', None),
+        (None, None),
+    ])
+    def test_validate_stream_001(self, input, expect):
+        """ストリーミング形式バリデーション
         正常ケース
+        """
+        assert api.QueryValidate(input).validate_stream() == expect
+
+    def test_validate_stream_002(self):
+        """ストリーミング形式バリデーション
+        エラーケース
 
         in:
-          'english'
+          'stream=xml'
         expect:
-          'englishを削除しました'
+          ValueError
         """
-        assert self.inst._register_activity('english') ==\
-            'englishを削除しました'
+        with pytest.raises(ValueError):
+            api.QueryValidate('stream=xml').validate_stream()
+
+    @pytest.mark.parametrize('input, expect', [
+        ('limit=10', {'after_id': None, 'limit': 10}),
+        ('after_id=5', {'after_id': 5, 'limit': api.PAGE_SIZE}),
+        ('after_id=5&limit=20', {'after_id': 5, 'limit': 20}),
+        ('stream=json', {'after_id': None, 'limit': api.PAGE_SIZE}),
+        (None, {'after_id': None, 'limit': api.PAGE_SIZE}),
+    ])
+    def test_validate_page_001(self, input, expect):
+        """ページネーションバリデーション
+        正常ケース
+        """
+        assert api.QueryValidate(input).validate_page() == expect
+
+    @pytest.mark.parametrize('input', [
+        ('limit=0'),
+        (f'limit={api.MAX_PAGE_SIZE + 1}'),
+        ('limit=abc'),
+        ('after_id=-1'),
+        ('after_id=abc'),
+    ])
+    def test_validate_page_002(self, input):
+        """ページネーションバリデーション
+        エラーケース
+
+        expect:
+          ValueError
+        """
+        with pytest.raises(ValueError):
+            api.QueryValidate(input).validate_page()
+
+    @pytest.mark.parametrize('input, expect', [
+        (None, api.LEARNING_LOG_DAYS),
+        ('days=30', 30),
+        ('days=365', 365),
+        ('days=all', None),
+    ])
+    def test_validate_days_001(self, input, expect):
+        """集計日数バリデーション
+        正常ケース
+        """
+        assert api.QueryValidate(input).validate_days() == expect
+
+    @pytest.mark.parametrize('input', [
+        ('days=0'),
+        (f'days={api.MAX_LEARNING_LOG_DAYS + 1}'),
+        ('days=abc'),
+    ])
+    def test_validate_days_002(self, input):
+        """集計日数バリデーション
+        エラーケース
+
+        expect:
+          ValueError
+        """
+        with pytest.raises(ValueError):
+            api.QueryValidate(input).validate_days()
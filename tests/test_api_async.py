@@ -0,0 +1,111 @@
+"""pytest
+
+api_async.py
+"""
+import asyncio
+from datetime import date, timedelta
+import json
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import api
+from module import api_async
+
+
+def test_dashboard_001(monkeypatch):
+    """ダッシュボード画面
+    正常ケース
+
+    expect:
+      同期版と同じ形式に変換したダッシュボードデータが埋め込まれる
+    """
+    inst = api_async.DashboardAsyncView()
+
+    async def mock_count_summary():
+        return {'total': 1000, 'is_correct': 100, 'bookmark': 10}
+
+    async def mock_select_activity_order_by_desc_limit_5():
+        return [{'type': 0, 'detail': '英語を習得しました'}]
+
+    async def mock_select_count_learning_date(from_date, to_date):
+        return [{'count': 10, 'date': date(2020, 10, 1)}]
+
+    monkeypatch.setattr(inst._db_word, 'count_summary', mock_count_summary)
+    monkeypatch.setattr(
+        inst._db_activity, 'select_activity_order_by_desc_limit_5',
+        mock_select_activity_order_by_desc_limit_5)
+    monkeypatch.setattr(
+        inst._db_activity, 'select_count_learning_date', mock_select_count_learning_date)
+    result = asyncio.run(inst.view())
+
+    assert result.status == '200 OK'
+    assert json.dumps({
+        'count': {'wordTotal': 1000, 'isCorrectTotal': 100, 'bookmarkTotal': 10},
+        'activitys': [{'type': 'learning', 'detail': '英語を習得しました'}],
+        'learningLog': [{'count': 10, 'date': '2020/10/01'}],
+    }).encode('UTF-8') in b''.join(result.body)
+
+
+def test_learning_001(monkeypatch):
+    """学習画面
+    正常ケース
+
+    expect:
+      不正解の日本語3件を含む学習データ
+    """
+    inst = api_async.LearningAsyncView()
+
+    async def mock_select_learning():
+        return [{'id': 1, 'english': 'english', 'japanese': '日本語', 'bookmark': True}]
+
+    async def mock_select_incorrect():
+        return [('日本語_1',), ('日本語_2',)]
+
+    monkeypatch.setattr(inst._db_word, 'select_learning', mock_select_learning)
+    monkeypatch.setattr(inst._db_word, 'select_incorrect', mock_select_incorrect)
+    result = json.loads(asyncio.run(inst.view()).body)
+
+    assert result[0]['correct'] == '日本語'
+    assert {result[0][f'incorrect_{i}'] for i in (1, 2, 3)} <= {'日本語_1', '日本語_2'}
+
+
+def test_learning_log_001(monkeypatch):
+    """習得ログ
+    正常ケース
+
+    in:
+      'days=30'
+    expect:
+      30日前から今日までの習得ログ
+    """
+    inst = api_async.LearningLogAsyncView('days=30')
+    called = {}
+
+    async def mock_select_daily_count(event, from_date, to_date):
+        called.update(event=event, from_date=from_date, to_date=to_date)
+        return [{'count': 3, 'date': date(2020, 10, 1)}]
+
+    monkeypatch.setattr(inst._db_activity, 'select_daily_count', mock_select_daily_count)
+    result = asyncio.run(inst.view())
+
+    assert json.loads(result.body) == [{'count': 3, 'date': '2020/10/01'}]
+    assert called == {
+        'event': api.DB_EVENT.LEARNED,
+        'from_date': api.TODAY - timedelta(days=30),
+        'to_date': api.TODAY,
+    }
+
+
+def test_learning_log_002():
+    """習得ログ
+    エラーケース
+
+    in:
+      'days=0'
+    expect:
+      ValueError
+    """
+    with pytest.raises(ValueError):
+        asyncio.run(api_async.LearningLogAsyncView('days=0').view())
@@ -0,0 +1,55 @@
+"""pytest
+
+api_datatables.py
+"""
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import api
+from module import api_datatables
+
+
+@pytest.mark.parametrize('input, expect', [
+    (
+        'draw=3&start=20&length=10&search%5Bvalue%5D=app'
+        '&order%5B0%5D%5Bcolumn%5D=1&order%5B0%5D%5Bdir%5D=desc'
+        '&columns%5B1%5D%5Bdata%5D=english',
+        {
+            'draw': 3, 'start': 20, 'length': 10, 'search': 'app',
+            'order_column': 'english', 'order_dir': 'desc'
+        }
+    ),
+    (
+        'draw=1&start=0&length=-1',
+        {
+            'draw': 1, 'start': 0, 'length': api.MAX_PAGE_SIZE, 'search': '',
+            'order_column': 'id', 'order_dir': 'asc'
+        }
+    ),
+])
+def test_validate_datatables_001(input, expect):
+    """DataTablesサーバサイド処理リクエストバリデーション
+    正常ケース
+    """
+    assert api_datatables.DataTablesQueryValidate(input).validate_datatables() == expect
+
+
+@pytest.mark.parametrize('input', [
+    ('start=-1'),
+    ('length=0'),
+    (f'length={api.MAX_PAGE_SIZE + 1}'),
+    ('draw=abc'),
+    ('order%5B0%5D%5Bcolumn%5D=1&columns%5B1%5D%5Bdata%5D=english%3B'),
+    ('order%5B0%5D%5Bdir%5D=up'),
+])
+def test_validate_datatables_002(input):
+    """DataTablesサーバサイド処理リクエストバリデーション
+    エラーケース
+
+    expect:
+      ValueError
+    """
+    with pytest.raises(ValueError):
+        api_datatables.DataTablesQueryValidate(input).validate_datatables()
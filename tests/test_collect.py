@@ -0,0 +1,225 @@
+"""pytest
+
+collect.py
+"""
+import hashlib
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'module'))
+
+import collect
+from crawler import FetchResult
+
+
+PAGE = '<p class="eng">{0}</p><p class="jap">{0}の日本語</p>'
+
+
+class MockWord(object):
+    """ wordテーブルモック """
+    registered = {}
+
+    def __init__(self):
+        self.pairs = []
+
+    def bulk_upsert(self, pairs):
+        self.pairs.extend(pairs)
+        pairs = dict(pairs)
+        return [english for english, japanese in pairs.items() if self.registered.get(english) != japanese]
+
+
+class MockCrawlState(object):
+    """ crawl_stateテーブルモック """
+    rows = {}
+
+    def __init__(self):
+        self.states = []
+
+    def select_all(self):
+        return dict(self.rows)
+
+    def upsert(self, states):
+        self.states.extend(states)
+
+
+class MockCrawlCheckpoint(object):
+    """ crawl_checkpointテーブルモック """
+    completed = set()
+
+    def __init__(self):
+        self.checkpoints = []
+        self.cleared = False
+
+    def select_completed(self):
+        return set(self.completed)
+
+    def insert(self, checkpoints):
+        self.checkpoints.extend(checkpoints)
+
+    def clear(self):
+        self.cleared = True
+
+
+class MockCrawler(object):
+    """ クローラーモック """
+    def __init__(self, pages=None):
+        self.pages = pages or {}
+        self.requested = []
+
+    def iter(self, urls, headers=None):
+        for url in urls:
+            self.requested.append((url, headers(url) if headers is not None else None))
+            yield self.pages.get(url) or FetchResult(url, 200, PAGE.format(url[-1]).encode())
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    MockWord.registered = {}
+    MockCrawlState.rows = {}
+    MockCrawlCheckpoint.completed = set()
+    monkeypatch.setattr(collect, 'Word', MockWord)
+    monkeypatch.setattr(collect, 'CrawlState', MockCrawlState)
+    monkeypatch.setattr(collect, 'CrawlCheckpoint', MockCrawlCheckpoint)
+
+
+@pytest.mark.parametrize('workers', [0, -1])
+def test_collect_001(dao, workers):
+    """スクレイピング(ワーカープロセス数が1未満)
+    エラーケース
+
+    expect:
+      同一プロセスで解析し、停止せずに全URLの英単語が挿入される
+    """
+    inst = collect.Collector(urls=['http://example.com/a', 'http://example.com/b'],
+                             crawler=MockCrawler())
+    stats = inst.collect(workers=workers)
+
+    assert sorted(inst._db_word.pairs) == [('a', 'aの日本語'), ('b', 'bの日本語')]
+    assert [s.processed for s in stats] == [2, 2, 2]
+
+
+def test_parse_001(dao):
+    """HTML解析(304 Not Modified、取得状態あり)
+    正常ケース
+
+    expect:
+      単語なし、前回の取得状態を引き継いだ解析結果
+    """
+    url = 'http://example.com/a'
+    MockCrawlState.rows = {url: {'etag': '"abc"', 'last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT',
+                                 'content_hash': 'hash'}}
+    inst = collect.Collector(urls=[url], crawler=MockCrawler())
+
+    expect = collect.Page(url, [], '"abc"', 'Mon, 01 Jan 2024 00:00:00 GMT', 'hash')
+    assert inst._parse(FetchResult(url, 304)) == expect
+
+
+def test_parse_002(dao):
+    """HTML解析(200 OK、前回とハッシュ値が一致)
+    正常ケース
+
+    expect:
+      単語を抽出せず、新しいETagで取得状態を更新する解析結果
+    """
+    url = 'http://example.com/a'
+    body = PAGE.format('a').encode()
+    MockCrawlState.rows = {url: {'etag': '"old"', 'last_modified': None,
+                                 'content_hash': hashlib.sha256(body).hexdigest()}}
+    inst = collect.Collector(urls=[url], crawler=MockCrawler())
+
+    result = inst._parse(FetchResult(url, 200, body, {'ETag': '"new"'}))
+    assert result == collect.Page(url, [], '"new"', None, hashlib.sha256(body).hexdigest())
+
+
+def test_parse_003(dao):
+    """HTML解析(200 OK、前回とハッシュ値が不一致)
+    正常ケース
+
+    expect:
+      単語を抽出し、新しいハッシュ値を持つ解析結果
+    """
+    url = 'http://example.com/a'
+    body = PAGE.format('b').encode()
+    MockCrawlState.rows = {url: {'etag': '"old"', 'last_modified': None,
+                                 'content_hash': hashlib.sha256(PAGE.format('a').encode()).hexdigest()}}
+    inst = collect.Collector(urls=[url], crawler=MockCrawler())
+
+    result = inst._parse(FetchResult(url, 200, body, {'ETag': '"new"'}))
+    assert result.words == [('b', 'bの日本語')]
+    assert result.etag == '"new"'
+    assert result.content_hash == hashlib.sha256(body).hexdigest()
+
+
+def test_checkpoint_001(dao):
+    """再開(完了済みURLあり)
+    正常ケース
+
+    expect:
+      完了済みURLは取得せず、チェックポイントを削除しない
+    """
+    MockCrawlCheckpoint.completed = {'http://example.com/a'}
+    crawler = MockCrawler()
+    inst = collect.Collector(urls=['http://example.com/a', 'http://example.com/b'],
+                             crawler=crawler, resume=True)
+    inst.collect(workers=1)
+
+    assert [url for url, _ in crawler.requested] == ['http://example.com/b']
+    assert inst._db_checkpoint.cleared is False
+    assert inst._db_checkpoint.checkpoints == [('http://example.com/b', 1)]
+
+
+def test_checkpoint_002(dao):
+    """新規実行(完了済みURLあり)
+    正常ケース
+
+    expect:
+      チェックポイントを削除し、全URLを取得する
+    """
+    MockCrawlCheckpoint.completed = {'http://example.com/a'}
+    crawler = MockCrawler()
+    inst = collect.Collector(urls=['http://example.com/a', 'http://example.com/b'],
+                             crawler=crawler)
+    inst.collect(workers=1)
+
+    assert inst._db_checkpoint.cleared is True
+    assert sorted(url for url, _ in crawler.requested) == ['http://example.com/a', 'http://example.com/b']
+
+
+def test_checkpoint_003(dao, monkeypatch):
+    """DB挿入(英単語の挿入に失敗)
+    エラーケース
+
+    expect:
+      取得状態、チェックポイントを記録しない(次回の再開時に再取得する)
+    """
+    def bulk_upsert(self, pairs):
+        raise collect.DbOperationError('error')
+    monkeypatch.setattr(MockWord, 'bulk_upsert', bulk_upsert)
+    inst = collect.Collector(urls=['http://example.com/a'], crawler=MockCrawler())
+    inst.collect(workers=1)
+
+    assert inst._db_crawl_state.states == []
+    assert inst._db_checkpoint.checkpoints == []
+
+
+def test_checkpoint_004(dao):
+    """チェックポイント(登録済みの英語、複数ページで同じ英語)
+    正常ケース
+
+    expect:
+      実際に挿入、更新した件数を記録し、同じ英語は後のページの件数とする
+    """
+    MockWord.registered = {'a': 'aの日本語'}
+    pages = {
+        'http://example.com/a': FetchResult('http://example.com/a', 200, PAGE.format('a').encode()),
+        'http://example.com/b': FetchResult('http://example.com/b', 200, PAGE.format('b').encode()),
+        'http://example.com/c': FetchResult('http://example.com/c', 200, PAGE.format('b').encode()),
+    }
+    inst = collect.Collector(urls=list(pages), crawler=MockCrawler(pages))
+    for url in pages:
+        inst._write(inst._parse(pages[url]))
+    inst._flush()
+
+    assert inst._db_checkpoint.checkpoints == [
+        ('http://example.com/a', 0), ('http://example.com/b', 0), ('http://example.com/c', 1)]
@@ -0,0 +1,198 @@
+"""pytest
+
+crawler.py
+"""
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+import time
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import crawler
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """ 検証用HTTPハンドラー """
+    hits = Counter()
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits[self.path] += 1
+            hits = cls.hits[self.path]
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            if self.path.startswith('/slow'):
+                time.sleep(1)
+            elif self.path.startswith('/track'):
+                time.sleep(0.05)
+            if self.path.startswith('/missing'):
+                self._send(404, b'')
+            elif self.path.startswith('/flaky') and hits <= 2:
+                self._send(503, b'')
+            elif self.path.startswith('/down'):
+                self._send(503, b'')
+            elif self.path.startswith('/etag') and self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, b'')
+            else:
+                self._send(200, f'<p class="eng">{self.path}</p>'.encode())
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def _send(self, status, body):
+        self.send_response(status)
+        if self.path.startswith('/etag'):
+            self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    FixtureHandler.hits.clear()
+    FixtureHandler.active = FixtureHandler.max_active = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_run_001(base_url):
+    """全URL取得
+    正常ケース
+
+    in:
+      100件のURL
+    expect:
+      全URLの本文が取得される
+    """
+    urls = [f'{base_url}/page/{i}' for i in range(100)]
+    results = crawler.Crawler(concurrency=16).run(urls)
+
+    assert sorted(result.url for result in results) == sorted(urls)
+    assert all(result.status == 200 for result in results)
+    assert results[0].body == f'<p class="eng">{results[0].url[len(base_url):]}</p>'.encode()
+
+
+def test_run_002(base_url):
+    """全URL取得(リトライ)
+    正常ケース
+
+    in:
+      2回目まで503を返却するURL
+    expect:
+      3回目で取得される
+    """
+    results = crawler.Crawler(retries=3, backoff=0.001).run([f'{base_url}/flaky/1'])
+
+    assert results[0].status == 200
+    assert FixtureHandler.hits['/flaky/1'] == 3
+
+
+def test_run_003(base_url):
+    """全URL取得(リトライ上限)
+    エラーケース
+
+    in:
+      常に503を返却するURL
+    expect:
+      リトライ回数+1回で打ち切り、503が返却される
+    """
+    results = crawler.Crawler(retries=2, backoff=0.001).run([f'{base_url}/down'])
+
+    assert results[0].status == 503
+    assert FixtureHandler.hits['/down'] == 3
+
+
+def test_run_004(base_url):
+    """全URL取得(リトライ対象外)
+    エラーケース
+
+    in:
+      404を返却するURL
+    expect:
+      リトライせずに404が返却される
+    """
+    results = crawler.Crawler(retries=3, backoff=0.001).run([f'{base_url}/missing'])
+
+    assert results[0].status == 404
+    assert FixtureHandler.hits['/missing'] == 1
+
+
+def test_run_005(base_url):
+    """全URL取得(読み込みタイムアウト)
+    エラーケース
+
+    in:
+      応答に1秒かかるURL(読み込みタイムアウト0.1秒)
+    expect:
+      ステータス0、エラー内容が返却される
+    """
+    results = crawler.Crawler(retries=0, read_timeout=0.1).run([f'{base_url}/slow'])
+
+    assert results[0].status == 0
+    assert results[0].error
+
+
+def test_run_006(base_url):
+    """全URL取得(ホストごとの同時接続数)
+    正常ケース
+
+    in:
+      20件のURL(全体16、ホストごと2)
+    expect:
+      同一ホストへの同時リクエストは2件まで
+    """
+    urls = [f'{base_url}/track/{i}' for i in range(20)]
+    results = crawler.Crawler(concurrency=16, per_host=2).run(urls)
+
+    assert len(results) == 20
+    assert FixtureHandler.max_active <= 2
+
+
+def test_run_007():
+    """全URL取得
+    正常ケース
+
+    in:
+      []
+    expect:
+      []
+    """
+    assert crawler.Crawler().run([]) == []
+
+
+def test_run_008(base_url):
+    """全URL取得(条件付きリクエスト)
+    正常ケース
+
+    in:
+      前回のETagがあるURL、ないURL
+    expect:
+      ETagがあるURLは304、ないURLは200とETagが返却される
+    """
+    known, new = f'{base_url}/etag/1', f'{base_url}/etag/2'
+    results = crawler.Crawler().run(
+        [known, new],
+        headers=lambda url: {'If-None-Match': '"v1"'} if url == known else None
+    )
+    statuses = {result.url: result for result in results}
+
+    assert statuses[known].status == 304
+    assert statuses[new].status == 200
+    assert statuses[new].headers['ETag'] == '"v1"'
@@ -0,0 +1,423 @@
+"""pytest
+
+dbaccess.py
+"""
+import os
+import threading
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import dbaccess
+
+
+class MockCursor(object):
+    """ カーソルモック """
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, data=None):
+        if self._conn.broken:
+            raise dbaccess.psycopg2.OperationalError()
+
+
+class MockConnection(object):
+    """ コネクションモック """
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = dbaccess.STATUS_READY
+
+    def cursor(self, *args, **kwargs):
+        return MockCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(dbaccess.psycopg2, 'connect', lambda **kwargs: MockConnection())
+    return dbaccess.ConnectionPool(minconn=1, maxconn=2, idle_timeout=60)
+
+
+def test_connection_pool_getconn_001(pool):
+    """コネクション貸し出し
+    正常ケース
+
+    expect:
+      返却されたコネクションが再利用される
+    """
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+
+
+def test_connection_pool_getconn_002(pool):
+    """コネクション貸し出し(ヘルスチェック)
+    正常ケース
+
+    expect:
+      ヘルスチェックに失敗したコネクションは破棄され、新規接続が返却される
+    """
+    conn = pool.getconn()
+    conn.broken = True
+    pool.putconn(conn)
+    result = pool.getconn()
+
+    assert result is not conn
+    assert conn.closed
+
+
+def test_connection_pool_getconn_003(pool):
+    """コネクション貸し出し(アイドルタイムアウト)
+    正常ケース
+
+    expect:
+      アイドルタイムアウトを超えたコネクションは破棄される
+    """
+    pool._idle_timeout = -1
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is not conn
+    assert conn.closed
+
+
+def test_connection_pool_getconn_004(pool):
+    """コネクション貸し出し(最大接続数)
+    正常ケース
+
+    expect:
+      最大接続数に達した場合は返却されるまで待機する
+    """
+    conns = [pool.getconn(), pool.getconn()]
+    result = []
+    thread = threading.Thread(target=lambda: result.append(pool.getconn()))
+    thread.start()
+    thread.join(0.1)
+
+    assert not result
+
+    pool.putconn(conns[0])
+    thread.join(1)
+
+    assert result == [conns[0]]
+
+
+def test_connection_pool_getconn_005(pool):
+    """コネクション貸し出し(待機タイムアウト)
+    エラーケース
+
+    in:
+      最大接続数まで貸し出し済み、待機タイムアウト0.05秒
+    expect:
+      DbOperationError
+    """
+    pool._checkout_timeout = 0.05
+    pool.getconn(), pool.getconn()
+
+    with pytest.raises(dbaccess.DbOperationError):
+        pool.getconn()
+
+
+def test_connection_pool_closeall_001(pool):
+    """全コネクション破棄
+    エラーケース
+
+    expect:
+      DbOperationError
+    """
+    pool.closeall()
+
+    with pytest.raises(dbaccess.DbOperationError):
+        pool.getconn()
+
+
+@pytest.fixture
+def shared_pool(monkeypatch, pool):
+    monkeypatch.setattr(dbaccess, '_POOL', pool)
+    monkeypatch.setattr(dbaccess, '_LOCAL', threading.local())
+    return pool
+
+
+def test_acquire_connection_001(shared_pool):
+    """リクエスト単位のコネクション貸し出し(切断済み)
+    正常ケース
+
+    expect:
+      切断済みのコネクションはプールに返却され、使用中の数が増えない
+    """
+    conn = dbaccess.acquire_connection()
+    conn.closed = 1
+    result = dbaccess.acquire_connection()
+
+    assert result is not conn
+    assert shared_pool._used == 1
+    dbaccess.release_connection()
+    assert shared_pool._used == 0
+
+
+def test_release_connection_001(shared_pool):
+    """リクエスト単位のコネクション返却(プール破棄後)
+    正常ケース
+
+    expect:
+      貸し出し元のプールに返却され、新しいプールは生成されない
+    """
+    conn = dbaccess.acquire_connection()
+    dbaccess.close_pool()
+    dbaccess.release_connection()
+
+    assert dbaccess._POOL is None
+    assert shared_pool._used == 0
+    assert conn.closed
+
+
+def test_migrations_001():
+    """マイグレーション定義
+    正常ケース
+
+    expect:
+      バージョンは1から連番で昇順
+    """
+    versions = [version for version, _ in dbaccess.MIGRATIONS]
+
+    assert versions == list(range(1, len(versions) + 1))
+
+
+def test_migrations_002():
+    """マイグレーション定義
+    正常ケース
+
+    expect:
+      全SQL文のテーブル名プレースホルダーがDATABASEで解決できる
+    """
+    columns = {t: ', '.join(c) for t, c in dbaccess.DATABASE.items()}
+
+    for _, statements in dbaccess.MIGRATIONS:
+        for sql in statements:
+            assert sql.format(**columns)
+
+
+@pytest.fixture(scope='module')
+def seeded_cursor():
+    """ 100万件の単語、アクティビティを投入した検証用スキーマのカーソル """
+    conn = dbaccess.psycopg2.connect(
+        host=os.environ['PSQL_HOST'],
+        dbname=os.environ['PSQL_DB_NAME'],
+        user=os.environ['PSQL_USER'],
+        password=os.environ['PSQL_PASSWORD'],
+    )
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute('DROP SCHEMA IF EXISTS explain_test CASCADE;')
+    cur.execute('CREATE SCHEMA explain_test;')
+    cur.execute('SET search_path TO explain_test;')
+    columns = {t: ', '.join(c) for t, c in dbaccess.DATABASE.items()}
+    for _, statements in dbaccess.MIGRATIONS:
+        for sql in statements:
+            cur.execute(sql.format(**columns))
+    # 未習得・ブックマークは全体の1%程度
+    cur.execute(
+        "INSERT INTO word (english, japanese, is_correct, bookmark) "
+        "SELECT 'english' || i, '日本語' || i, i % 100 <> 0, i % 100 = 1 "
+        "FROM generate_series(1, 1000000) AS i;")
+    # 約3年分、6種類のイベント
+    cur.execute(
+        "INSERT INTO activity (date, type, detail, event, word_id) "
+        "SELECT DATE '2018-01-01' + i % 1000, (i % 4 + 1)::text, 'english' || i || 'を習得しました', "
+        "i % 6 + 1, i FROM generate_series(1, 1000000) AS i;")
+    cur.execute('VACUUM ANALYZE word;')
+    cur.execute('VACUUM ANALYZE activity;')
+    yield cur
+    cur.execute('DROP SCHEMA explain_test CASCADE;')
+    conn.close()
+
+
+@pytest.mark.skipif('PSQL_HOST' not in os.environ, reason='PostgreSQL未接続')
+@pytest.mark.parametrize('sql, data', [
+    ('SELECT id, english, japanese, bookmark FROM word WHERE is_correct = FALSE;', None),
+    ('SELECT japanese FROM word WHERE is_correct = FALSE;', None),
+    ('SELECT id, english, japanese FROM word WHERE bookmark = TRUE;', None),
+    ('SELECT COUNT(*) FROM word WHERE bookmark = TRUE;', None),
+    (
+        'SELECT COUNT(date), date FROM activity '
+        'WHERE event = %s AND date >= %s AND date <= %s '
+        'GROUP BY date ORDER BY date;',
+        (dbaccess.Event().LEARNED, '2020-01-01', '2020-01-07')
+    ),
+])
+def test_migrations_003(seeded_cursor, sql, data):
+    """マイグレーション定義(インデックス)
+    正常ケース
+
+    in:
+      100万件を投入したword、activityテーブル
+    expect:
+      学習対象、ブックマーク、学習ログ集計のクエリがシーケンシャルスキャンしない
+    """
+    seeded_cursor.execute('EXPLAIN ' + sql, data)
+    plan = '\n'.join(row[0] for row in seeded_cursor.fetchall())
+
+    assert 'Seq Scan' not in plan
+
+
+@pytest.mark.skipif('PSQL_HOST' not in os.environ, reason='PostgreSQL未接続')
+def test_word_counter_001(seeded_cursor):
+    """ダッシュボード用カウンタ(トリガー)
+    正常ケース
+
+    in:
+      単語の登録、習得済み・ブックマーク更新、削除
+    expect:
+      word_counterテーブルがwordテーブルの集計値と一致する
+    """
+    cur = seeded_cursor
+    cur.execute("INSERT INTO word (english, japanese) VALUES ('counter', 'カウンタ');")
+    cur.execute("UPDATE word SET is_correct = TRUE, bookmark = TRUE WHERE english = 'counter';")
+    cur.execute('UPDATE word SET bookmark = FALSE WHERE id <= 1000;')
+    cur.execute('DELETE FROM word WHERE id <= 10;')
+
+    cur.execute(
+        'SELECT COUNT(*), COUNT(*) FILTER (WHERE is_correct), COUNT(*) FILTER (WHERE bookmark) '
+        'FROM word;')
+    expect = cur.fetchone()
+    cur.execute('SELECT total, is_correct, bookmark FROM word_counter WHERE id = 1;')
+
+    assert cur.fetchone() == expect
+
+
+@pytest.mark.skipif('PSQL_HOST' not in os.environ, reason='PostgreSQL未接続')
+@pytest.mark.parametrize('type_id, detail, expect_event, expect_word', [
+    ('0', 'english500000を習得しました', dbaccess.Event().LEARNED, True),
+    ('0', 'english500000を未習得に変更しました', dbaccess.Event().UNLEARNED, True),
+    ('3', 'english500000をブックマーク登録しました', dbaccess.Event().BOOKMARKED, True),
+    ('3', 'english500000をブックマーク解除しました', dbaccess.Event().UNBOOKMARKED, True),
+    ('1', '英語: english500000 日本語: 日本語500000 を登録しました', dbaccess.Event().REGISTERED, True),
+    ('2', 'deletedを削除しました', dbaccess.Event().DELETED, False),
+])
+def test_migrations_004(seeded_cursor, type_id, detail, expect_event, expect_word):
+    """マイグレーション定義(アクティビティのイベント種別補完)
+    正常ケース
+
+    in:
+      イベント種別、単語PKEYが未設定の既存アクティビティ
+    expect:
+      種別と詳細文からイベント種別、単語PKEYが補完される
+    """
+    cur = seeded_cursor
+    cur.execute(
+        "INSERT INTO activity (date, type, detail) VALUES ('2020-01-01', %s, %s) RETURNING id;",
+        (type_id, detail))
+    pkey = cur.fetchone()[0]
+    columns = {t: ', '.join(c) for t, c in dbaccess.DATABASE.items()}
+    for sql in dict(dbaccess.MIGRATIONS)[4]:
+        cur.execute(sql.format(**columns))
+    cur.execute(
+        "SELECT a.event, a.word_id = w.id FROM activity AS a "
+        "LEFT JOIN word AS w ON w.english = 'english500000' WHERE a.id = %s;", (pkey,))
+    event, matched = cur.fetchone()
+
+    assert event == expect_event
+    assert bool(matched) == expect_word
+
+
+@pytest.mark.skipif('PSQL_HOST' not in os.environ, reason='PostgreSQL未接続')
+def test_activity_daily_001(seeded_cursor):
+    """日別アクティビティ数(トリガー)
+    正常ケース
+
+    in:
+      アクティビティの挿入
+    expect:
+      activity_dailyテーブルがactivityテーブルの集計値と一致する
+    """
+    cur = seeded_cursor
+    cur.execute(
+        "INSERT INTO activity (date, type, detail, event) VALUES "
+        "('2030-01-01', '0', 'english1を習得しました', %s), "
+        "('2030-01-01', '0', 'english2を習得しました', %s);",
+        (dbaccess.Event().LEARNED, dbaccess.Event().LEARNED))
+
+    cur.execute(
+        "SELECT COUNT(*) FROM activity WHERE event = %s AND date = '2030-01-01';",
+        (dbaccess.Event().LEARNED,))
+    expect = cur.fetchone()[0]
+    cur.execute(
+        "SELECT count FROM activity_daily WHERE event = %s AND date = '2030-01-01';",
+        (dbaccess.Event().LEARNED,))
+
+    assert cur.fetchone()[0] == expect
+
+
+@pytest.fixture
+def empty_schema():
+    """ マイグレーションのみ適用した検証用スキーマ(リクエスト単位のコネクションで使用) """
+    conn = dbaccess.acquire_connection()
+    with conn.cursor() as cur:
+        cur.execute('DROP SCHEMA IF EXISTS dao_test CASCADE;')
+        cur.execute('CREATE SCHEMA dao_test;')
+        cur.execute('SET search_path TO dao_test;')
+        columns = {t: ', '.join(c) for t, c in dbaccess.DATABASE.items()}
+        for _, statements in dbaccess.MIGRATIONS:
+            for sql in statements:
+                cur.execute(sql.format(**columns))
+    conn.commit()
+    yield conn
+    with conn.cursor() as cur:
+        cur.execute('SET search_path TO DEFAULT;')
+        cur.execute('DROP SCHEMA dao_test CASCADE;')
+    conn.commit()
+    dbaccess.release_connection()
+
+
+@pytest.mark.skipif('PSQL_HOST' not in os.environ, reason='PostgreSQL未接続')
+def test_bulk_upsert_001(empty_schema):
+    """一括挿入(同じ英語の重複)
+    正常ケース
+
+    in:
+      [('apple', 'りんご'), ('pear', 'なし'), ('apple', '林檎')]、1文あたり2件
+    expect:
+      後の日本語で1件のみ挿入される
+    """
+    word = dbaccess.Word()
+    written = word.bulk_upsert([('apple', 'りんご'), ('pear', 'なし'), ('apple', '林檎')], batch_size=2)
+    word.cur.execute('SELECT english, japanese FROM word ORDER BY english;')
+
+    assert sorted(written) == ['apple', 'pear']
+    assert [tuple(row) for row in word.cur.fetchall()] == [('apple', '林檎'), ('pear', 'なし')]
+
+
+@pytest.mark.skipif('PSQL_HOST' not in os.environ, reason='PostgreSQL未接続')
+def test_bulk_upsert_002(empty_schema):
+    """一括挿入(登録済みの英語)
+    正常ケース
+
+    in:
+      登録済み(習得済み)の英語を含む一覧
+    expect:
+      日本語のみ更新され(PKEY、習得フラグは維持)、日本語が変わらない行は更新しない
+    """
+    word = dbaccess.Word()
+    word.bulk_upsert([('apple', 'りんご'), ('pear', 'なし')])
+    word.cur.execute("UPDATE word SET is_correct = TRUE WHERE english = 'apple' RETURNING id;")
+    pkey = word.cur.fetchone()[0]
+    word.conn.commit()
+
+    written = word.bulk_upsert([('apple', '林檎'), ('pear', 'なし'), ('peach', 'もも')])
+    word.cur.execute("SELECT id, japanese, is_correct FROM word WHERE english = 'apple';")
+
+    assert sorted(written) == ['apple', 'peach']
+    assert tuple(word.cur.fetchone()) == (pkey, '林檎', True)
@@ -0,0 +1,127 @@
+"""pytest
+
+dbaccess_writer.py
+"""
+import os
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import dbaccess
+from module import dbaccess_writer
+
+
+def test_activity_writer_001():
+    """アクティビティ非同期書き込み
+    正常ケース
+
+    in:
+      5件のアクティビティ(最大2件ずつ書き込み)
+    expect:
+      2件、2件、1件に分けて書き込まれ、詳細が組み立てられる
+    """
+    batches = []
+    writer = dbaccess_writer.ActivityWriter(flush_interval=60, flush_size=2, write=batches.append)
+    activity = dbaccess.ActivityRecord('2020-10-01', 0, dbaccess.Event().LEARNED, suffix='を習得しました')
+    details = [writer.put(activity, i, f'english{i}') for i in range(5)]
+    writer.close()
+
+    assert details[0] == 'english0を習得しました'
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    assert batches[0][0] == ('2020-10-01', 0, 'english0を習得しました', dbaccess.Event().LEARNED, 0)
+
+
+def test_activity_writer_002():
+    """アクティビティ非同期書き込み(書き込み間隔)
+    正常ケース
+
+    expect:
+      最大件数に満たなくても書き込み間隔の経過後に書き込まれる
+    """
+    batches = []
+    writer = dbaccess_writer.ActivityWriter(flush_interval=0.01, flush_size=100, write=batches.append)
+    writer.put(dbaccess.ActivityRecord('2020-10-01', 2, dbaccess.Event().DELETED), 1, 'english')
+    writer.flush()
+
+    assert len(batches) == 1
+    writer.close()
+
+
+def test_activity_writer_003():
+    """アクティビティ非同期書き込み(キュー満杯)
+    正常ケース
+
+    expect:
+      キューが満杯の場合は呼び出し元のスレッドで書き込まれる
+    """
+    blocked = threading.Event()
+    calls = []
+    conn = object()
+
+    def write(rows, conn=None):
+        calls.append((threading.current_thread(), conn))
+        if threading.current_thread() is not threading.main_thread():
+            blocked.wait(1)
+
+    writer = dbaccess_writer.ActivityWriter(flush_interval=0, flush_size=1, queue_size=1, write=write)
+    activity = dbaccess.ActivityRecord('2020-10-01', 2, dbaccess.Event().DELETED)
+    for i in range(3):
+        writer.put(activity, i, 'english', conn)
+    blocked.set()
+    writer.close()
+
+    # 呼び出し元のコネクションで書き込み、プールから別のコネクションを借りない
+    assert (threading.current_thread(), conn) in calls
+
+
+def test_activity_writer_004():
+    """アクティビティ非同期書き込み(書き込み失敗)
+    エラーケース
+
+    in:
+      2回目まで失敗する書き込み
+    expect:
+      再試行され、同じ行が書き込まれる
+    """
+    attempts, batches = [], []
+
+    def write(rows):
+        attempts.append(rows)
+        if len(attempts) <= 2:
+            raise dbaccess.DbOperationError()
+        batches.append(rows)
+
+    writer = dbaccess_writer.ActivityWriter(flush_interval=0, flush_size=10, write=write, backoff=0.001)
+    writer.put(dbaccess.ActivityRecord('2020-10-01', 2, dbaccess.Event().DELETED), 1, 'english')
+    writer.close()
+
+    assert len(attempts) == 3
+    assert batches == [attempts[0]]
+
+
+def test_activity_writer_005(caplog):
+    """アクティビティ非同期書き込み(再試行上限)
+    エラーケース
+
+    in:
+      常に失敗する書き込み(再試行2回)
+    expect:
+      3回試行後、行の内容がエラーログに出力され、以降のアクティビティも書き込まれる
+    """
+    attempts = []
+
+    def write(rows):
+        attempts.append(rows)
+        if rows[0][4] == 1:
+            raise dbaccess.DbOperationError()
+
+    writer = dbaccess_writer.ActivityWriter(
+        flush_interval=0, flush_size=1, write=write, retries=2, backoff=0.001)
+    activity = dbaccess.ActivityRecord('2020-10-01', 2, dbaccess.Event().DELETED)
+    writer.put(activity, 1, 'lost')
+    writer.flush()
+    writer.put(activity, 2, 'english')
+    writer.close()
+
+    assert [rows[0][4] for rows in attempts] == [1, 1, 1, 2]
+    assert 'lost' in caplog.text
@@ -0,0 +1,110 @@
+"""pytest
+
+extract.py
+"""
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from module import extract
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@pytest.mark.parametrize('input, expect', [
+    (
+        '<p class="eng">apple</p><p class="jap">りんご</p>'
+        '<p class="eng">go</p><p class="jap">行く</p>',
+        [('apple', 'りんご'), ('go', '行く')]
+    ),
+    (
+        '<td class="eng"><a href="/go">go <b>home</b></a></td><!-- note -->'
+        '<td class="jap word">家に帰る</td>',
+        [('go home', '家に帰る')]
+    ),
+    (
+        '<p class="eng">apple</p><p class="eng">go</p><p class="jap">りんご</p>',
+        [('apple', 'りんご')]
+    ),
+    ('<p class="english">apple</p><p class="japanese">りんご</p>', []),
+])
+def test_iter_pairs_001(input, expect):
+    """英語、日本語の組を逐次抽出
+    正常ケース
+    """
+    assert list(extract.iter_pairs(f'<html><body>{input}</body></html>'.encode())) == expect
+
+
+def test_iter_pairs_002():
+    """英語、日本語の組を逐次抽出(文字コード)
+    正常ケース
+
+    in:
+      <meta charset="shift_jis">を指定したShift_JISのHTML
+    expect:
+      [('apple', 'りんご')]
+    """
+    body = '<html><head><meta charset="shift_jis"></head><body>'\
+        '<p class="eng">apple</p><p class="jap">りんご</p></body></html>'.encode('shift_jis')
+
+    assert list(extract.iter_pairs(body)) == [('apple', 'りんご')]
+
+
+@pytest.mark.parametrize('input', [
+    (b''),
+    (None),
+])
+def test_iter_pairs_003(input):
+    """英語、日本語の組を逐次抽出
+    エラーケース
+
+    expect:
+      []
+    """
+    assert list(extract.iter_pairs(input)) == []
+
+
+@pytest.mark.parametrize('input', [
+    ('glossary_small.html'),
+    ('glossary_large.html'),
+])
+def test_iter_pairs_004(input):
+    """英語、日本語の組を逐次抽出
+    正常ケース
+
+    in:
+      保存済みページ
+    expect:
+      BeautifulSoupで全体を解析した結果と一致する
+    """
+    with open(os.path.join(FIXTURES, input), 'rb') as file:
+        body = file.read()
+    bs_obj = BeautifulSoup(body, 'lxml')
+    expect = list(zip(
+        [i.text for i in bs_obj.find_all(class_='eng')],
+        [i.text for i in bs_obj.find_all(class_='jap')]
+    ))
+
+    assert list(extract.iter_pairs(body)) == expect
+
+
+def test_extract_words_001():
+    """登録対象の英語、日本語の組を抽出
+    正常ケース
+
+    in:
+      英語、英語以外、前後に空白のある英語
+    expect:
+      英語以外は除外され、英語の前後の空白は除去される
+    """
+    body = '<html><body>'\
+        '<p class="eng"> apple </p><p class="jap">りんご</p>'\
+        '<p class="eng">林檎</p><p class="jap">りんご</p>'\
+        '<p class="eng">go home</p><p class="jap">家に帰る</p>'\
+        '</body></html>'.encode()
+
+    assert extract.extract_words(body) == [('apple', 'りんご'), ('go home', '家に帰る')]
@@ -0,0 +1,100 @@
+"""pytest
+
+middleware.py
+"""
+import gzip
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import middleware
+
+
+BODY = b'[' + b', '.join(b'{"id": %d, "english": "english"}' % i for i in range(100)) + b']'
+
+
+def call(app, accept_encoding='gzip'):
+    """WSGI呼び出し
+
+    @return (ステータスコード, レスポンスヘッダー, ボディ)
+    """
+    result = {}
+
+    def start_response(status, headers, exc_info=None):
+        result['status'] = status
+        result['headers'] = dict(headers)
+
+    environ = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding else {}
+    body = b''.join(app(environ, start_response))
+    return result['status'], result['headers'], body
+
+
+def json_app(body, content_type='application/json', stream=False):
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', content_type)])
+        if stream:
+            return iter([body[:10], body[10:]])
+        return [body]
+    return app
+
+
+@pytest.fixture
+def metrics():
+    return middleware.CompressionMetrics()
+
+
+def test_call_001(metrics):
+    """圧縮
+    正常ケース
+
+    expect:
+      gzip圧縮され、Content-Length、Content-Encoding、Varyが設定される
+    """
+    app = middleware.CompressionMiddleware(json_app(BODY), min_size=100, metrics=metrics)
+    status, headers, body = call(app)
+
+    assert status == '200 OK'
+    assert gzip.decompress(body) == BODY
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert headers['Content-Length'] == str(len(body))
+    assert metrics.snapshot()['responses'] == 1
+    assert metrics.snapshot()['ratio'] < 1
+
+
+def test_call_002(metrics):
+    """圧縮(ストリーミング)
+    正常ケース
+
+    expect:
+      逐次gzip圧縮され、Content-Lengthは設定されない
+    """
+    app = middleware.CompressionMiddleware(
+        json_app(BODY, stream=True), min_size=100, metrics=metrics)
+    _, headers, body = call(app)
+
+    assert gzip.decompress(body) == BODY
+    assert 'Content-Length' not in headers
+    assert metrics.snapshot()['bytes_in'] == len(BODY)
+
+
+@pytest.mark.parametrize('input_01, input_02, input_03', [
+    (BODY[:50], 'application/json', 'gzip'),
+    (BODY, 'text/css', 'gzip'),
+    (BODY, 'application/json', 'identity'),
+    (BODY, 'application/json', None),
+])
+def test_call_003(metrics, input_01, input_02, input_03):
+    """圧縮しないケース(小さいボディ、対象外のコンテンツタイプ、gzip非対応)
+    正常ケース
+
+    expect:
+      ボディはそのまま返却される
+    """
+    app = middleware.CompressionMiddleware(
+        json_app(input_01, input_02), min_size=100, metrics=metrics)
+    _, headers, body = call(app, input_03)
+
+    assert body == input_01
+    assert 'Content-Encoding' not in headers
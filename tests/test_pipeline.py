@@ -0,0 +1,159 @@
+"""pytest
+
+pipeline.py
+"""
+import os
+import threading
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import pipeline
+
+
+def test_run_001():
+    """実行
+    正常ケース
+
+    in:
+      0〜99 → 2倍(4スレッド) → 収集
+    expect:
+      全件が処理され、各ステージの処理件数が記録される
+    """
+    result = []
+    stats = pipeline.Pipeline(queue_size=4)\
+        .stage('double', lambda i: i * 2, threads=4)\
+        .stage('collect', result.append)\
+        .run('source', range(100))
+
+    assert sorted(result) == [i * 2 for i in range(100)]
+    assert [(s.name, s.processed, s.errors) for s in stats] == [
+        ('source', 100, 0), ('double', 100, 0), ('collect', 100, 0)
+    ]
+
+
+def test_run_002():
+    """実行(Noneは下流に渡さない)
+    正常ケース
+
+    in:
+      0〜9 → 偶数のみ → 収集
+    expect:
+      [0, 2, 4, 6, 8]
+    """
+    result = []
+    pipeline.Pipeline()\
+        .stage('even', lambda i: i if i % 2 == 0 else None)\
+        .stage('collect', result.append)\
+        .run('source', range(10))
+
+    assert result == [0, 2, 4, 6, 8]
+
+
+def test_run_003():
+    """実行(エラー)
+    エラーケース
+
+    in:
+      0〜9 → 5で例外 → 収集
+    expect:
+      例外の1件のみ除外され、エラー件数が記録される
+    """
+    result = []
+
+    def func(i):
+        if i == 5:
+            raise ValueError()
+        return i
+
+    stats = pipeline.Pipeline()\
+        .stage('func', func)\
+        .stage('collect', result.append)\
+        .run('source', range(10))
+
+    assert result == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+    assert stats[1].errors == 1
+
+
+def test_run_004():
+    """実行(終了処理)
+    正常ケース
+
+    expect:
+      全件処理後にclose関数が1回呼び出される
+    """
+    buffer, written = [], []
+
+    def flush():
+        written.append(list(buffer))
+
+    pipeline.Pipeline()\
+        .stage('buffer', buffer.append, threads=3, close=flush)\
+        .run('source', range(10))
+
+    assert len(written) == 1
+    assert sorted(written[0]) == list(range(10))
+
+
+def test_run_005():
+    """実行(バックプレッシャー)
+    正常ケース
+
+    in:
+      キュー上限2、最終ステージが停止中
+    expect:
+      ソースはキュー上限を超えて読み進めない
+    """
+    produced = []
+    release = threading.Event()
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    def sink(i):
+        release.wait(5)
+
+    inst = pipeline.Pipeline(queue_size=2).stage('pass', lambda i: i).stage('sink', sink)
+    thread = threading.Thread(target=inst.run, args=('source', source()))
+    thread.start()
+    thread.join(0.2)
+
+    # キュー2本 × 上限2件 + 各ステージで処理中の1件 + ソースでput待ちの1件
+    assert len(produced) <= 2 * 2 + 2 + 1
+    assert inst.stats()[0].name == 'source'
+
+    release.set()
+    thread.join(5)
+    assert len(produced) == 100
+
+
+def test_run_006():
+    """実行(進捗通知)
+    正常ケース
+
+    expect:
+      実行中に統計が通知される
+    """
+    progress = []
+    release = threading.Event()
+    threading.Timer(0.05, release.set).start()
+
+    pipeline.Pipeline()\
+        .stage('wait', lambda i: release.wait(5))\
+        .run('source', range(1), on_progress=progress.append, interval=0.01)
+
+    assert progress
+    assert [s.name for s in progress[0]] == ['source', 'wait']
+
+
+def test_stage_001():
+    """ステージ追加(スレッド数0)
+    エラーケース
+
+    expect:
+      ValueError(実行せずに停止しない)
+    """
+    with pytest.raises(ValueError):
+        pipeline.Pipeline().stage('parse', lambda i: i, threads=0)
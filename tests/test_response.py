@@ -0,0 +1,268 @@
+"""pytest
+
+response.py
+"""
+import json
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import response
+
+
+class TestResponseBase(object):
+    """ レスポンス基底 """
+    def setup(self):
+        self.inst = response.ResponseBase('application/json', 'body')
+
+    def test_status_001(self):
+        """ステータスコード
+        正常ケース
+
+        in:
+          '200 OK'
+        expect:
+          '200 OK'
+        """
+        assert self.inst.status == '200 OK'
+
+    def test_content_type_001(self):
+        """コンテンツタイプ
+        正常ケース
+
+        in:
+          'application/json'
+        expect:
+          'application/json'
+        """
+        assert self.inst.content_type == 'application/json'
+
+    def test_body_001(self):
+        """ボディ
+        正常ケース
+
+        in:
+          'body'
+        expect:
+          'body'
+        """
+        assert self.inst.body == 'body'
+
+
+class TestHtmlResponse(object):
+    """ HTMLレスポンス """
+    def setup(self):
+        self.inst = response.HtmlResponse('body')
+
+    def test_status_001(self):
+        """ステータスコード
+        正常ケース
+
+        in:
+          '200 OK'
+        expect:
+          '200 OK'
+        """
+        assert self.inst.status == '200 OK'
+
+    def test_content_type_001(self):
+        """コンテンツタイプ
+        正常ケース
+
+        in:
+          'text/html'
+        expect:
+          'text/html'
+        """
+        assert self.inst.content_type == 'text/html'
+
+    def test_body_001(self):
+        """ボディ
+        正常ケース
+
+        in:
+          'body'
+        expect:
+          'body'
+        """
+        assert self.inst.body == 'body'
+
+
+class TestStaticResponse(object):
+    """ 静的データレスポンス """
+    def setup(self):
+        self.inst = response.StaticResponse('static/js/component.js', 'js')
+
+    def test_status_001(self):
+        """ステータスコード
+        正常ケース
+
+        in:
+          '200 OK'
+        expect:
+          '200 OK'
+        """
+        assert self.inst.status == '200 OK'
+
+    def test_content_type_001(self):
+        """コンテンツタイプ
+        正常ケース
+
+        in:
+          'text/javascript'
+        expect:
+          'text/javascript'
+        """
+        assert self.inst.content_type == 'text/javascript'
+
+    def test_body_001(self):
+        """ボディ
+        正常ケース
+
+        in:
+          'static/js/component.js'
+        expect:
+          JSコード(バイト列)
+        """
+        with open('static/js/component.js', 'rb') as file:
+            assert self.inst.body == file.read()
+
+    def test_headers_001(self):
+        """レスポンスヘッダー
+        正常ケース
+
+        expect:
+          ETag、Last-Modified、Cache-Control、Vary
+        """
+        assert [name for name, _ in self.inst.headers] ==\
+            ['ETag', 'Last-Modified', 'Cache-Control', 'Vary']
+
+    def test_not_modified_001(self):
+        """条件付きリクエスト(If-None-Match)
+        正常ケース
+
+        in:
+          {'HTTP_IF_NONE_MATCH': <ETag>}
+        expect:
+          '304 Not Modified'、空のボディ
+        """
+        etag = dict(self.inst.headers)['ETag']
+        result = response.StaticResponse(
+            'static/js/component.js', 'js', {'HTTP_IF_NONE_MATCH': etag})
+
+        assert result.status == '304 Not Modified'
+        assert result.body == b''
+
+    def test_not_modified_002(self):
+        """条件付きリクエスト(If-Modified-Since)
+        正常ケース
+
+        in:
+          {'HTTP_IF_MODIFIED_SINCE': <Last-Modified>}
+        expect:
+          '304 Not Modified'、空のボディ
+        """
+        last_modified = dict(self.inst.headers)['Last-Modified']
+        result = response.StaticResponse(
+            'static/js/component.js', 'js', {'HTTP_IF_MODIFIED_SINCE': last_modified})
+
+        assert result.status == '304 Not Modified'
+        assert result.body == b''
+
+    def test_not_modified_003(self):
+        """条件付きリクエスト(ETag不一致)
+        正常ケース
+
+        in:
+          {'HTTP_IF_NONE_MATCH': '"stale"'}
+        expect:
+          '200 OK'
+        """
+        result = response.StaticResponse(
+            'static/js/component.js', 'js', {'HTTP_IF_NONE_MATCH': '"stale"'})
+
+        assert result.status == '200 OK'
+
+
+class TestJsonResponse(object):
+    """ JSONレスポンス """
+    def setup(self):
+        self.inst = response.JsonResponse({'id': 10})
+
+    def test_status_001(self):
+        """ステータスコード
+        正常ケース
+
+        in:
+          '200 OK'
+        expect:
+          '200 OK'
+        """
+        assert self.inst.status == '200 OK'
+
+    def test_content_type_001(self):
+        """コンテンツタイプ
+        正常ケース
+
+        in:
+          'application/json'
+        expect:
+          'application/json'
+        """
+        assert self.inst.content_type == 'application/json'
+
+    def test_body_001(self):
+        """ボディ
+        正常ケース
+
+        in:
+          {'id': 10}
+        expect:
+          '{"id": 10}'
+        """
+        assert self.inst.body == b'{"id": 10}'
+
+
+class TestStreamingJsonResponse(object):
+    """ JSONレスポンス(ストリーミング) """
+    rows = [{'id': i, 'english': 'english', 'japanese': '日本語'} for i in range(3000)]
+
+    def test_body_001(self):
+        """ボディ(JSON配列)
+        正常ケース
+
+        expect:
+          json.dumpsと同じ結果を複数のチャンクで返却
+        """
+        result = response.StreamingJsonResponse(iter(self.rows))
+        chunks = list(result.body)
+
+        assert result.content_type == 'application/json'
+        assert len(chunks) > 1
+        assert b''.join(chunks) == json.dumps(self.rows).encode()
+
+    def test_body_002(self):
+        """ボディ(NDJSON)
+        正常ケース
+
+        expect:
+          1行1JSON
+        """
+        result = response.StreamingJsonResponse(iter(self.rows), ndjson=True)
+        lines = b''.join(result.body).decode().splitlines()
+
+        assert result.content_type == 'application/x-ndjson'
+        assert [json.loads(line) for line in lines] == self.rows
+
+    @pytest.mark.parametrize('input_01, input_02', [
+        (False, b'[]'),
+        (True, b''),
+    ])
+    def test_body_003(self, input_01, input_02):
+        """ボディ(0件)
+        正常ケース
+        """
+        result = response.StreamingJsonResponse(iter([]), ndjson=input_01)
+
+        assert b''.join(result.body) == input_02
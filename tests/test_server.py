@@ -0,0 +1,418 @@
+"""pytest
+
+server.py
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import json
+from io import BytesIO
+import logging
+import os
+import pytest
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import server
+from module import response
+from module import dbaccess
+from module import middleware
+from module import urls
+
+
+def call_wsgi(method, path, body=b''):
+    """WSGI呼び出し
+
+    @return (ステータスコード, コンテンツタイプ, ボディ)
+    """
+    result = {}
+
+    def start_response(status, headers):
+        result['status'] = int(status.split(' ', 1)[0])
+        result['headers'] = dict(headers)
+
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': BytesIO(body),
+    }
+    chunks = server.run(environ, start_response)
+    return result['status'], result['headers']['Content-Type'], b''.join(chunks)
+
+
+def call_asgi(method, path, body=b''):
+    """ASGI呼び出し
+
+    @return (ステータスコード, コンテンツタイプ, ボディ)
+    """
+    sent = []
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'content-type', b'application/json')],
+    }
+    asyncio.run(server.run_async(scope, receive, send))
+    headers = dict(sent[0]['headers'])
+    body = b''.join(m.get('body', b'') for m in sent[1:])
+    return sent[0]['status'], headers[b'content-type'].decode(), body
+
+
+@pytest.fixture(autouse=True)
+def sync_dispatch(monkeypatch):
+    # APIはdispatch_apiのモックで検証する(非同期ドライバ用ビューを経由しない)
+    monkeypatch.setattr(urls, 'ASYNC_DB', False)
+
+
+@pytest.fixture(params=[call_wsgi, call_asgi], ids=['wsgi', 'asgi'])
+def call(request):
+    return request.param
+
+
+def test_run_001(call, monkeypatch):
+    """API(GET)
+    正常ケース
+
+    in:
+      '/learning'
+    expect:
+      200, 'application/json', b'{"id": 10}'
+    """
+    def mock_dispatch_api(path, req_data):
+        return response.JsonResponse({'id': 10})
+
+    monkeypatch.setattr(urls, 'dispatch_api', mock_dispatch_api)
+    assert call('GET', '/learning') == (200, 'application/json', b'{"id": 10}')
+
+
+def test_run_002(call, monkeypatch):
+    """API(POST)
+    正常ケース
+
+    in:
+      '/update/is_correct', b'{"pkey": "1", "flag": "TRUE"}'
+    expect:
+      リクエストボディがビューに渡される
+    """
+    def mock_dispatch_api(path, req_data):
+        data = req_data.get('wsgi.input').read(int(req_data.get('CONTENT_LENGTH', 0)))
+        return response.JsonResponse({'msg': data.decode()})
+
+    monkeypatch.setattr(urls, 'dispatch_api', mock_dispatch_api)
+    status, _, body = call('POST', '/update/is_correct', b'{"pkey": "1", "flag": "TRUE"}')
+
+    assert status == 200
+    assert body == b'{"msg": "{\\"pkey\\": \\"1\\", \\"flag\\": \\"TRUE\\"}"}'
+
+
+def test_run_003(call):
+    """静的ファイル
+    正常ケース
+
+    in:
+      '/static/css/component.css'
+    expect:
+      200, 'text/css', CSSコード
+    """
+    with open('static/css/component.css', 'rb') as file:
+        assert call('GET', '/static/css/component.css') == (200, 'text/css', file.read())
+
+
+def test_run_004(call):
+    """静的ファイル
+    エラーケース
+
+    in:
+      '/static/js/NotFound.js'
+    expect:
+      404
+    """
+    status, content_type, _ = call('GET', '/static/js/NotFound.js')
+
+    assert (status, content_type) == (404, 'text/html')
+
+
+def test_run_005(monkeypatch):
+    """静的ファイル(gzip)
+    正常ケース
+
+    in:
+      '/static/js/html2canvas.js', 'Accept-Encoding: gzip'
+    expect:
+      圧縮済みデータ、Content-Encoding: gzip、Vary: Accept-Encoding
+    """
+    result = {}
+
+    def start_response(status, headers):
+        result['headers'] = dict(headers)
+
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/static/js/html2canvas.js',
+        'HTTP_ACCEPT_ENCODING': 'gzip',
+    }
+    body = b''.join(server.run(environ, start_response))
+
+    with open('static/js/html2canvas.js', 'rb') as file:
+        assert gzip.decompress(body) == file.read()
+    assert result['headers']['Content-Encoding'] == 'gzip'
+    assert result['headers']['Vary'] == 'Accept-Encoding'
+
+
+def test_run_006(call, monkeypatch):
+    """API(ストリーミング)
+    正常ケース
+
+    in:
+      '/english_list?stream=json'
+    expect:
+      Content-Lengthなしで全チャンクが送信される
+    """
+    rows = [{'id': i} for i in range(10000)]
+
+    def mock_dispatch_api(path, req_data):
+        return response.StreamingJsonResponse(iter(rows))
+
+    monkeypatch.setattr(urls, 'dispatch_api', mock_dispatch_api)
+    assert call('GET', '/english_list') == (200, 'application/json', json.dumps(rows).encode())
+
+
+def test_run_007():
+    """静的ファイル(条件付きリクエスト)
+    正常ケース
+
+    in:
+      '/static/js/html2canvas.js'、'Accept-Encoding: gzip'、If-None-Match: <ETag>
+    expect:
+      304、ETag、Last-Modified、Cache-Control、Varyのみ(Content-Length、Content-Encoding等なし)
+    """
+    result = {}
+
+    def start_response(status, headers):
+        result['status'] = status
+        result['headers'] = headers
+
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/static/js/html2canvas.js',
+        'HTTP_ACCEPT_ENCODING': 'gzip',
+    }
+    server.run(environ, start_response)
+    etag = dict(result['headers'])['ETag']
+    body = b''.join(server.run(dict(environ, HTTP_IF_NONE_MATCH=etag), start_response))
+
+    assert result['status'] == '304 Not Modified'
+    assert [name for name, _ in result['headers']] ==\
+        ['ETag', 'Last-Modified', 'Cache-Control', 'Vary']
+    assert body == b''
+
+
+def test_application_001(monkeypatch):
+    """WSGIアプリケーション(HEAD、gzip)
+    正常ケース
+
+    in:
+      HEAD '/english_list'、'Accept-Encoding: gzip'
+    expect:
+      GETと同じヘッダー(Content-Encoding: gzip、圧縮後のContent-Length)、空のボディ
+    """
+    rows = [{'id': i, 'english': 'english'} for i in range(100)]
+
+    def mock_dispatch_api(path, req_data):
+        return response.JsonResponse(rows)
+
+    monkeypatch.setattr(urls, 'dispatch_api', mock_dispatch_api)
+    result = {}
+
+    def call(method):
+        def start_response(status, headers, exc_info=None):
+            result[method] = dict(headers)
+
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': '/english_list',
+            'HTTP_ACCEPT_ENCODING': 'gzip',
+        }
+        return b''.join(server.application(environ, start_response))
+
+    get_body = call('GET')
+    head_body = call('HEAD')
+
+    assert head_body == b''
+    assert result['HEAD']['Content-Encoding'] == 'gzip'
+    assert result['HEAD']['Content-Length'] == result['GET']['Content-Length']
+    assert int(result['GET']['Content-Length']) == len(get_body)
+
+
+def test_run_async_001(monkeypatch):
+    """ASGI(コネクションプールの最大接続数を超える同時ストリーミング)
+    正常ケース
+
+    in:
+      最大接続数2、DB処理スレッド2、同時ストリーミング4件
+    expect:
+      デッドロックせず、全件が送信される
+    """
+    monkeypatch.setattr(dbaccess.psycopg2, 'connect', lambda **kwargs: MockConnection())
+    pool = dbaccess.ConnectionPool(minconn=0, maxconn=2, idle_timeout=60, checkout_timeout=5)
+    monkeypatch.setattr(urls, 'DB_EXECUTOR', ThreadPoolExecutor(max_workers=2))
+    pad = 'x' * response.STREAM_CHUNK_SIZE
+
+    def rows():
+        # サーバサイドカーソルと同様に、読み終えるまでコネクションを保持する
+        conn = pool.getconn()
+        try:
+            for i in range(3):
+                yield {'id': i, 'pad': pad}
+        finally:
+            pool.putconn(conn)
+
+    def mock_dispatch_api(path, req_data):
+        return response.StreamingJsonResponse(rows())
+
+    monkeypatch.setattr(urls, 'dispatch_api', mock_dispatch_api)
+
+    async def stream():
+        sent = []
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+            await asyncio.sleep(0.01)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/english_list', 'headers': []}
+        await server.run_async(scope, receive, send)
+        return b''.join(m.get('body', b'') for m in sent[1:])
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(*(stream() for _ in range(4))), 10)
+
+    expect = json.dumps([{'id': i, 'pad': pad} for i in range(3)]).encode()
+    assert asyncio.run(main()) == [expect] * 4
+
+
+class MockCursor(object):
+    """ カーソルモック """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, data=None):
+        pass
+
+
+class MockConnection(object):
+    """ コネクションモック """
+    closed = 0
+    status = dbaccess.STATUS_READY
+
+    def cursor(self, *args, **kwargs):
+        return MockCursor()
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+def test_process_request_001(monkeypatch):
+    """リクエスト割り当て(受け付け済みリクエスト数の上限)
+    正常ケース
+
+    in:
+      ワーカースレッド数1、スレッドあたりの上限2、リクエスト3件
+    expect:
+      3件目は処理中のリクエストが完了するまで割り当てない(acceptしない)
+    """
+    release = threading.Event()
+    handled = []
+
+    def mock_finish_request(request, client_address):
+        release.wait()
+        handled.append(request)
+
+    httpd = server.ThreadPoolWSGIServer(
+        ('127.0.0.1', 0), server.WSGIRequestHandler, threads=1, requests_per_thread=2)
+    monkeypatch.setattr(httpd, 'finish_request', mock_finish_request)
+    monkeypatch.setattr(httpd, 'shutdown_request', lambda request: None)
+    try:
+        httpd.process_request(1, None)
+        httpd.process_request(2, None)
+        third = threading.Thread(target=httpd.process_request, args=(3, None))
+        third.start()
+        third.join(0.2)
+        assert third.is_alive()
+
+        release.set()
+        third.join(5)
+        assert not third.is_alive()
+    finally:
+        httpd.server_close()
+
+    assert handled == [1, 2, 3]
+
+
+def test_serve_forever_001(monkeypatch):
+    """リクエスト待ち受けの終了処理
+    正常ケース
+
+    expect:
+      受け付け終了(処理中のリクエストの完了待ち)の後にアクティビティを書き出す
+    """
+    calls = []
+
+    class MockServer(object):
+        def serve_forever(self):
+            raise KeyboardInterrupt()
+
+        def server_close(self):
+            calls.append('server_close')
+
+    monkeypatch.setattr(server, 'close_activity_writer', lambda: calls.append('close_writer'))
+    server._serve_forever(MockServer())
+
+    assert calls == ['server_close', 'close_writer']
+
+
+def test_serve_forever_002(monkeypatch, caplog):
+    """リクエスト待ち受けの終了処理(圧縮メトリクス)
+    正常ケース
+
+    expect:
+      終了時に圧縮メトリクスをログに出力する
+    """
+    class MockServer(object):
+        def serve_forever(self):
+            raise KeyboardInterrupt()
+
+        def server_close(self):
+            pass
+
+    metrics = middleware.CompressionMetrics()
+    metrics.record(1000, 250, 0.5)
+    monkeypatch.setattr(server, 'METRICS', metrics)
+    monkeypatch.setattr(server, 'ACTIVITY_BUFFER', 0)
+    monkeypatch.setattr(server, 'close_activity_writer', lambda: None)
+    with caplog.at_level(logging.INFO):
+        server._serve_forever(MockServer())
+
+    assert 'compression metrics' in caplog.text
+    assert "'ratio': 0.25" in caplog.text
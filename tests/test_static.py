@@ -0,0 +1,209 @@
+"""pytest
+
+static.py
+"""
+import os
+import pytest
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from module import static
+
+
+@pytest.fixture
+def asset_file(tmp_path):
+    path = tmp_path / 'main.js'
+    path.write_bytes(b'const a = 1;')
+    return path
+
+
+def test_get_001(asset_file, monkeypatch):
+    """静的ファイル取得
+    正常ケース
+
+    expect:
+      2回目以降はファイルを読み込まない
+    """
+    cache = static.StaticCache(check_interval=0)
+    first = cache.get(str(asset_file))
+
+    def mock_load(path, stat):
+        raise AssertionError('reloaded')
+
+    monkeypatch.setattr(cache, '_load', mock_load)
+
+    assert cache.get(str(asset_file)) is first
+    assert first.body == b'const a = 1;'
+
+
+def test_get_002(asset_file):
+    """静的ファイル取得(更新日時による無効化)
+    正常ケース
+
+    expect:
+      更新後は新しい内容とETagを返す
+    """
+    cache = static.StaticCache(check_interval=0)
+    first = cache.get(str(asset_file))
+    asset_file.write_bytes(b'const a = 2;')
+    os.utime(asset_file, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+    second = cache.get(str(asset_file))
+
+    assert second.body == b'const a = 2;'
+    assert second.etag != first.etag
+
+
+def test_get_003(tmp_path):
+    """静的ファイル取得
+    エラーケース
+
+    expect:
+      FileNotFoundError
+    """
+    cache = static.StaticCache()
+
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(tmp_path / 'NotFound.js'))
+
+
+@pytest.mark.parametrize('input_01, input_02, expect', [
+    ('"etag"', None, True),
+    ('"other", "etag"', None, True),
+    ('*', None, True),
+    ('"other"', 'Thu, 01 Jan 2099 00:00:00 GMT', False),
+    (None, 'Thu, 01 Jan 2099 00:00:00 GMT', True),
+    (None, 'Thu, 01 Jan 1970 00:00:00 GMT', False),
+    (None, 'invalid', False),
+    (None, None, False),
+])
+def test_is_not_modified_001(input_01, input_02, expect):
+    """条件付きリクエストの判定
+    正常ケース
+    """
+    asset = static.StaticAsset(b'', 10**9 * 1000, '"etag"', '')
+
+    assert asset.is_not_modified(input_01, input_02) is expect
+
+
+@pytest.mark.parametrize('input, expect', [
+    ('gzip, deflate', 'gzip'),
+    ('gzip;q=0', None),
+    ('*', 'gzip'),
+    ('identity', None),
+    ('', None),
+    (None, None),
+])
+def test_select_encoding_001(input, expect):
+    """圧縮方式の選択
+    正常ケース
+    """
+    assert static.select_encoding(input, ('gzip',)) == expect
+
+
+def test_select_encoding_002():
+    """圧縮方式の選択(優先順)
+    正常ケース
+
+    in:
+      'gzip, br'
+    expect:
+      'br'
+    """
+    assert static.select_encoding('gzip, br', ('br', 'gzip')) == 'br'
+
+
+def test_negotiate_001(tmp_path):
+    """圧縮済みデータの選択
+    正常ケース
+
+    expect:
+      gzipを受け入れる場合は圧縮済みデータとgzip用のETagを返す
+    """
+    path = tmp_path / 'main.js'
+    path.write_bytes(b'const a = 1;\n' * 100)
+    asset = static.StaticCache().get(str(path))
+    encoding, body, etag = asset.negotiate('gzip')
+
+    assert encoding == 'gzip'
+    assert static.gzip.decompress(body) == asset.body
+    assert etag != asset.etag
+    assert asset.negotiate('identity') == (None, asset.body, asset.etag)
+
+
+def test_negotiate_002(asset_file):
+    """圧縮済みデータの選択(小さいファイル)
+    正常ケース
+
+    expect:
+      圧縮済みデータを生成しない
+    """
+    asset = static.StaticCache().get(str(asset_file))
+
+    assert asset.variants == {}
+    assert asset.negotiate('gzip')[0] is None
+
+
+def test_warm_001(tmp_path, monkeypatch):
+    """起動時の読み込み
+    正常ケース
+
+    expect:
+      読み込み後は圧縮しない
+    """
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'main.js').write_bytes(b'const a = 1;\n' * 100)
+    (tmp_path / 'component.css').write_bytes(b'main {}\n' * 100)
+    cache = static.StaticCache()
+
+    assert cache.warm(str(tmp_path)) == 2
+
+    def mock_compress(body, encoding):
+        raise AssertionError('compressed')
+
+    monkeypatch.setattr(static, 'compress', mock_compress)
+    assert cache.get(str(tmp_path / 'js' / 'main.js')).variants
+
+
+def test_get_004(tmp_path):
+    """静的ファイル取得(圧縮済みデータを生成しない)
+    正常ケース
+
+    in:
+      precompress=False
+    expect:
+      圧縮済みデータを生成しない
+    """
+    path = tmp_path / 'index.html'
+    path.write_bytes(b'<p>a</p>\n' * 100)
+    asset = static.StaticCache().get(str(path), precompress=False)
+
+    assert asset.variants == {}
+    assert asset.negotiate('gzip')[0] is None
+
+
+def test_get_005(tmp_path, monkeypatch):
+    """静的ファイル取得(起動後の更新)
+    正常ケース
+
+    expect:
+      起動時は最高圧縮レベル、更新後の再読み込みは低い圧縮レベルで圧縮する
+    """
+    path = tmp_path / 'main.js'
+    path.write_bytes(b'const a = 1;\n' * 100)
+    levels = []
+
+    def mock_compress(body, encoding, level):
+        levels.append(level[encoding])
+        return b''
+
+    monkeypatch.setattr(static, 'compress', mock_compress)
+    cache = static.StaticCache(check_interval=0)
+    cache.warm(str(tmp_path))
+    first = cache.get(str(path))
+    path.write_bytes(b'const a = 2;\n' * 100)
+    os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+    cache.get(str(path))
+
+    expect = [static.COMPRESS_LEVELS[encoding] for encoding in static.ENCODINGS] +\
+        [static.FAST_COMPRESS_LEVELS[encoding] for encoding in static.ENCODINGS]
+    assert levels == expect
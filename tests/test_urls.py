@@ -2,6 +2,7 @@
 
 urls.py
 """
+import asyncio
 from io import BufferedReader
 import os
 import pytest
@@ -9,6 +10,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from module import api
+from module import response
 from module import urls
 from module import util
 
@@ -32,7 +34,7 @@ def test_dispatch_001(input, monkeypatch):
     """
     path = input['PATH_INFO']
     expect = ''
-    def mock_dispatch_static(path):
+    def mock_dispatch_static(path, req_data=None):
         return expect
 
     def mock_dispatch_api(path, input):
@@ -77,10 +79,10 @@ def test_dispatch_static_001(input, expect_status, expect_content_type):
       静的コード
     """
     result = urls.dispatch_static(input)
-    with open(input[1:], 'r') as file:
+    with open(input[1:], 'rb') as file:
         expect_body = file.read()
 
-    assert isinstance(result, api.StaticResponse)
+    assert isinstance(result, response.StaticResponse)
     assert result.status == expect_status
     assert result.content_type == expect_content_type
     assert result.body == expect_body
@@ -146,10 +148,10 @@ def test_dispatch_static_002(input, expect_status, expect_content_type):
       404.htmlコード
     """
     result = urls.dispatch_static(input)
-    with open('404.html', 'r') as file:
+    with open('404.html', 'rb') as file:
         expect_body = file.read()
 
-    assert isinstance(result, api.NotFound)
+    assert isinstance(result, response.NotFound)
     assert result.status == expect_status
     assert result.content_type == expect_content_type
     assert result.body == expect_body
@@ -159,14 +161,14 @@ def test_dispatch_static_002(input, expect_status, expect_content_type):
     (
         '/',
         {'REQUEST_METHOD': 'GET'},
-        api.HtmlResponse,
+        response.HtmlResponse,
         '200 OK',
         'text/html'
     ),
     (
         '/learning',
         {'REQUEST_METHOD': 'GET'},
-        api.JsonResponse,
+        response.JsonResponse,
         '200 OK',
         'application/json'
     ),
@@ -211,7 +213,7 @@ def test_dispatch_api_001(input_01, input_02, expect_inst_type, expect_status, e
             'wsgi.input': BufferedReader(open('tests/testfile','rb')),
             'CONTENT_LENGTH': 32
         },
-        api.JsonResponse,
+        response.JsonResponse,
         '200 OK',
         'application/json'
     ),
@@ -250,7 +252,7 @@ def test_dispatch_api_002(input_01, input_02, expect_inst_type, expect_status, e
             'wsgi.input': BufferedReader(open('tests/testfile_BadRequest','rb')),
             'CONTENT_LENGTH': 32
         },
-        api.BadRequest,
+        response.BadRequest,
         '400 Bad Request',
         'application/json'
     ),
@@ -261,7 +263,7 @@ def test_dispatch_api_002(input_01, input_02, expect_inst_type, expect_status, e
             'wsgi.input': {},
             'CONTENT_LENGTH': 32
         },
-        api.InternalServerError,
+        response.InternalServerError,
         '500 Internal Server Error',
         'application/json'
     ),
@@ -304,3 +306,173 @@ def test_dispatch_api_003(input_01, input_02, expect_inst_type, expect_status, e
     assert isinstance(result, expect_inst_type)
     assert result.status == expect_status
     assert result.content_type == expect_content_type
+
+
+@pytest.mark.parametrize('input, expect', [
+    ('/static/js/main.js', ('static/js/main.js', 'js')),
+    ('/static/css/component.css', ('static/css/component.css', 'css')),
+    ('/static/js/main', ('static/js/main', '')),
+    ('/static/main.js', None),
+    ('/static/js/sub/main.js', None),
+    ('/static//main.js', None),
+    ('/english_list', None),
+    ('/', None),
+])
+def test_match_static_001(input, expect):
+    """静的ファイルのパス解決
+    正常ケース
+    """
+    assert urls.match_static(input) == expect
+
+
+@pytest.mark.parametrize('input_01, input_02', [
+    ('/update/is_correct', {'REQUEST_METHOD': 'GET'}),
+    ('/english_list', {'REQUEST_METHOD': 'POST'}),
+])
+def test_dispatch_api_004(input_01, input_02):
+    """API割り当て(許可されていないメソッド)
+    エラーケース
+
+    expect:
+      '405 Method Not Allowed'、Allowヘッダー
+    """
+    result = urls.dispatch_api(input_01, input_02)
+
+    assert isinstance(result, response.MethodNotAllowed)
+    assert result.status == '405 Method Not Allowed'
+    assert dict(result.headers)['Allow'] == urls.ALLOW[input_01]
+
+
+def test_dispatch_api_005():
+    """API割り当て(存在しないパス)
+    エラーケース
+
+    expect:
+      '404 Not Found'
+    """
+    assert isinstance(urls.dispatch_api('/NotFound', {'REQUEST_METHOD': 'GET'}), response.NotFound)
+
+
+@pytest.mark.parametrize('input', [
+    '/', '/learning', '/english_list', '/update/is_correct',
+    '/static/js/main.js', '/static/css/component.css', '/static/js/html2canvas.js',
+    '/NotFound', '/static/js/main', '/static/main.js', '/static/js/sub/main.js',
+])
+def test_match_static_002(input):
+    """ルーティングテーブル
+    正常ケース
+
+    expect:
+      PurePathによる割り当てと同じ振り分け結果
+    """
+    from pathlib import PurePath
+
+    if PurePath(input).match('static/*/*'):
+        assert urls.match_static(input) == (input[1:], PurePath(input).suffix[1:])
+    else:
+        assert urls.match_static(input) is None
+        assert (input in urls.ALLOW) == (input in urls.END_POINT)
+
+
+@pytest.mark.parametrize('input', [
+    '/static/../server.py',
+    '/static/../404.html',
+    '/static/js/../../server.py',
+    '/static/./js/main.js',
+    '/static/js/.',
+    '/static/js/main.js\0',
+])
+def test_match_static_003(input):
+    """静的ファイルのパス解決(静的ファイルのディレクトリ外)
+    エラーケース
+
+    expect:
+      None
+    """
+    assert urls.match_static(input) is None
+
+
+def test_dispatch_static_003(monkeypatch):
+    """静的ファイル割り当て(静的ファイルのディレクトリ外、対象外の拡張子)
+    エラーケース
+
+    in:
+      '/static/../server.py'、'/static/js/main.py'
+    expect:
+      ファイルを読み込まずに'404 Not Found'
+    """
+    def mock_get(path):
+        raise AssertionError(path)
+
+    monkeypatch.setattr(api.STATIC_CACHE, 'get', mock_get)
+
+    for path in ('/static/../server.py', '/static/js/main.py'):
+        assert isinstance(urls.dispatch_static(path), response.NotFound)
+
+
+def test_dispatch_async_001(monkeypatch):
+    """割り当て(asyncio、非同期ドライバ)
+    正常ケース
+
+    in:
+      '/learning'
+    expect:
+      DB処理スレッドを使わず、非同期ドライバ用ビューで処理される
+    """
+    class MockView(object):
+        def __init__(self, query=None):
+            pass
+
+        async def view(self):
+            return response.JsonResponse({'async': True})
+
+    class MockExecutor(object):
+        def submit(self, *args, **kwargs):
+            raise AssertionError('DB_EXECUTOR')
+
+    monkeypatch.setattr(urls, 'ASYNC_DB', True)
+    monkeypatch.setattr(urls, 'DB_EXECUTOR', MockExecutor())
+    monkeypatch.setitem(urls.ASYNC_ROUTES, ('GET', '/learning'), MockView)
+    result = asyncio.run(urls.dispatch_async({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/learning'}))
+
+    assert result.body == b'{"async": true}'
+
+
+def test_dispatch_async_002(monkeypatch):
+    """割り当て(asyncio、非同期ドライバ未対応)
+    正常ケース
+
+    in:
+      非同期ドライバが利用できない、または未対応のエンドポイント
+    expect:
+      DB処理スレッドで同期版のAPI割り当てが実行される
+    """
+    def mock_dispatch_api(path, req_data):
+        return response.JsonResponse({'path': path})
+
+    monkeypatch.setattr(urls, 'dispatch_api', mock_dispatch_api)
+    for async_db, path in ((False, '/learning'), (True, '/english_list')):
+        monkeypatch.setattr(urls, 'ASYNC_DB', async_db)
+        result = asyncio.run(urls.dispatch_async({'REQUEST_METHOD': 'GET', 'PATH_INFO': path}))
+
+        assert result.body == f'{{"path": "{path}"}}'.encode()
+
+
+def test_dispatch_api_async_001(monkeypatch):
+    """API割り当て(非同期ドライバ、DBエラー)
+    エラーケース
+
+    expect:
+      '500 Internal Server Error'
+    """
+    class MockView(object):
+        def __init__(self, query=None):
+            pass
+
+        async def view(self):
+            raise urls.DbOperationError()
+
+    monkeypatch.setitem(urls.ASYNC_ROUTES, ('GET', '/learning'), MockView)
+    result = asyncio.run(urls.dispatch_api_async('/learning', {'REQUEST_METHOD': 'GET'}))
+
+    assert isinstance(result, response.InternalServerError)
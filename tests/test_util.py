@@ -42,3 +42,44 @@ def test_open_file_002():
     with pytest.raises(FileNotFoundError):
         with open('FileNotFoundError.html', 'r') as file:
             file.read()
+
+
+def test_render_template_001():
+    """テンプレート展開
+    正常ケース
+
+    in:
+      index.html、{'dashboardData': b'{"count": 1}'}
+    expect:
+      str.formatと同じ結果
+    """
+    with open('index.html', 'r') as file:
+        text = file.read()
+    template = util.compile_template(text)
+
+    assert b''.join(util.render_template(template, dashboardData=b'{"count": 1}')) ==\
+        text.format(dashboardData='{"count": 1}').encode()
+
+
+@pytest.mark.parametrize('input_01, input_02, expect', [
+    (
+        [{'id': 1}, {'id': 2}, {'id': 3}],
+        2,
+        {'data': [{'id': 1}, {'id': 2}], 'next_cursor': 2}
+    ),
+    (
+        [{'id': 1}, {'id': 2}],
+        2,
+        {'data': [{'id': 1}, {'id': 2}], 'next_cursor': None}
+    ),
+    (
+        [],
+        2,
+        {'data': [], 'next_cursor': None}
+    ),
+])
+def test_paginate_001(input_01, input_02, expect):
+    """キーセットページネーション用に変換
+    正常ケース
+    """
+    assert util.paginate(input_01, input_02) == expect